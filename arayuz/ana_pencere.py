@@ -1,7 +1,10 @@
 # arayuz/ana_pencere.py
+import os
 import tkinter as tk
 from tkinter import ttk
+from time import perf_counter
 from veri_deposu import kullaniciya_gorunecek_bolumler, derslik_sayisi
+from arayuz.bolum_verisi import BolumVerisi
 from arayuz.derslik_penceresi import DerslikPenceresi
 from arayuz.import_penceresi import ImportPenceresi
 from arayuz.oturma_plani_penceresi import OturmaPlaniPenceresi
@@ -10,6 +13,27 @@ from arayuz.ogrenci_listesi_penceresi import OgrenciListesiPenceresi
 from arayuz.sinav_programi_penceresi import SinavProgramiPenceresi
 from arayuz.ders_listesi_penceresi import DersListesiPenceresi  # ✅ dosya adı ve import uyumlu
 
+# Ayarlıysa açılış ve sekme kurulum süreleri konsola yazılır
+ZAMANLAMA = bool(os.environ.get("SINAV_ZAMANLAMA"))
+
+
+class TembelSekme(ttk.Frame):
+    """
+    Notebook'a hemen eklenen boş çerçeve; içeriği kur(master) ile ilk
+    gösterildiğinde oluşturulur. Sekme sırası ve durumu (disabled vb.) baştan bellidir.
+    """
+    def __init__(self, master, kur):
+        super().__init__(master)
+        self._kur = kur
+        self.icerik = None
+
+    def olustur(self):
+        if self.icerik is None:
+            self.icerik = self._kur(self)
+            self.icerik.pack(fill="both", expand=True)
+        return self.icerik
+
+
 class AnaPencere(tk.Toplevel):
     """
     Koordinatör:
@@ -19,12 +43,16 @@ class AnaPencere(tk.Toplevel):
       - Oturma Planı
       - Öğrenci Listesi (Excel’den sonra otomatik eklenir)
       - Ders Listesi    (Excel’den sonra otomatik eklenir)
+    Koordinatör sekmeleri ilk seçildiklerinde kurulur ve veriyi o zaman okur;
+    ders listesi ve kayıt matrisi sekmeler arasında paylaşılır (BolumVerisi).
+    Açılış süresi self.olcumler["acilis_sn"]'dedir (SINAV_ZAMANLAMA=1 ile konsola da yazılır).
 
     Admin:
       - Kullanıcı Yönetimi
       - Genel
     """
     def __init__(self, kullanici, master=None):
+        self._bas = perf_counter()
         super().__init__(master)
         self.title("Dinamik Sınav Takvimi")
         self.geometry("1100x720")
@@ -32,10 +60,24 @@ class AnaPencere(tk.Toplevel):
 
         # referanslar / sonradan eklemek için
         self._tab_refs = {}   # {'ogrenci_listesi': widget, ...}
+        self.olcumler = {}    # {'acilis_sn': ..., 'sekme/<anahtar>_sn': ...}
+        self.veri = BolumVerisi(kullanici["bolum_id"]) if kullanici["rol"] == "koordinator" else None
 
         self._build()
+        self.after_idle(self._acildi)
         self.protocol("WM_DELETE_WINDOW", self._kapat)
 
+    def _olcum(self, ad: str, sure: float):
+        self.olcumler[ad] = sure
+        if ZAMANLAMA:
+            print(f"[zamanlama] {ad}: {sure:.3f}")
+
+    def _acildi(self):
+        """İlk sekme kurulup çizildikten sonra: girişten etkileşime geçen süre."""
+        self._sekme_degisti()
+        self.update_idletasks()
+        self._olcum("acilis_sn", perf_counter() - self._bas)
+
     def _kapat(self):
         if self.master:
             self.master.destroy()
@@ -47,25 +89,22 @@ class AnaPencere(tk.Toplevel):
         nb = ttk.Notebook(self)
         nb.pack(fill="both", expand=True)
         self.nb = nb
+        nb.bind("<<NotebookTabChanged>>", self._sekme_degisti)
 
         if self.kullanici["rol"] == "koordinator":
             # Derslikler
-            frm_derslik = DerslikPenceresi(nb, self.kullanici,
-                                           on_derslik_eklendi=self._on_first_derslik_added)
-            nb.add(frm_derslik, text="Derslikler")
+            self._sekme_ekle("derslik", "Derslikler", lambda m: DerslikPenceresi(
+                m, self.kullanici, on_derslik_eklendi=self._on_first_derslik_added))
 
             # Excel Aktarımları
-            frm_import = ImportPenceresi(
-                nb,
+            frm_import = self._sekme_ekle("import", "Excel Aktar", lambda m: ImportPenceresi(
+                m,
                 self.kullanici,
                 on_after_import=self._on_after_import  # ✅ excel sonrası menüleri aç
-            )
-            nb.add(frm_import, text="Excel Aktar")
+            ))
 
             # Oturma Planı (her zaman mevcut)
-            frm_oturma = OturmaPlaniPenceresi(nb, self.kullanici)
-            nb.add(frm_oturma, text="Oturma Planı")
-            self._tab_refs["oturma"] = frm_oturma
+            self._sekme_ekle("oturma", "Oturma Planı", lambda m: OturmaPlaniPenceresi(m, self.kullanici))
 
             # Derslik yoksa Excel Aktar tabını kilitle (ilk kurulum akışı)
             if derslik_sayisi(self.kullanici) == 0:
@@ -73,8 +112,8 @@ class AnaPencere(tk.Toplevel):
                 nb.tab(idx, state="disabled")
                 self.after(400, lambda: self._bilgilendir_kilit(nb, idx))
 
-            # Eğer zaten veri varsa (yeniden açılışlar), menüleri hazırla
-            self.after(100, self._ensure_data_tabs)
+            # Eğer zaten veri varsa (yeniden açılışlar), menüleri hazırla (içerikleri seçilince kurulur)
+            self._ensure_data_tabs()
 
         else:
             # Admin
@@ -87,6 +126,28 @@ class AnaPencere(tk.Toplevel):
             gorunen = ", ".join([b["ad"] for b in kullaniciya_gorunecek_bolumler(self.kullanici)])
             ttk.Label(frm, text=f"Görünen bölümler: {gorunen}").grid(row=1, column=0, sticky="w")
 
+    def _sekme_ekle(self, anahtar: str, baslik: str, kur):
+        frm = TembelSekme(self.nb, kur)
+        self.nb.add(frm, text=baslik)
+        self._tab_refs[anahtar] = frm
+        return frm
+
+    def _sekme_degisti(self, _olay=None):
+        """Seçilen sekme ilk kez gösteriliyorsa kurulur; kuruluysa verisi gerekirse tazelenir."""
+        try:
+            w = self.nametowidget(self.nb.select())
+        except (KeyError, tk.TclError):
+            return
+        if not isinstance(w, TembelSekme):
+            return
+        if w.icerik is None:
+            bas = perf_counter()
+            w.olustur()
+            anahtar = next((k for k, v in self._tab_refs.items() if v is w), str(w))
+            self._olcum(f"sekme/{anahtar}_sn", perf_counter() - bas)
+        elif hasattr(w.icerik, "yenile"):
+            w.icerik.yenile()
+
     def _bilgilendir_kilit(self, nb, idx):
         title = nb.tab(idx, "text")
         nb.tab(idx, text=f"{title} (Önce derslik girin)")
@@ -105,7 +166,9 @@ class AnaPencere(tk.Toplevel):
         ImportPenceresi'nden gelir.
         tip: 'ders' veya 'ogrenci'
         - Excel yüklemesi biter bitmez gerekli menüleri ekler ve odaklar.
+        Paylaşılan bölüm verisi geçersiz kılınır; kurulu sekmeler gösterilince yeniden okur.
         """
+        self.veri.gecersiz_kil()
         self._ensure_data_tabs()
         # Kullanıcıyı görünür sekmeye alalım (mantıklı varsayımlar):
         if tip == "ders":
@@ -132,18 +195,15 @@ class AnaPencere(tk.Toplevel):
         """
         # Sınav Programı
         if "sinav_programi" not in self._tab_refs:
-            frm_sp = SinavProgramiPenceresi(self.nb, self.kullanici)
-            self.nb.add(frm_sp, text="Sınav Programı")
-            self._tab_refs["sinav_programi"] = frm_sp
+            self._sekme_ekle("sinav_programi", "Sınav Programı",
+                             lambda m: SinavProgramiPenceresi(m, self.kullanici, veri=self.veri))
 
         # Öğrenci Listesi
         if "ogrenci_listesi" not in self._tab_refs:
-            frm_ogr = OgrenciListesiPenceresi(self.nb, self.kullanici)
-            self.nb.add(frm_ogr, text="Öğrenci Listesi")
-            self._tab_refs["ogrenci_listesi"] = frm_ogr
+            self._sekme_ekle("ogrenci_listesi", "Öğrenci Listesi",
+                             lambda m: OgrenciListesiPenceresi(m, self.kullanici))
 
         # Ders Listesi
         if "ders_listesi" not in self._tab_refs:
-            frm_ders = DersListesiPenceresi(self.nb, self.kullanici)
-            self.nb.add(frm_ders, text="Ders Listesi")
-            self._tab_refs["ders_listesi"] = frm_ders
+            self._sekme_ekle("ders_listesi", "Ders Listesi",
+                             lambda m: DersListesiPenceresi(m, self.kullanici, veri=self.veri))
@@ -0,0 +1,180 @@
+# arayuz/arka_plan.py
+# -*- coding: utf-8 -*-
+"""
+Uzun işleri (planlama, Excel içe aktarma, PDF üretimi) Tk olay döngüsünün
+dışında çalıştırmak için:
+
+    is_ = arka_planda(self, lambda is_: agir_isi_yap(is_),
+                      bitince=self._sonucu_goster, ilerleme=cubuk.guncelle)
+    ...
+    is_.iptal_et()     # ör. "İptal" düğmesinden
+
+İş ayrı bir iş parçacığında çalışır; Tk'ye hiç dokunmaz, ilerlemesini
+is_.ilerleme(...) ile bir kuyruğa yazar. Kuyruk UI tarafında after() ile
+yoklanır; ilerleme, sonuç, hata ve iptal geri çağrıları hep UI iş
+parçacığında çağrılır. İptal işbirliğine dayalıdır: iş, güvenli noktalarda
+is_.denetle() çağırır (iptal istenmişse IslemIptal fırlatır) ya da
+is_.iptal olayını (threading.Event) alt katmanlara geçirir. Veritabanı
+işlemleri veritabani.baglanti kapsamında olduğundan, yazma sırasındaki
+iptal tüm yazmayı geri alır.
+
+Planlama motorlarının kendi süreç havuzları (planlayici.portfoy) olduğundan
+iş parçacığı yeterlidir; işçi bitince kendi SQLite bağlantılarını kapatır.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Optional
+
+import veritabani
+
+# UI'nin kuyruğu yoklama aralığı (ms)
+YOKLAMA_MS = 100
+
+
+class IslemIptal(Exception):
+    """Arka plan işi kullanıcı isteğiyle iptal edildi."""
+
+
+class ArkaPlanIsi:
+    """Bir arka plan işinin tutamacı: iş fonksiyonu ve UI aynı nesneyi görür."""
+
+    def __init__(self):
+        self.iptal = threading.Event()
+        self._kuyruk: "queue.Queue[tuple]" = queue.Queue()
+        self._is_parcacigi: Optional[threading.Thread] = None
+
+    # ---- iş tarafı ----
+    def ilerleme(self, mesaj: str, oran: Optional[float] = None) -> None:
+        """oran: 0..1 (None: belirsiz ilerleme)."""
+        self._kuyruk.put(("ilerleme", mesaj, oran))
+
+    def denetle(self) -> None:
+        """İptal istenmişse IslemIptal fırlatır."""
+        if self.iptal.is_set():
+            raise IslemIptal()
+
+    # ---- UI tarafı ----
+    def iptal_et(self) -> None:
+        self.iptal.set()
+
+    @property
+    def calisiyor(self) -> bool:
+        return self._is_parcacigi is not None and self._is_parcacigi.is_alive()
+
+
+def arka_planda(widget: tk.Misc,
+                fn: Callable[[ArkaPlanIsi], Any],
+                bitince: Callable[[Any], None],
+                hata: Optional[Callable[[BaseException], None]] = None,
+                ilerleme: Optional[Callable[[str, Optional[float]], None]] = None,
+                iptal_edildi: Optional[Callable[[], None]] = None,
+                aralik_ms: int = YOKLAMA_MS) -> ArkaPlanIsi:
+    """
+    fn(is_) ayrı iş parçacığında çalışır. UI iş parçacığında:
+      bitince(sonuc)      fn normal döndüğünde
+      hata(istisna)       fn hata fırlattığında (verilmezse hata mesajı gösterilir)
+      iptal_edildi()      fn IslemIptal fırlattığında
+      ilerleme(mesaj, oran) her yoklamada en son ilerleme iletisiyle
+    widget yok edilirse yoklama durur ve iş iptal edilir.
+    """
+    is_ = ArkaPlanIsi()
+
+    def _calis():
+        try:
+            sonuc = fn(is_)
+        except IslemIptal:
+            is_._kuyruk.put(("iptal",))
+        except BaseException as e:
+            is_._kuyruk.put(("hata", e))
+        else:
+            is_._kuyruk.put(("bitti", sonuc))
+        finally:
+            veritabani.baglantilari_kapat()
+
+    def _yokla():
+        try:
+            if not widget.winfo_exists():
+                is_.iptal_et()
+                return
+        except tk.TclError:
+            is_.iptal_et()
+            return
+        son_ilerleme = None
+        while True:
+            try:
+                ileti = is_._kuyruk.get_nowait()
+            except queue.Empty:
+                break
+            if ileti[0] == "ilerleme":
+                son_ilerleme = ileti  # ara ilerlemeler birleştirilir
+                continue
+            if son_ilerleme is not None and ilerleme:
+                ilerleme(son_ilerleme[1], son_ilerleme[2])
+            if ileti[0] == "bitti":
+                bitince(ileti[1])
+            elif ileti[0] == "iptal":
+                if iptal_edildi:
+                    iptal_edildi()
+            elif hata:
+                hata(ileti[1])
+            else:
+                from utils.mesaj import hata as _hata_goster
+                _hata_goster(str(ileti[1]))
+            return
+        if son_ilerleme is not None and ilerleme:
+            ilerleme(son_ilerleme[1], son_ilerleme[2])
+        widget.after(aralik_ms, _yokla)
+
+    is_._is_parcacigi = threading.Thread(target=_calis, name="arka_plan_isi", daemon=True)
+    is_._is_parcacigi.start()
+    widget.after(aralik_ms, _yokla)
+    return is_
+
+
+class IlerlemeCubugu(ttk.Frame):
+    """
+    Durum metni + ilerleme çubuğu + "İptal" düğmesi. Boştayken gizlidir:
+        cubuk.baslat(is_) ... cubuk.guncelle(mesaj, oran) ... cubuk.bitir()
+    Yerleşimi (grid/pack) çağıran yapar; çubuk yalnızca çocuklarını gösterip gizler.
+    """
+
+    def __init__(self, master, **kw):
+        super().__init__(master, **kw)
+        self._is: Optional[ArkaPlanIsi] = None
+        self.lbl = ttk.Label(self, text="", foreground="#666")
+        self.pb = ttk.Progressbar(self, length=220, maximum=1.0)
+        self.btn = ttk.Button(self, text="İptal", command=self._iptal)
+
+    def baslat(self, is_: ArkaPlanIsi, mesaj: str = "Çalışıyor…") -> None:
+        self._is = is_
+        self.lbl.pack(side="left")
+        self.pb.pack(side="left", padx=6)
+        self.btn.pack(side="left")
+        self.btn.state(["!disabled"])
+        self.guncelle(mesaj, None)
+
+    def guncelle(self, mesaj: str, oran: Optional[float] = None) -> None:
+        self.lbl.config(text=mesaj)
+        if oran is None:
+            if str(self.pb["mode"]) != "indeterminate":
+                self.pb.config(mode="indeterminate")
+                self.pb.start(15)
+        else:
+            self.pb.stop()
+            self.pb.config(mode="determinate", value=max(0.0, min(1.0, float(oran))))
+
+    def bitir(self) -> None:
+        self._is = None
+        self.pb.stop()
+        for w in (self.lbl, self.pb, self.btn):
+            w.pack_forget()
+
+    def _iptal(self):
+        if self._is is not None:
+            self._is.iptal_et()
+            self.btn.state(["disabled"])
+            self.lbl.config(text="İptal ediliyor…")
@@ -0,0 +1,44 @@
+# arayuz/bolum_verisi.py
+# -*- coding: utf-8 -*-
+"""
+Sekmeler arasında paylaşılan, gerektiğinde okunan bölüm verisi.
+
+AnaPencere bölüm başına tek bir BolumVerisi kurar ve veri sekmelerine geçirir;
+ders listesi (dersler_ogrsay_ve_alanlar_detayli) ve kayıt matrisi ilk
+isteyen sekme için bir kez okunur, diğerleri aynı nesneyi kullanır. Excel
+aktarımı gibi veriyi değiştiren işlemlerden sonra gecersiz_kil() çağrılır;
+sürüm numarası artar, sekmeler bir sonraki gösterimde yeniden okur.
+
+Yalnızca UI iş parçacığından kullanılır (kilit yoktur); arka plan işleri
+gereken veriyi iş başlamadan UI iş parçacığında alır ve kendisine geçirilen
+bu anlık görüntüyle çalışır. Tk'ye bağımlı değildir.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List
+
+from veri_deposu import dersler_ogrsay_ve_alanlar_detayli, kayit_matrisi_getir
+
+
+class BolumVerisi:
+    def __init__(self, bolum_id: int):
+        self.bolum_id = bolum_id
+        self.surum = 0  # her gecersiz_kil() ile artar
+        self._onbellek: Dict[str, Any] = {}
+
+    def _oku(self, anahtar: str, fn: Callable[[int], Any]) -> Any:
+        if anahtar not in self._onbellek:
+            self._onbellek[anahtar] = fn(self.bolum_id)
+        return self._onbellek[anahtar]
+
+    def dersler(self) -> List[dict]:
+        """Bölümün dersleri (öğrenci sayısıyla); paylaşılır, değiştirilmemelidir."""
+        return self._oku("dersler", dersler_ogrsay_ve_alanlar_detayli)
+
+    def kayit_matrisi(self):
+        """Bölümün öğrenci × ders kayıt matrisi (KayitMatrisi)."""
+        return self._oku("kayit_matrisi", kayit_matrisi_getir)
+
+    def gecersiz_kil(self) -> None:
+        self._onbellek.clear()
+        self.surum += 1
@@ -1,16 +1,27 @@
 # arayuz/ders_listesi_penceresi.py
 import tkinter as tk
-from tkinter import ttk
-from veri_deposu import dersler_ogrsay_ve_alanlar_detayli, derse_kayitli_ogrenciler
+from tkinter import ttk, filedialog
+from utils.mesaj import bilgi, hata
+from arayuz.sanal_liste import SanalListe, SayfaliKaynak
+from veri_deposu import (
+    derse_kayitli_ogrenciler_sayfasi, derse_kayitli_ogrenci_sayisi, export_cakisma_raporu_to_excel
+)
+from arayuz.bolum_verisi import BolumVerisi
 
 class DersListesiPenceresi(ttk.Frame):
     """
     - Solda ders listesi (kod + ad)
     - Sağda seçilen dersi alan öğrenciler (No – Ad Soyad) tablo halinde
+    - Altta seçilen dersle ortak öğrencisi olan dersler (çakışma teşhisi)
+
+    veri: sekmelerle paylaşılan BolumVerisi (verilmezse pencere kendisininkini kurar).
+    Kayıt matrisi ilk ders seçiminde ya da rapor isteğinde okunur.
     """
-    def __init__(self, master, koordinator):
+    def __init__(self, master, koordinator, veri=None):
         super().__init__(master, padding=10)
         self.k = koordinator
+        self.veri = veri or BolumVerisi(koordinator["bolum_id"])
+        self._surum = None
         self._dersler = []
         self._build()
 
@@ -40,41 +51,91 @@ class DersListesiPenceresi(ttk.Frame):
 
         ttk.Label(right, text="Dersi Alan Öğrenciler", font=("", 11, "bold")).grid(row=0, column=0, sticky="w")
 
-        self.tree = ttk.Treeview(
+        # Kalabalık derslerde öğrenciler sayfa sayfa okunur (sanal liste)
+        self.liste_ogr = SanalListe(
+            right,
+            [("ogr_no", "Öğr. No", 120, "w"), ("adsoyad", "Ad Soyad", 320, "w")],
+            satir_sayisi=20,
+            arama=True
+        )
+        self.liste_ogr.grid(row=1, column=0, columnspan=2, sticky="nsew")
+
+        # ----- Alt: Çakışan dersler -----
+        ttk.Label(right, text="Çakışan Dersler (ortak öğrenci)", font=("", 11, "bold")).grid(
+            row=2, column=0, sticky="w", pady=(8, 0)
+        )
+        self.tree_cakisma = ttk.Treeview(
             right,
-            columns=("no", "adsoyad"),
+            columns=("kod", "ad", "ortak"),
             show="headings",
-            height=20
+            height=8
         )
-        self.tree.heading("no", text="Öğr. No")
-        self.tree.heading("adsoyad", text="Ad Soyad")
-        self.tree.column("no", width=120, anchor="w")
-        self.tree.column("adsoyad", width=320, anchor="w")
-        self.tree.grid(row=1, column=0, sticky="nsew")
+        self.tree_cakisma.heading("kod", text="Ders Kodu")
+        self.tree_cakisma.heading("ad", text="Ders Adı")
+        self.tree_cakisma.heading("ortak", text="Ortak Öğr.")
+        self.tree_cakisma.column("kod", width=120, anchor="w")
+        self.tree_cakisma.column("ad", width=260, anchor="w")
+        self.tree_cakisma.column("ortak", width=80, anchor="center")
+        self.tree_cakisma.grid(row=3, column=0, sticky="nsew")
 
-        sb = ttk.Scrollbar(right, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=sb.set)
-        sb.grid(row=1, column=1, sticky="ns")
+        rfrm = ttk.Frame(right)
+        rfrm.grid(row=4, column=0, sticky="w", pady=(6, 0))
+        self.cmb_tur = ttk.Combobox(rfrm, values=["vize", "final", "butunleme"], state="readonly", width=12)
+        self.cmb_tur.set("vize")
+        self.cmb_tur.pack(side="left")
+        ttk.Button(rfrm, text="Çakışma Raporu (Excel)", command=self._cakisma_raporu).pack(side="left", padx=6)
 
         self._dersleri_yukle()
 
     # ----- Veri yükleme -----
     def _dersleri_yukle(self):
-        self._dersler = dersler_ogrsay_ve_alanlar_detayli(self.k["bolum_id"])
+        self._surum = self.veri.surum
+        self._dersler = self.veri.dersler()
         self.lst.delete(0, "end")
         for d in self._dersler:
             self.lst.insert("end", f"{d['kod']} – {d['ad']} ({d['ogr_say']})")
 
+    def yenile(self):
+        """Sekme yeniden gösterildiğinde: paylaşılan veri değiştiyse listeleri tazeler."""
+        if self._surum == self.veri.surum:
+            return
+        self._dersleri_yukle()
+        self.liste_ogr.kaynak_ata([])
+        for i in self.tree_cakisma.get_children():
+            self.tree_cakisma.delete(i)
+
     # ----- Etkileşim -----
     def _ders_secildi(self, *_):
         sel = self.lst.curselection()
         if not sel:
             return
         ders = self._dersler[sel[0]]
-        ogrenciler = derse_kayitli_ogrenciler(ders["id"])
+        ders_id = ders["id"]
+        self.liste_ogr.kaynak_ata(SayfaliKaynak(
+            lambda sonrasi, limit: derse_kayitli_ogrenciler_sayfasi(ders_id, sonrasi, limit),
+            anahtar=lambda o: (o["ogr_no"], o["id"]),
+            sayi=lambda: derse_kayitli_ogrenci_sayisi(ders_id)))
 
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        # Çakışan dersler (kayıt matrisinden)
+        for i in self.tree_cakisma.get_children():
+            self.tree_cakisma.delete(i)
+        ders_by_id = {d["id"]: d for d in self._dersler}
+        for did, ortak in self.veri.kayit_matrisi().cakisan_dersler(ders["id"]):
+            d = ders_by_id.get(did)
+            if d:
+                self.tree_cakisma.insert("", "end", values=(d["kod"], d["ad"], ortak))
 
-        for o in ogrenciler:
-            self.tree.insert("", "end", values=(o["ogr_no"], o["adsoyad"]))
+    def _cakisma_raporu(self):
+        try:
+            p = filedialog.asksaveasfilename(
+                title="Çakışma raporu kaydet",
+                defaultextension=".xlsx",
+                filetypes=[("Excel", "*.xlsx")]
+            )
+            if not p:
+                return
+            export_cakisma_raporu_to_excel(self.k["bolum_id"], self.cmb_tur.get() or "vize", p,
+                                           matris=self.veri.kayit_matrisi())
+            bilgi(f"Excel kaydedildi:\n{p}")
+        except Exception as e:
+            hata(str(e))
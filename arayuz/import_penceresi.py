@@ -3,8 +3,10 @@ import tkinter as tk
 from tkinter import ttk, filedialog
 from pathlib import Path
 from utils.mesaj import bilgi, hata
-from excel_parser import ders_excel_parse, ogrenci_excel_parse
-from veri_deposu import dersleri_toplu_yaz, ogrencileri_toplu_yaz_ve_kayitla, derslik_sayisi
+from arayuz.arka_plan import IlerlemeCubugu, arka_planda
+from excel_parser import ders_excel_parse, ogrenci_excel_parse, ogrenci_excel_akis
+from veri_deposu import (dersleri_toplu_yaz, ogrencileri_toplu_yaz_ve_kayitla, ogrenci_akisini_yaz,
+                         derslik_sayisi)
 
 LOG_DIR = Path(__file__).resolve().parents[1] / "data"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -14,6 +16,7 @@ class ImportPenceresi(ttk.Frame):
         super().__init__(master)
         self.koordinator = koordinator
         self.on_after_import = on_after_import  # ✅ AnaPencere’den gelen callback
+        self._is = None  # çalışan arka plan işi (aktarım)
         self._build()
 
     def _build(self):
@@ -25,21 +28,23 @@ class ImportPenceresi(ttk.Frame):
         # ---- Ders Listesi Yükleme ----
         frm_ders = ttk.LabelFrame(self, text="Ders Listesi Yükle", padding=8)
         frm_ders.grid(row=1, column=0, sticky="ew", padx=8, pady=8)
-        ttk.Button(frm_ders, text="Excel seç ve yükle", command=self._ders_yukle).grid(
-            row=0, column=0, sticky="w"
-        )
+        self.btn_ders = ttk.Button(frm_ders, text="Excel seç ve yükle", command=self._ders_yukle)
+        self.btn_ders.grid(row=0, column=0, sticky="w")
 
         # ---- Öğrenci Listesi Yükleme ----
         frm_ogr = ttk.LabelFrame(self, text="Öğrenci Listesi Yükle", padding=8)
         frm_ogr.grid(row=2, column=0, sticky="ew", padx=8, pady=8)
-        ttk.Button(frm_ogr, text="Excel seç ve yükle", command=self._ogrenci_yukle).grid(
-            row=0, column=0, sticky="w"
-        )
+        self.btn_ogr = ttk.Button(frm_ogr, text="Excel seç ve yükle", command=self._ogrenci_yukle)
+        self.btn_ogr.grid(row=0, column=0, sticky="w")
 
         # Bilgi/Hata etiketi (varsayılan boş)
         self.lbl_hata = ttk.Label(self, text="", foreground="#666")
         self.lbl_hata.grid(row=3, column=0, sticky="w", padx=8, pady=(0, 8))
 
+        # Aktarım sürerken ilerleme + iptal
+        self.ilerleme = IlerlemeCubugu(self)
+        self.ilerleme.grid(row=4, column=0, sticky="w", padx=8)
+
     # ---------- Yardımcılar ----------
     def _derslik_kontrol(self):
         if derslik_sayisi(self.koordinator) == 0:
@@ -47,9 +52,35 @@ class ImportPenceresi(ttk.Frame):
             return False
         return True
 
+    def _arka_planda(self, fn, bitince, tip: str):
+        """Aktarımı arka planda çalıştırır; bu sürede iki yükleme düğmesi de kapalıdır."""
+        def _son():
+            self._is = None
+            self.ilerleme.bitir()
+            for b in (self.btn_ders, self.btn_ogr):
+                b.state(["!disabled"])
+
+        def _bitti(sonuc):
+            _son()
+            bitince(*sonuc)
+
+        def _hata(e):
+            _son()
+            hata(str(e))
+
+        def _iptal():
+            _son()
+            bilgi(f"{tip} aktarımı iptal edildi; hiçbir kayıt yazılmadı.")
+
+        self._is = arka_planda(self, fn, bitince=_bitti, hata=_hata,
+                               ilerleme=self.ilerleme.guncelle, iptal_edildi=_iptal)
+        for b in (self.btn_ders, self.btn_ogr):
+            b.state(["disabled"])
+        self.ilerleme.baslat(self._is, "Excel okunuyor…")
+
     # ---------- Ders Yükleme ----------
     def _ders_yukle(self):
-        if not self._derslik_kontrol():
+        if self._is is not None or not self._derslik_kontrol():
             return
 
         yol = filedialog.askopenfilename(
@@ -62,11 +93,19 @@ class ImportPenceresi(ttk.Frame):
         # Eski mesajı temizle
         self.lbl_hata.config(text="", foreground="#666")
 
-        dersler, hatalar = ders_excel_parse(yol)
+        bolum_id = self.koordinator["bolum_id"]
 
-        if dersler:
-            dersleri_toplu_yaz(self.koordinator["bolum_id"], dersler)
-            bilgi(f"{len(dersler)} ders işlendi.")
+        def _is(is_):
+            dersler, hatalar = ders_excel_parse(yol)
+            is_.denetle()
+            is_.ilerleme(f"{len(dersler)} ders yazılıyor…")
+            return (dersleri_toplu_yaz(bolum_id, dersler) if dersler else None), hatalar
+
+        self._arka_planda(_is, self._ders_yuklendi, "Ders")
+
+    def _ders_yuklendi(self, ozet, hatalar):
+        if ozet:
+            bilgi(f"{ozet['ders']} ders işlendi. ({ozet['satir_sn']} satır/sn)")
 
             # ✅ Import sonrası callback
             if self.on_after_import:
@@ -76,7 +115,7 @@ class ImportPenceresi(ttk.Frame):
         if hatalar:
             log = LOG_DIR / "ders_yukleme_hatalari.txt"
             log.write_text("\n".join(hatalar), encoding="utf-8")
-            renk = "red" if not dersler else "#666"  # hiç kayıt yoksa kırmızı
+            renk = "red" if not ozet else "#666"  # hiç kayıt yoksa kırmızı
             self.lbl_hata.config(
                 text=f"Bazı satırlar atlandı. Ayrıntılar: {log}",
                 foreground=renk,
@@ -84,7 +123,7 @@ class ImportPenceresi(ttk.Frame):
 
     # ---------- Öğrenci Yükleme ----------
     def _ogrenci_yukle(self):
-        if not self._derslik_kontrol():
+        if self._is is not None or not self._derslik_kontrol():
             return
 
         yol = filedialog.askopenfilename(
@@ -97,13 +136,35 @@ class ImportPenceresi(ttk.Frame):
         # Eski mesajı temizle
         self.lbl_hata.config(text="", foreground="#666")
 
-        ogrenciler, kayitlar, hatalar = ogrenci_excel_parse(yol)
+        bolum_id = self.koordinator["bolum_id"]
 
-        if ogrenciler:
-            ogrencileri_toplu_yaz_ve_kayitla(
-                self.koordinator["bolum_id"], ogrenciler, kayitlar
-            )
-            bilgi(f"{len(ogrenciler)} öğrenci ve {len(kayitlar)} kayıt işlendi.")
+        def _is(is_):
+            if Path(yol).suffix.lower() == ".xlsx":
+                # .xlsx: satır satır okunur, parçalar geldikçe yazılır (bellek sabit).
+                # İptal parça aralarında denetlenir; yazma tek işlemde olduğundan geri alınır.
+                hatalar = []
+
+                def _akis():
+                    okunan = 0
+                    for ogrenciler, kayitlar in ogrenci_excel_akis(yol, hatalar=hatalar):
+                        is_.denetle()
+                        okunan += len(ogrenciler)
+                        is_.ilerleme(f"{okunan} öğrenci satırı işlendi…")
+                        yield ogrenciler, kayitlar
+
+                return ogrenci_akisini_yaz(bolum_id, _akis()), hatalar
+            ogrenciler, kayitlar, hatalar = ogrenci_excel_parse(yol)
+            is_.denetle()
+            is_.ilerleme(f"{len(ogrenciler)} öğrenci yazılıyor…")
+            return (ogrencileri_toplu_yaz_ve_kayitla(bolum_id, ogrenciler, kayitlar)
+                    if ogrenciler else None), hatalar
+
+        self._arka_planda(_is, self._ogrenciler_yuklendi, "Öğrenci")
+
+    def _ogrenciler_yuklendi(self, ozet, hatalar):
+        if ozet and ozet["ogrenci"]:
+            bilgi(f"{ozet['ogrenci']} öğrenci ve {ozet['kayit']} kayıt işlendi. "
+                  f"({ozet['satir_sn']} satır/sn)")
 
             # ✅ Import sonrası callback
             if self.on_after_import:
@@ -113,7 +174,7 @@ class ImportPenceresi(ttk.Frame):
         if hatalar:
             log = LOG_DIR / "ogrenci_yukleme_hatalari.txt"
             log.write_text("\n".join(hatalar), encoding="utf-8")
-            renk = "red" if not ogrenciler else "#666"  # hiç kayıt yoksa kırmızı
+            renk = "red" if not (ozet and ozet["ogrenci"]) else "#666"  # hiç kayıt yoksa kırmızı
             self.lbl_hata.config(
                 text=f"Bazı satırlar atlandı. Ayrıntılar: {log}",
                 foreground=renk,
@@ -16,6 +16,8 @@ except Exception:
 
 # PDF yazıcı – imza: oturma_plani_pdf_kaydet(dosya_yolu, sinav_baslik, tarih_saat, derslikler, atamalar)
 from raporlar.oturma_plani_pdf import oturma_plani_pdf_kaydet  # type: ignore
+from arayuz.arka_plan import IlerlemeCubugu, arka_planda
+from arayuz.sanal_liste import SanalListe
 
 
 def _str(dtobj):
@@ -69,6 +71,7 @@ class OturmaPlaniPenceresi(ttk.Frame):
         self.get_program_func = get_program_func
         self.get_atamalar_func = get_atamalar_func
         self.get_derslikler_func = get_derslikler_func
+        self._is = None  # çalışan arka plan işi (PDF)
         self._build()
 
         # İlk yükleme
@@ -88,23 +91,15 @@ class OturmaPlaniPenceresi(ttk.Frame):
         # Üstte herhangi bir kısıt/süre alanı YOK (kaldırıldı)
 
         # Liste
-        self.tv = ttk.Treeview(frm, columns=self.KOLONLAR, show="headings", height=18)
-        self.tv.grid(row=0, column=0, sticky="nsew")
-        sb = ttk.Scrollbar(frm, orient="vertical", command=self.tv.yview)
-        self.tv.configure(yscrollcommand=sb.set)
-        sb.grid(row=0, column=1, sticky="ns")
-
-        self.tv.heading("ders_kodu", text="Ders Kodu")
-        self.tv.heading("ders_adi", text="Ders Adı")
-        self.tv.heading("baslangic", text="Başlangıç")
-        self.tv.heading("bitis", text="Bitiş")
-        self.tv.heading("derslik", text="Derslik(ler)")
-
-        self.tv.column("ders_kodu", width=120, anchor="w")
-        self.tv.column("ders_adi", width=280, anchor="w")
-        self.tv.column("baslangic", width=140, anchor="center")
-        self.tv.column("bitis", width=140, anchor="center")
-        self.tv.column("derslik", width=120, anchor="center")
+        # Sanal liste: yalnızca görünen satırlar çizilir; öğe etiketi program id'sidir
+        self.liste = SanalListe(frm, [("ders_kodu", "Ders Kodu", 120, "w"),
+                                      ("ders_adi", "Ders Adı", 280, "w"),
+                                      ("baslangic", "Başlangıç", 140, "center"),
+                                      ("bitis", "Bitiş", 140, "center"),
+                                      ("derslik", "Derslik(ler)", 120, "center")],
+                                satir_sayisi=18, etiket=lambda r: (str(r["pid"]),), arama=True)
+        self.liste.grid(row=0, column=0, columnspan=2, sticky="nsew")
+        self.tv = self.liste.tree
 
         # Alt butonlar
         btns = ttk.Frame(frm)
@@ -121,6 +116,9 @@ class OturmaPlaniPenceresi(ttk.Frame):
         self.btn_pdf.grid(row=0, column=1, padx=(8, 0))
         self.btn_xlsx.grid(row=0, column=2, padx=(8, 0))
 
+        self.ilerleme = IlerlemeCubugu(btns)
+        self.ilerleme.grid(row=0, column=3, padx=(12, 0))
+
     # ---------------------------- Data access helpers ----------------------------
 
     # Program listesi – esnek erişim
@@ -221,10 +219,10 @@ class OturmaPlaniPenceresi(ttk.Frame):
     # ---------------------------- Actions ----------------------------
 
     def _load_program(self):
-        self.tv.delete(*self.tv.get_children())
         program = self._fetch_program()
 
         # Beklenen alanları normalize et
+        satirlar = []
         for rec in program:
             pid = rec.get("program_id") or rec.get("id") or rec.get("pid")
             ders_kodu = rec.get("ders_kodu") or rec.get("kod") or rec.get("code") or ""
@@ -237,8 +235,9 @@ class OturmaPlaniPenceresi(ttk.Frame):
             bas_s = _str(bas)
             bit_s = _str(bit)
 
-            iid = f"p_{pid}"
-            self.tv.insert("", "end", iid=iid, values=(ders_kodu, ders_adi, bas_s, bit_s, derslik), tags=(str(pid),))
+            satirlar.append({"pid": pid, "ders_kodu": ders_kodu, "ders_adi": ders_adi,
+                             "baslangic": bas_s, "bitis": bit_s, "derslik": derslik})
+        self.liste.kaynak_ata(satirlar)
 
     def _get_selected_program_id(self):
         sel = self.tv.selection()
@@ -267,31 +266,21 @@ class OturmaPlaniPenceresi(ttk.Frame):
         _info(self, "Oturma planı oluşturuldu.")
 
     def _click_pdf(self):
+        if self._is is not None:
+            return
         pid = self._get_selected_program_id()
         if pid is None:
             _warn(self, "Lütfen listeden bir sınav seçin.")
             return
 
         # Seçili sınavın satırından başlık ve tarih-saat bilgilerini toparla
-        item = self.tv.item(self.tv.selection()[0])
-        v = item.get("values", ["", "", "", "", ""])
-        ders_kodu, ders_adi, bas_s, bit_s, derslik_kisa = (v + ["", "", "", "", ""])[:5]
+        satir = self.liste.secili()
+        ders_kodu, ders_adi, bas_s, bit_s, derslik_kisa = (satir[k] for k in self.KOLONLAR)
 
         # Başlık ve tarih/saat
         sinav_baslik = f"{ders_kodu} – {ders_adi}".strip(" –")
         tarih_saat = f"{bas_s} - {bit_s}".strip()
 
-        # Atamalar & derslikler
-        atamalar = self._create_plan_if_needed(pid)
-        if not atamalar:
-            _warn(self, "Bu sınava ait derslik/atama bulunamadı (PDF üretilemedi).")
-            return
-
-        derslikler = self._fetch_derslikler(pid)
-        if not derslikler:
-            # Bazı veri depolarında derslik listesi global gelir; gene de boşsa PDF'i uyarı ile üretelim
-            derslikler = []
-
         # Dosya yolu sor
         default_name = f"oturma_plani_{ders_kodu or 'sinav'}.pdf"
         pth = filedialog.asksaveasfilename(
@@ -304,27 +293,56 @@ class OturmaPlaniPenceresi(ttk.Frame):
         if not pth:
             return
 
-        try:
-            # İMZA sabit: (dosya_yolu, sinav_baslik, tarih_saat, derslikler, atamalar)
-            oturma_plani_pdf_kaydet(
-                dosya_yolu=pth,
-                sinav_baslik=sinav_baslik,
-                tarih_saat=tarih_saat,
-                derslikler=derslikler,
-                atamalar=atamalar,
-            )
-        except TypeError as e:
-            # Yanlış anahtar adı ile çağrılmışsa, pozisyonel fallback
+        # Atama üretimi ve PDF yazımı arka planda (büyük sınavlarda pencere donmasın)
+        def _is(is_):
+            is_.ilerleme("Oturma planı hazırlanıyor…")
+            atamalar = self._create_plan_if_needed(pid)
+            if not atamalar:
+                return False
+
+            derslikler = self._fetch_derslikler(pid)
+            if not derslikler:
+                # Bazı veri depolarında derslik listesi global gelir; gene de boşsa PDF'i uyarı ile üretelim
+                derslikler = []
+
+            is_.denetle()
+            is_.ilerleme("PDF yazılıyor…")
             try:
+                # İMZA sabit: (dosya_yolu, sinav_baslik, tarih_saat, derslikler, atamalar)
+                oturma_plani_pdf_kaydet(
+                    dosya_yolu=pth,
+                    sinav_baslik=sinav_baslik,
+                    tarih_saat=tarih_saat,
+                    derslikler=derslikler,
+                    atamalar=atamalar,
+                )
+            except TypeError:
+                # Yanlış anahtar adı ile çağrılmışsa, pozisyonel fallback
                 oturma_plani_pdf_kaydet(pth, sinav_baslik, tarih_saat, derslikler, atamalar)  # type: ignore
-            except Exception:
-                _error(self, f"PDF oluşturulamadı:\n{e}")
+            return True
+
+        def _son():
+            self._is = None
+            self.ilerleme.bitir()
+            for b in (self.btn_olustur, self.btn_pdf):
+                b.state(["!disabled"])
+
+        def _bitti(yazildi):
+            _son()
+            if not yazildi:
+                _warn(self, "Bu sınava ait derslik/atama bulunamadı (PDF üretilemedi).")
                 return
-        except Exception as e:
+            _info(self, f"PDF kaydedildi:\n{os.path.basename(pth)}")
+
+        def _hata(e):
+            _son()
             _error(self, f"PDF oluşturulamadı:\n{e}")
-            return
 
-        _info(self, f"PDF kaydedildi:\n{os.path.basename(pth)}")
+        self._is = arka_planda(self, _is, bitince=_bitti, hata=_hata,
+                               ilerleme=self.ilerleme.guncelle, iptal_edildi=_son)
+        for b in (self.btn_olustur, self.btn_pdf):
+            b.state(["disabled"])
+        self.ilerleme.baslat(self._is, "Oturma planı hazırlanıyor…")
 
     def _click_xlsx(self):
         """
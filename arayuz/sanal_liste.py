@@ -0,0 +1,349 @@
+# arayuz/sanal_liste.py
+# -*- coding: utf-8 -*-
+"""
+Binlerce satırlık listeler için sanal (yalnızca görüneni çizen) Treeview.
+
+Treeview'da her zaman yalnızca görünür satır sayısı kadar öğe vardır; kaydırma
+öğeleri silip eklemez, aynı öğelerin değerlerini günceller. Satırlar
+kaynaktan sayfa sayfa (keyset: `WHERE (baslangic, kod, id) > ? LIMIT ?`)
+gerektikçe okunur ve bellekte biriktirilir; ilk çizim yalnızca ilk sayfayı
+okur. Sıralama ve süzme bellekteki satırlar üzerinde bir konum dizini
+(görünüm) kurar; bunun için kalan sayfalar bir kez okunur.
+
+    liste = SanalListe(self, [("kod", "Ders Kodu", 120, "w"), ("ad", "Ders Adı", 280, "w")], arama=True)
+    liste.kaynak_ata(SayfaliKaynak(
+        lambda sonrasi, limit: sinav_programi_sayfasi(bolum_id, tur, sonrasi, limit),
+        anahtar=lambda r: (r["baslangic"], r["kod"], r["id"]),
+        sayi=lambda: sinav_programi_sayisi(bolum_id, tur)))
+    liste.kaynak_ata(satirlar)   # bellekteki liste de olur
+
+Veri mantığı (SanalListeModeli) Tk'den bağımsızdır.
+"""
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+# Kaynaktan tek seferde okunan satır sayısı
+SAYFA_BOYUTU = 200
+# Arama kutusunda yazmayı bekleme süresi (ms)
+ARAMA_GECIKMESI_MS = 250
+
+
+class SayfaliKaynak:
+    """
+    sayfa(sonrasi, limit): `sonrasi` anahtarından (None: baştan) sonraki en çok `limit` satır
+    anahtar(satir): satırın sıralama anahtarı (bir sonraki sayfanın `sonrasi`'ı)
+    sayi(): toplam satır sayısı (verilmezse kaydırma çubuğu okunan kadarına göre ayarlanır)
+    """
+
+    def __init__(self, sayfa: Callable[[Optional[tuple], int], Sequence[Any]],
+                 anahtar: Callable[[Any], tuple],
+                 sayi: Optional[Callable[[], int]] = None):
+        self.sayfa = sayfa
+        self.anahtar = anahtar
+        self.sayi = sayi
+
+
+def _sira_anahtari(deger: Any) -> Tuple[int, Any]:
+    """Karışık/None değerlerde de karşılaştırılabilir sıralama anahtarı."""
+    if deger is None:
+        return (2, "")
+    if isinstance(deger, (int, float)):
+        return (0, deger)
+    return (1, str(deger).casefold())
+
+
+class SanalListeModeli:
+    """
+    Satır önbelleği + görünüm dizini. Konumlar görünüm konumudur: sıralama/süzme
+    yoksa doğrudan önbellek sırası, varsa self._gorunum üzerinden.
+    """
+
+    def __init__(self, sayfa_boyutu: int = SAYFA_BOYUTU):
+        self.sayfa_boyutu = sayfa_boyutu
+        self._kaynak: Optional[SayfaliKaynak] = None
+        self._satirlar: List[Any] = []
+        self._bitti = True
+        self._toplam: Optional[int] = 0
+        self._gorunum: Optional[List[int]] = None
+        self._sira: Optional[Tuple[Any, bool]] = None  # (kolon, ters)
+        self._filtre: Optional[Tuple[str, Tuple[Any, ...]]] = None  # (metin, kolonlar)
+
+    # ---- kaynak ----
+    def ata(self, kaynak: Any) -> None:
+        """SayfaliKaynak ya da bellekteki satırlar; sıralama/süzme ayarları korunur."""
+        if isinstance(kaynak, SayfaliKaynak):
+            self._kaynak = kaynak
+            self._satirlar = []
+            self._bitti = False
+            self._toplam = kaynak.sayi() if kaynak.sayi is not None else None
+            self._sayfa_yukle()
+        else:
+            self._kaynak = None
+            self._satirlar = list(kaynak or [])
+            self._bitti = True
+            self._toplam = len(self._satirlar)
+        self._gorunumu_kur()
+
+    def _sayfa_yukle(self) -> None:
+        sonrasi = self._kaynak.anahtar(self._satirlar[-1]) if self._satirlar else None
+        sayfa = self._kaynak.sayfa(sonrasi, self.sayfa_boyutu)
+        self._satirlar.extend(sayfa)
+        if len(sayfa) < self.sayfa_boyutu:
+            self._bitti = True
+            self._toplam = len(self._satirlar)  # sayım okuma sırasında değiştiyse düzelir
+
+    def tumunu_yukle(self) -> None:
+        while not self._bitti:
+            self._sayfa_yukle()
+
+    @property
+    def yuklenen(self) -> int:
+        return len(self._satirlar)
+
+    def __len__(self) -> int:
+        if self._gorunum is not None:
+            return len(self._gorunum)
+        if self._toplam is not None:
+            return max(self._toplam, len(self._satirlar)) if not self._bitti else len(self._satirlar)
+        return len(self._satirlar) + (0 if self._bitti else 1)
+
+    def satir(self, konum: int) -> Optional[Any]:
+        """Görünüm konumundaki satır (gerekirse sonraki sayfalar okunur); yoksa None."""
+        if konum < 0:
+            return None
+        if self._gorunum is not None:
+            return self._satirlar[self._gorunum[konum]] if konum < len(self._gorunum) else None
+        while konum >= len(self._satirlar) and not self._bitti:
+            self._sayfa_yukle()
+        return self._satirlar[konum] if konum < len(self._satirlar) else None
+
+    # ---- sıralama / süzme ----
+    def sirala(self, kolon: Any, ters: bool = False) -> None:
+        self._sira = (kolon, ters)
+        self._gorunumu_kur()
+
+    def siralamayi_kaldir(self) -> None:
+        self._sira = None
+        self._gorunumu_kur()
+
+    @property
+    def siralama(self) -> Optional[Tuple[Any, bool]]:
+        return self._sira
+
+    def filtrele(self, metin: str, kolonlar: Sequence[Any]) -> None:
+        """Kolonlardan birinde (büyük/küçük harf duyarsız) `metin` geçen satırlar; boş metin süzmeyi kaldırır."""
+        metin = (metin or "").strip().casefold()
+        self._filtre = (metin, tuple(kolonlar)) if metin else None
+        self._gorunumu_kur()
+
+    def _gorunumu_kur(self) -> None:
+        if self._sira is None and self._filtre is None:
+            self._gorunum = None
+            return
+        self.tumunu_yukle()
+        konumlar = range(len(self._satirlar))
+        if self._filtre is not None:
+            metin, kolonlar = self._filtre
+            satirlar = self._satirlar
+            konumlar = [i for i in konumlar
+                        if any(metin in str(satirlar[i][k] if satirlar[i][k] is not None else "").casefold()
+                               for k in kolonlar)]
+        if self._sira is not None:
+            kolon, ters = self._sira
+            konumlar = sorted(konumlar, key=lambda i: _sira_anahtari(self._satirlar[i][kolon]), reverse=ters)
+        self._gorunum = list(konumlar)
+
+
+class SanalListe(ttk.Frame):
+    """
+    kolonlar: [(anahtar, başlık, genişlik, hizalama)]; anahtar satırdan değer okur (satir[anahtar])
+    satir_sayisi: başlangıçta görünen satır sayısı (pencere büyüyünce artar)
+    etiket(satir): Treeview öğesinin etiketleri (ör. kayıt id'si)
+    arama: üstte süzme kutusu; siralanabilir: başlığa tıklayınca sıralama
+
+    self.tree yalnızca görünen satırları taşır; seçim kaydırmada korunur,
+    secili() seçili satırı döndürür.
+    """
+
+    def __init__(self, master, kolonlar: Sequence[Tuple[Any, str, int, str]],
+                 satir_sayisi: int = 20, sayfa_boyutu: int = SAYFA_BOYUTU,
+                 etiket: Optional[Callable[[Any], Tuple[str, ...]]] = None,
+                 arama: bool = False, siralanabilir: bool = True, **kw):
+        super().__init__(master, **kw)
+        self.kolonlar = list(kolonlar)
+        self.model = SanalListeModeli(sayfa_boyutu)
+        self.etiket = etiket
+        self._ofset = 0
+        self._secili: Optional[int] = None
+        self._iids: List[str] = []
+        self._arama_zamanlayici = None
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        self.var_arama = tk.StringVar()
+        if arama:
+            frm = ttk.Frame(self)
+            frm.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 4))
+            ttk.Label(frm, text="Ara:").pack(side="left")
+            ttk.Entry(frm, textvariable=self.var_arama, width=30).pack(side="left", padx=4)
+            self.lbl_sayi = ttk.Label(frm, text="", foreground="#666")
+            self.lbl_sayi.pack(side="left", padx=6)
+            self.var_arama.trace_add("write", lambda *_: self._arama_degisti())
+        else:
+            self.lbl_sayi = None
+
+        anahtarlar = [str(k) for k, *_ in self.kolonlar]
+        self.tree = ttk.Treeview(self, columns=anahtarlar, show="headings",
+                                 height=satir_sayisi, selectmode="browse")
+        for (anahtar, baslik, genislik, hiza), ad in zip(self.kolonlar, anahtarlar):
+            self.tree.heading(ad, text=baslik,
+                              command=(lambda a=anahtar: self._baslik_tiklandi(a)) if siralanabilir else "")
+            self.tree.column(ad, width=genislik, anchor=hiza)
+        self.tree.grid(row=1, column=0, sticky="nsew")
+        self.sb = ttk.Scrollbar(self, orient="vertical", command=self._kaydir)
+        self.sb.grid(row=1, column=1, sticky="ns")
+
+        self._satir_sayisini_ayarla(satir_sayisi)
+
+        self.tree.bind("<Configure>", self._boyut_degisti)
+        self.tree.bind("<<TreeviewSelect>>", self._secim_degisti)
+        for olay in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(olay, self._tekerlek)
+        for tus, adim in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-sayfa"), ("<Next>", "sayfa"),
+                          ("<Home>", "bas"), ("<End>", "son")):
+            self.tree.bind(tus, lambda e, a=adim: self._tus(a))
+
+    # ---------- dış arayüz ----------
+    def kaynak_ata(self, kaynak: Any) -> None:
+        """Yeni veri: SayfaliKaynak ya da satır listesi. Sıralama ve arama metni korunur."""
+        self.model.ata(kaynak)
+        self._ofset = 0
+        self._secili = None
+        self._ciz()
+
+    def secili(self) -> Optional[Any]:
+        return self.model.satir(self._secili) if self._secili is not None else None
+
+    def sirala(self, anahtar: Any, ters: bool = False) -> None:
+        self.model.sirala(anahtar, ters)
+        for a, baslik, *_ in self.kolonlar:
+            ok = (" ▼" if ters else " ▲") if a == anahtar else ""
+            self.tree.heading(str(a), text=baslik + ok)
+        self._secili = None
+        self._ofset = 0
+        self._ciz()
+
+    def filtrele(self, metin: str) -> None:
+        self.model.filtrele(metin, [a for a, *_ in self.kolonlar])
+        self._secili = None
+        self._ofset = 0
+        self._ciz()
+
+    # ---------- çizim ----------
+    def _satir_sayisini_ayarla(self, n: int) -> None:
+        while len(self._iids) < n:
+            self._iids.append(self.tree.insert("", "end", values=()))
+        while len(self._iids) > n:
+            self.tree.delete(self._iids.pop())
+
+    def _ciz(self) -> None:
+        k = len(self._iids)
+        n = len(self.model)
+        self._ofset = max(0, min(self._ofset, n - k))
+        secim = ()
+        for j, iid in enumerate(self._iids):
+            satir = self.model.satir(self._ofset + j)
+            if satir is None:
+                self.tree.detach(iid)
+                continue
+            self.tree.item(iid, values=[satir[a] if satir[a] is not None else "" for a, *_ in self.kolonlar],
+                           tags=self.etiket(satir) if self.etiket else ())
+            self.tree.move(iid, "", j)
+            if self._ofset + j == self._secili:
+                secim = (iid,)
+        if tuple(self.tree.selection()) != secim:
+            self.tree.selection_set(secim)
+        n = len(self.model)  # okunan sayfalarla kesinleşmiş olabilir
+        if n:
+            self.sb.set(self._ofset / n, min(1.0, (self._ofset + k) / n))
+        else:
+            self.sb.set(0.0, 1.0)
+        if self.lbl_sayi is not None:
+            self.lbl_sayi.config(text=f"{n} kayıt")
+
+    # ---------- olaylar ----------
+    def _kaydir(self, *args) -> None:
+        n, k = len(self.model), len(self._iids)
+        if args[0] == "moveto":
+            self._ofset = int(float(args[1]) * n)
+        elif args[0] == "scroll":
+            adim = int(args[1])
+            self._ofset += adim * (max(1, k - 1) if args[2] == "pages" else 1)
+        self._ciz()
+
+    def _tekerlek(self, olay):
+        if olay.num == 4 or getattr(olay, "delta", 0) > 0:
+            self._ofset -= 3
+        else:
+            self._ofset += 3
+        self._ciz()
+        return "break"
+
+    def _tus(self, adim):
+        n, k = len(self.model), len(self._iids)
+        if not n:
+            return "break"
+        simdi = self._secili if self._secili is not None else self._ofset
+        if adim == "bas":
+            yeni = 0
+        elif adim == "son":
+            self.model.tumunu_yukle()
+            n = len(self.model)
+            yeni = n - 1
+        elif adim in ("sayfa", "-sayfa"):
+            yeni = simdi + (max(1, k - 1) if adim == "sayfa" else -max(1, k - 1))
+        else:
+            yeni = simdi + adim
+        yeni = max(0, min(yeni, len(self.model) - 1))
+        if self.model.satir(yeni) is None:
+            return "break"
+        self._secili = yeni
+        if yeni < self._ofset:
+            self._ofset = yeni
+        elif yeni >= self._ofset + k:
+            self._ofset = yeni - k + 1
+        self._ciz()
+        self.tree.focus(self.tree.selection()[0] if self.tree.selection() else "")
+        return "break"
+
+    def _secim_degisti(self, _olay=None) -> None:
+        sec = self.tree.selection()
+        if sec and sec[0] in self._iids:
+            self._secili = self._ofset + self._iids.index(sec[0])
+
+    def _boyut_degisti(self, olay) -> None:
+        kutu = self.tree.bbox(self._iids[0]) if self._iids else ""
+        if not kutu or not kutu[3]:
+            return
+        _, ust, _, satir_y = kutu
+        n = max(1, (olay.height - ust) // satir_y)
+        if n != len(self._iids):
+            self._satir_sayisini_ayarla(n)
+            self._ciz()
+
+    def _baslik_tiklandi(self, anahtar: Any) -> None:
+        sira = self.model.siralama
+        self.sirala(anahtar, ters=bool(sira and sira[0] == anahtar and not sira[1]))
+
+    def _arama_degisti(self) -> None:
+        if self._arama_zamanlayici is not None:
+            self.after_cancel(self._arama_zamanlayici)
+        self._arama_zamanlayici = self.after(ARAMA_GECIKMESI_MS, self._arama_uygula)
+
+    def _arama_uygula(self) -> None:
+        self._arama_zamanlayici = None
+        self.filtrele(self.var_arama.get())
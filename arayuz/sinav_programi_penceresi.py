@@ -3,19 +3,27 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import date, time
 from veri_deposu import (
-    dersler_ogrsay_ve_alanlar_detayli, derslikler_kapasite_listesi,
-    sinav_programini_temizle, sinav_kaydet, sinav_programi_listele,
-    export_sinav_programi_to_excel
+    derslikler_kapasite_listesi,
+    sinav_programini_temizle, sinav_programi_kaydet, sinav_programi_sayfasi, sinav_programi_sayisi,
+    export_sinav_programi_to_excel, mevcut_yerlestirmeler, sinavlari_sil,
+    fakulte_plan_kaynagini_hazirla, fakulte_programini_kaydet
 )
+from veritabani import islem
+from arayuz.arka_plan import IlerlemeCubugu, arka_planda
+from arayuz.sanal_liste import SanalListe, SayfaliKaynak
+from arayuz.bolum_verisi import BolumVerisi
 from planner import PlanKisit, planla
 
 def _msg_info(t): messagebox.showinfo("Bilgi", t)
 def _msg_err(t): messagebox.showerror("Hata", t)
 
 class SinavProgramiPenceresi(ttk.Frame):
-    def __init__(self, master, koordinator):
+    def __init__(self, master, koordinator, veri=None):
         super().__init__(master, padding=10)
         self.k = koordinator
+        self.veri = veri or BolumVerisi(koordinator["bolum_id"])  # sekmelerle paylaşılan ders listesi
+        self._surum = None
+        self._is = None  # çalışan arka plan işi (planlama)
         self._build()
 
     def _build(self):
@@ -65,32 +73,66 @@ class SinavProgramiPenceresi(ttk.Frame):
         self.ent_bekleme = ttk.Entry(frm, width=6); self.ent_bekleme.insert(0, "15")
         self.ent_bekleme.grid(row=row, column=1, sticky="w")
 
+        row += 1
+        ttk.Label(frm, text="Öğrenci Başına Günlük Azami Sınav:").grid(row=row, column=0, sticky="w")
+        self.ent_gunluk = ttk.Entry(frm, width=6)
+        self.ent_gunluk.grid(row=row, column=1, sticky="w")
+
+        row += 1
+        ttk.Label(frm, text="İyileştirme Süresi (sn):").grid(row=row, column=0, sticky="w")
+        self.ent_iyilestirme = ttk.Entry(frm, width=6); self.ent_iyilestirme.insert(0, "0")
+        self.ent_iyilestirme.grid(row=row, column=1, sticky="w")
+
         row += 1
         self.var_nopar = tk.BooleanVar(value=False)
         ttk.Checkbutton(frm, text="Hiçbir dersin sınavı aynı anda olmasın (paralel yasak)",
                         variable=self.var_nopar).grid(row=row, column=1, sticky="w")
 
+        row += 1
+        self.var_artimli = tk.BooleanVar(value=False)
+        ttk.Checkbutton(frm, text="Mevcut programı koru (yalnızca değişen dersleri yeniden yerleştir)",
+                        variable=self.var_artimli).grid(row=row, column=1, sticky="w")
+
+        row += 1
+        self.var_fakulte = tk.BooleanVar(value=False)
+        chk_fakulte = ttk.Checkbutton(frm, text="Fakülte geneli planla (tüm bölümler birlikte, derslikler ortak; yalnızca admin)",
+                                      variable=self.var_fakulte)
+        chk_fakulte.grid(row=row, column=1, sticky="w")
+        if self.k["rol"] != "admin":
+            chk_fakulte.state(["disabled"])
+
         bfrm = ttk.Frame(self); bfrm.grid(row=2, column=0, sticky="ew", pady=(8, 4))
-        ttk.Button(bfrm, text="Programı Oluştur", command=self._olustur).pack(side="left")
+        self.btn_olustur = ttk.Button(bfrm, text="Programı Oluştur", command=self._olustur)
+        self.btn_olustur.pack(side="left")
         ttk.Button(bfrm, text="Programı Temizle", command=self._temizle).pack(side="left", padx=6)
         ttk.Button(bfrm, text="Excel'e Aktar", command=self._export_excel).pack(side="left")
+        self.ilerleme = IlerlemeCubugu(bfrm)
+        self.ilerleme.pack(side="left", padx=12)
 
-        self.tree = ttk.Treeview(self, columns=("kod", "ad", "bas", "bit"), show="headings", height=14)
-        for k, t in (("kod", "Ders Kodu"), ("ad", "Ders Adı"), ("bas", "Başlangıç"), ("bit", "Bitiş")):
-            self.tree.heading(k, text=t)
-            self.tree.column(k, width=160 if k in ("bas", "bit") else 140)
-        self.tree.grid(row=3, column=0, sticky="nsew")
+        # Büyük programlarda yalnızca görünen satırlar çizilir, kayıtlar sayfa sayfa okunur
+        self.liste = SanalListe(self, [("kod", "Ders Kodu", 140, "w"), ("ad", "Ders Adı", 140, "w"),
+                                       ("baslangic", "Başlangıç", 160, "w"), ("bitis", "Bitiş", 160, "w")],
+                                satir_sayisi=14, arama=True)
+        self.liste.grid(row=3, column=0, sticky="nsew")
         self.rowconfigure(3, weight=1)
 
         self._listele()
 
     def _dersleri_yukle_listbox(self):
-        self._dersler = dersler_ogrsay_ve_alanlar_detayli(self.k["bolum_id"])
+        self._surum = self.veri.surum
+        self._dersler = self.veri.dersler()
         self.lst.delete(0, "end")
         for d in self._dersler:
             sinif_txt = f" [S{d['sinif']}]" if d.get("sinif") else ""
             self.lst.insert("end", f"{d['kod']} - {d['ad']}{sinif_txt}  ({d['ogr_say']} öğr.)")
 
+    def yenile(self):
+        """Sekme yeniden gösterildiğinde: paylaşılan veri değiştiyse ders listesi ve program tazelenir."""
+        if self._surum == self.veri.surum:
+            return
+        self._dersleri_yukle_listbox()
+        self._listele()
+
     def _secili_ders_ids(self):
         idxs = self.lst.curselection()
         if not idxs:
@@ -108,6 +150,8 @@ class SinavProgramiPenceresi(ttk.Frame):
         return out
 
     def _olustur(self):
+        if self._is is not None:
+            return
         try:
             t1 = date.fromisoformat(self.ent_t1.get().strip())
             t2 = date.fromisoformat(self.ent_t2.get().strip())
@@ -115,13 +159,28 @@ class SinavProgramiPenceresi(ttk.Frame):
             sinav_turu = self.cmb_tur.get()
             default_sure = int(self.ent_sure.get())
             bekleme = int(self.ent_bekleme.get())
+            gunluk = self.ent_gunluk.get().strip()
+            gunluk_azami = int(gunluk) if gunluk else None
+            iyilestirme = float(self.ent_iyilestirme.get() or 0)
             gun_disi = set()
             if self.var_we.get(): gun_disi.add(5)
             if self.var_su.get(): gun_disi.add(6)
             dahil = self._secili_ders_ids()
 
-            dersler = dersler_ogrsay_ve_alanlar_detayli(self.k["bolum_id"])
-            derslikler = derslikler_kapasite_listesi(self.k["bolum_id"])
+            artimli = self.var_artimli.get()
+            fakulte = self.var_fakulte.get()
+            if fakulte:
+                if self.k["rol"] != "admin":
+                    raise PermissionError("Fakülte geneli planlama yalnızca admin yetkisindedir.")
+                if artimli:
+                    raise ValueError("Fakülte geneli planlama, mevcut programı koruma seçeneğiyle birlikte kullanılamaz.")
+                if not messagebox.askyesno(
+                        "Onay", f"Tüm bölümlerin {sinav_turu} programı silinip birlikte yeniden oluşturulacak. Devam edilsin mi?"):
+                    return
+                dahil = None
+            # bölümün dersleri UI iş parçacığında, paylaşılan veriden alınır; iş bu anlık
+            # görüntüyle çalışır (planlayıcı ders kayıtlarını değiştirmez)
+            bolum_dersleri = None if fakulte else self.veri.dersler()
 
             k = PlanKisit(
                 dahil_ders_ids=dahil,
@@ -132,41 +191,92 @@ class SinavProgramiPenceresi(ttk.Frame):
                 default_sure=default_sure,
                 ders_istisna_sure={},
                 bekleme_dk=bekleme,
+                gunluk_azami_sinav=gunluk_azami,
                 paralel_yasak=self.var_nopar.get()
             )
+        except Exception as e:
+            _msg_err(str(e))
+            return
 
-            cikti, uyarilar, fatal = planla(k, dersler, derslikler)
-            if fatal:
-                _msg_err("Program oluşturulamadı.")
-                return
+        bolum_id = self.k["bolum_id"]
+        kullanici = self.k
 
-            sinav_programini_temizle(self.k["bolum_id"], sinav_turu)
+        # Okuma, planlama ve kayıt arka planda; Tk'ye yalnızca geri çağrılarda dokunulur
+        def _is(is_):
+            is_.ilerleme("Veriler okunuyor…")
+            if fakulte:
+                dersler, derslikler = fakulte_plan_kaynagini_hazirla()
+            else:
+                dersler = bolum_dersleri
+                # başka bölümlerin ortak dersliklerdeki sınavları planlayıcıya dolu olarak verilir
+                derslikler = derslikler_kapasite_listesi(bolum_id, sinav_turu)
+            mevcut = mevcut_yerlestirmeler(bolum_id, sinav_turu) if artimli else None
 
-            yerlesemeyen = 0
-            for row in cikti:
-                if row["baslangic"] is None:
-                    yerlesemeyen += 1
-                    continue
-                b = row["baslangic"].strftime("%Y-%m-%d %H:%M")
-                e = row["bitis"].strftime("%Y-%m-%d %H:%M")
-                sinav_kaydet(
-                    self.k["bolum_id"], row["ders_id"], sinav_turu,
-                    b, e, (row["bitis"] - row["baslangic"]).seconds // 60, bekleme,
-                    row["derslik_ids"]
-                )
+            is_.denetle()
+            is_.ilerleme("Planlanıyor…")
+            cikti, uyarilar, fatal = planla(
+                k, dersler, derslikler, sabit=mevcut, iyilestirme_sn=0 if artimli else iyilestirme,
+                iptal=is_.iptal,
+                ilerleme=lambda p: is_.ilerleme(f"Planlanıyor ({p.asama})… {p.yerlesen} ders yerleşti, {p.kalan} kaldı", p.oran))
+            if fatal:
+                return None
 
-            self._listele()
+            is_.denetle()  # bundan sonra iptal yok: kayıt tek işlemde biter
+            is_.ilerleme("Kaydediliyor…")
+            if fakulte:
+                kaydedilen = fakulte_programini_kaydet(kullanici, sinav_turu, cikti, bekleme)
+                msg = f"Fakülte programı üretildi. Kaydedilen sınav: {kaydedilen}, yerleşemeyen ders: {len(dersler) - kaydedilen}"
+                if uyarilar:
+                    msg += "\n\nUyarılar:\n- " + "\n- ".join(uyarilar[:10])
+                return msg
+
+            # temizleme + kayıt tek işlemde: hata olursa eski program korunur
+            with islem():
+                if artimli:
+                    # yalnızca yerinde kalmayan sınavlar silinir; korunanların oturma planı da korunur
+                    korunan = {row["sinav_id"] for row in cikti if row.get("sabit")}
+                    sinavlari_sil([y["sinav_id"] for y in mevcut if y["sinav_id"] not in korunan])
+                else:
+                    sinav_programini_temizle(bolum_id, sinav_turu)
+                yeni = [row for row in cikti if not row.get("sabit")]
+                yerlesemeyen = len(yeni) - sinav_programi_kaydet(bolum_id, sinav_turu, yeni, bekleme)
 
             msg = f"Program üretildi. Yerleşemeyen ders: {yerlesemeyen}"
+            if artimli:
+                yeni = sum(1 for row in cikti if not row.get("sabit") and row["baslangic"] is not None)
+                msg += f"\nYerinde kalan sınav: {len(cikti) - yeni}, yeniden yerleşen/yeni: {yeni}"
             if uyarilar:
                 msg += "\n\nUyarılar:\n- " + "\n- ".join(uyarilar[:10])
                 if len(uyarilar) > 10:
                     msg += f"\n... (+{len(uyarilar) - 10} uyarı)"
+            return msg
+
+        def _bitti(msg):
+            self._is_bitti()
+            if msg is None:
+                _msg_err("Program oluşturulamadı.")
+                return
+            self._listele()
             _msg_info(msg)
 
-        except Exception as e:
+        def _hata(e):
+            self._is_bitti()
             _msg_err(str(e))
 
+        def _iptal():
+            self._is_bitti()
+            _msg_info("Program oluşturma iptal edildi; kayıtlı program değiştirilmedi.")
+
+        self._is = arka_planda(self, _is, bitince=_bitti, hata=_hata,
+                               ilerleme=self.ilerleme.guncelle, iptal_edildi=_iptal)
+        self.btn_olustur.state(["disabled"])
+        self.ilerleme.baslat(self._is, "Veriler okunuyor…")
+
+    def _is_bitti(self):
+        self._is = None
+        self.ilerleme.bitir()
+        self.btn_olustur.state(["!disabled"])
+
     def _temizle(self):
         try:
             sinav_turu = self.cmb_tur.get()
@@ -177,12 +287,12 @@ class SinavProgramiPenceresi(ttk.Frame):
             _msg_err(str(e))
 
     def _listele(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
         sinav_turu = self.cmb_tur.get() or "vize"
-        rows = sinav_programi_listele(self.k["bolum_id"], sinav_turu)
-        for r in rows:
-            self.tree.insert("", "end", values=(r["kod"], r["ad"], r["baslangic"], r["bitis"]))
+        bolum_id = self.k["bolum_id"]
+        self.liste.kaynak_ata(SayfaliKaynak(
+            lambda sonrasi, limit: sinav_programi_sayfasi(bolum_id, sinav_turu, sonrasi, limit),
+            anahtar=lambda r: (r["baslangic"], r["kod"], r["id"]),
+            sayi=lambda: sinav_programi_sayisi(bolum_id, sinav_turu)))
 
     def _export_excel(self):
         try:
@@ -0,0 +1,112 @@
+# bakim/indeks_danismani.py
+# veri_deposu.py içindeki her SQL sorgusunu EXPLAIN QUERY PLAN ile çalıştırır ve
+# tam tablo taramalarını (SCAN <tablo>, indeks kullanmadan) raporlar.
+#
+#   python -m bakim.indeks_danismani                 # şema + göçlerle kurulan boş, geçici veritabanı
+#   python -m bakim.indeks_danismani sinav_sistemi.db  # mevcut veritabanı (salt okunur)
+from __future__ import annotations
+import ast
+import re
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import veritabani
+
+KAYNAK = Path(__file__).resolve().parents[1] / "veri_deposu.py"
+RE_SQL = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+RE_TAM_TARAMA = re.compile(r"^SCAN (\S+)$")  # "SCAN t USING (COVERING) INDEX ..." indeks taramasıdır
+RE_GECICI_TABLO = re.compile(r"^\s*CREATE\s+TEMP(?:ORARY)?\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE)
+
+def _metin(dugum) -> str | None:
+    """str sabiti ya da f-string → SQL metni (f-string parçaları '?' ile doldurulur)."""
+    if isinstance(dugum, ast.Constant) and isinstance(dugum.value, str):
+        return dugum.value
+    if isinstance(dugum, ast.JoinedStr):
+        parcalar = []
+        for p in dugum.values:
+            if isinstance(p, ast.Constant):
+                parcalar.append(str(p.value))
+            else:
+                parcalar.append("?")
+        return "".join(parcalar)
+    return None
+
+def sorgulari_topla(kaynak: Path = KAYNAK) -> list[tuple[str, int, str]]:
+    """[(fonksiyon, satır, sql)] — kaynaktaki SQL'e benzeyen tüm metinler."""
+    agac = ast.parse(kaynak.read_text(encoding="utf-8"))
+    out = []
+    for fn in ast.walk(agac):
+        if not isinstance(fn, ast.FunctionDef):
+            continue
+        # f-string içindeki sabit parçalar ayrı sorgu sayılmasın
+        fstring_parcalari = {id(p) for d in ast.walk(fn) if isinstance(d, ast.JoinedStr) for p in d.values}
+        for dugum in ast.walk(fn):
+            if id(dugum) in fstring_parcalari:
+                continue
+            sql = _metin(dugum)
+            if sql and RE_SQL.match(sql):
+                out.append((fn.name, dugum.lineno, sql))
+    # iç içe fonksiyonlarda aynı metin iki kez görülebilir
+    return sorted(set(out), key=lambda x: x[1])
+
+def gecici_tablolari_topla(kaynak: Path = KAYNAK) -> list[str]:
+    """Kaynaktaki CREATE TEMP TABLE metinleri (toplu aktarım ara tabloları gibi)."""
+    agac = ast.parse(kaynak.read_text(encoding="utf-8"))
+    out = []
+    for dugum in ast.walk(agac):
+        sql = _metin(dugum)
+        if sql and RE_GECICI_TABLO.match(sql) and sql not in out:
+            out.append(sql)
+    return out
+
+def _sema_baglantisi(yol: str | None) -> sqlite3.Connection:
+    if yol:
+        vt = sqlite3.connect(f"file:{yol}?mode=ro", uri=True)
+    else:
+        vt = sqlite3.connect(Path(tempfile.mkdtemp()) / "danisman.db")
+        vt.row_factory = sqlite3.Row
+        vt.executescript(veritabani.TABLO_YAPISI)
+        veritabani._migrate(vt)
+    # TEMP tablolar bağlantıya özeldir; onlara başvuran sorgular "no such table" vermesin
+    for sql in gecici_tablolari_topla():
+        vt.execute(sql)
+    return vt
+
+def _gecici_tablo_adlari() -> set[str]:
+    """Parça parça doldurulup bütünüyle okunan ara tablolar; taramaları beklenen davranıştır."""
+    return {RE_GECICI_TABLO.match(sql).group(1) for sql in gecici_tablolari_topla()}
+
+def analiz_et(yol: str | None = None) -> list[dict]:
+    vt = _sema_baglantisi(yol)
+    gecici = _gecici_tablo_adlari()
+    rapor = []
+    for fn, satir, sql in sorgulari_topla():
+        try:
+            plan = vt.execute(f"EXPLAIN QUERY PLAN {sql}", (None,) * sql.count("?")).fetchall()
+        except sqlite3.Error as e:
+            rapor.append({"fonksiyon": fn, "satir": satir, "hata": str(e), "taramalar": [], "plan": []})
+            continue
+        detaylar = [r[3] for r in plan]
+        taramalar = [m.group(1) for d in detaylar
+                     if (m := RE_TAM_TARAMA.match(d)) and m.group(1) not in gecici]
+        rapor.append({"fonksiyon": fn, "satir": satir, "hata": None, "taramalar": taramalar, "plan": detaylar})
+    vt.close()
+    return rapor
+
+def main(argv: list[str]) -> int:
+    rapor = analiz_et(argv[0] if argv else None)
+    sorunlu = [r for r in rapor if r["taramalar"] or r["hata"]]
+    for r in rapor:
+        durum = "HATA" if r["hata"] else ("TARAMA" if r["taramalar"] else "ok")
+        ek = r["hata"] or ", ".join(r["taramalar"])
+        print(f"{durum:7} {r['fonksiyon']}:{r['satir']}  {ek}")
+        if r["taramalar"]:
+            for d in r["plan"]:
+                print(f"          {d}")
+    print(f"\n{len(rapor)} sorgu incelendi; {len(sorunlu)} tanesinde tam tablo taraması veya hata var.")
+    return 1 if sorunlu else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -32,13 +32,8 @@ def temizle(bolum_id: int | None = None):
                 sil_ids.append(r["id"]); continue
             if _norm(ad) in HEADING_LIKE or _norm(kod) in HEADING_LIKE or _norm(hoca) in HEADING_LIKE:
                 sil_ids.append(r["id"]); continue
-        if sil_ids:
-            q = ",".join("?"*len(sil_ids))
-            vt.execute(f"DELETE FROM ogrenci_ders WHERE ders_id IN ({q})", sil_ids)
-            vt.execute(f"DELETE FROM dersler WHERE id IN ({q})", sil_ids)
-            print(f"{len(sil_ids)} ders silindi.")
-
         # 2) bu derslerle ilişkili sınav kayıtlarını da güvene al
+        #    (foreign_keys=ON: dersler silinmeden önce programdan çıkarılmalı)
         if bolum_id is not None:
             vt.execute("DELETE FROM sinav_programi WHERE bolum_id=?", (bolum_id,))
         else:
@@ -46,6 +41,12 @@ def temizle(bolum_id: int | None = None):
 
         print("Sınav programı temizlendi.")
 
+        if sil_ids:
+            q = ",".join("?"*len(sil_ids))
+            vt.execute(f"DELETE FROM ogrenci_ders WHERE ders_id IN ({q})", sil_ids)
+            vt.execute(f"DELETE FROM dersler WHERE id IN ({q})", sil_ids)
+            print(f"{len(sil_ids)} ders silindi.")
+
 if __name__ == "__main__":
     # Tamamını temizlemek için:
     temizle(bolum_id=None)
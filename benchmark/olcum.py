@@ -0,0 +1,357 @@
+# benchmark/olcum.py
+# -*- coding: utf-8 -*-
+"""
+Planlayıcı benchmark takımı: sentetik üniversitede (bkz. benchmark.sentetik)
+S / M / L / XL boyutlarında
+
+  - plan kaynağı okuma (bölüm ve fakülte geneli)
+  - ana pencere veri sekmelerinin ilk gösterimde okuduğu veri
+  - planla motorları (fakülte geneli girdiyle) ve program kaydı
+  - oturma atayıcıları (tüm sınavlar)
+  - dışa aktarıcılar (program ve çakışma Excel'i, oturma planı PDF'i)
+
+ölçer. Her senaryo için süre (tekrarların en kısası ve medyanı), ayrı bir
+çalıştırmada tracemalloc ile tepe bellek ve planlama senaryolarında program
+kalitesi (yerleşemeyen ders, öğrenci/derslik çakışması, bekleme ihlali,
+derslik doluluğu) raporlanır. Sonuçlar JSON olarak yazılıp önceki bir
+çalıştırmayla karşılaştırılabilir.
+
+Senaryolar pytest-benchmark'taki gibi yazılır: `olc(fn)` fn'i ölçer ve
+sonucunu döndürür; senaryo isterse bir kalite sözlüğü döndürür. Her boyut
+geçici bir veritabanında kurulur; senaryolar birbirinden bağımsızdır
+(oturma/dışa aktarma senaryoları için açgözlü program önceden kaydedilir).
+
+Çalıştırma (proje kökünden):
+    python -m benchmark.olcum
+    python -m benchmark.olcum --boyut S M L XL --json sonuc.json
+    python -m benchmark.olcum --boyut M --senaryo planla/acgozlu planla/graf --karsilastir onceki.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, time as dtime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import koltuk_atama
+import oturma_atayici
+import veri_deposu
+import veritabani
+from arayuz.bolum_verisi import BolumVerisi
+from arayuz.sanal_liste import SAYFA_BOYUTU
+from benchmark.sentetik import BOYUTLAR, SentetikUniversite, planlayici_girdisi, universite_uret, veritabanina_yaz
+from planner import PlanKisit, _kisitlari_coz, planla
+from raporlar.oturma_plani_pdf import oturma_plani_pdf_yaz
+
+JSON_SURUMU = 1
+TARIH_BAS = date(2026, 1, 5)  # Pazartesi
+SLOTLAR = [dtime(9, 0), dtime(11, 0), dtime(13, 30), dtime(15, 30), dtime(17, 30)]
+BEKLEME_DK = 15
+YONETICI = {"rol": "admin", "bolum_id": None}  # fakülte geneli kayıt için
+
+
+@dataclass
+class Ortam:
+    uni: SentetikUniversite
+    dizin: Path
+    dersler: List[Dict[str, Any]]
+    derslikler: List[Dict[str, Any]]
+    kisit: PlanKisit
+    program: List[Dict[str, Any]]  # önceden kaydedilen açgözlü program
+
+
+Senaryo = Callable[[Ortam, Callable[[Callable[[], Any]], Any]], Optional[Dict[str, Any]]]
+SENARYOLAR: Dict[str, Senaryo] = {}
+
+
+def senaryo(ad: str) -> Callable[[Senaryo], Senaryo]:
+    def kaydet(fn: Senaryo) -> Senaryo:
+        SENARYOLAR[ad] = fn
+        return fn
+    return kaydet
+
+
+# ---------------- kalite ----------------
+def cizelge_kalitesi(dersler: List[Dict[str, Any]], derslikler: List[Dict[str, Any]],
+                     yerlestirmeler: List[Dict[str, Any]], bekleme_dk: int = 0) -> Dict[str, Any]:
+    """
+    Programın kalite ölçüleri (sert kısıt ihlalleri 0 olmalıdır):
+      yerlesmeyen / yerlesmeyen_ogrenci: yerleşemeyen ders ve bu derslerin öğrenci sayısı toplamı
+      ogrenci_cakismasi / bekleme_ihlali: aynı öğrencinin üst üste binen / bekleme süresinden yakın sınavları
+      derslik_cakismasi: aynı derslikte üst üste binen sınavlar
+      derslik_dolulugu: yerleşen öğrenci / ayrılan derslik kapasitesi
+      ayni_gun_ogrenci: aynı gün en az iki sınavı olan (öğrenci, gün) sayısı
+    """
+    ders_by_id = {int(d["id"]): d for d in dersler}
+    kapasite = {int(dl["id"]): int(dl["kapasite"]) for dl in derslikler}
+    gap = timedelta(minutes=bekleme_dk)
+    ogr_sinav: Dict[int, List[Tuple[datetime, datetime]]] = {}
+    oda_sinav: Dict[int, List[Tuple[datetime, datetime]]] = {}
+    yerlesen_ogr = ayrilan_kap = 0
+    yerlesen = set()
+    for y in yerlestirmeler:
+        if y.get("baslangic") is None:
+            continue
+        d = ders_by_id[int(y["ders_id"])]
+        yerlesen.add(int(y["ders_id"]))
+        aralik = (y["baslangic"], y["bitis"])
+        for oid in d.get("ogr_ids") or ():
+            ogr_sinav.setdefault(oid, []).append(aralik)
+        for dl in y.get("derslik_ids") or ():
+            oda_sinav.setdefault(int(dl), []).append(aralik)
+            ayrilan_kap += kapasite.get(int(dl), 0)
+        yerlesen_ogr += int(d.get("ogr_say") or 0)
+
+    def _ust_uste(araliklar: List[Tuple[datetime, datetime]], bosluk: timedelta) -> Tuple[int, int]:
+        cakisma = yakin = 0
+        son = None
+        for b, e in sorted(araliklar):
+            if son is not None:
+                if b < son:
+                    cakisma += 1
+                elif b < son + bosluk:
+                    yakin += 1
+            son = e if son is None or e > son else son
+        return cakisma, yakin
+
+    ogr_cak = bekleme = ayni_gun = 0
+    for araliklar in ogr_sinav.values():
+        c, y = _ust_uste(araliklar, gap)
+        ogr_cak += c
+        bekleme += y
+        gun_say = Counter(b.date() for b, _ in araliklar)
+        ayni_gun += sum(1 for n in gun_say.values() if n > 1)
+    oda_cak = sum(_ust_uste(a, timedelta())[0] for a in oda_sinav.values())
+    yerlesmeyen = [d for did, d in ders_by_id.items() if did not in yerlesen]
+    return {
+        "ders": len(ders_by_id),
+        "yerlesmeyen": len(yerlesmeyen),
+        "yerlesmeyen_ogrenci": sum(int(d.get("ogr_say") or 0) for d in yerlesmeyen),
+        "ogrenci_cakismasi": ogr_cak,
+        "bekleme_ihlali": bekleme,
+        "derslik_cakismasi": oda_cak,
+        "derslik_dolulugu": round(yerlesen_ogr / ayrilan_kap, 4) if ayrilan_kap else None,
+        "ayni_gun_ogrenci": ayni_gun,
+    }
+
+
+# ---------------- senaryolar ----------------
+@senaryo("plan_kaynagini_hazirla")
+def _plan_kaynagi(o: Ortam, olc) -> None:
+    olc(lambda: veri_deposu.plan_kaynagini_hazirla(1))
+
+
+@senaryo("fakulte_plan_kaynagini_hazirla")
+def _fakulte_kaynagi(o: Ortam, olc) -> None:
+    olc(lambda: veri_deposu.fakulte_plan_kaynagini_hazirla())
+
+
+@senaryo("sekme_verisi")
+def _sekme_verisi(o: Ortam, olc) -> Dict[str, Any]:
+    # Sınav Programı + Ders Listesi sekmelerinin ilk gösterimi ve ilk ders seçimi (Tk'siz)
+    def _ac():
+        veri = BolumVerisi(1)
+        dersler = veri.dersler()
+        veri_deposu.sinav_programi_sayisi(1, "vize")
+        program = veri_deposu.sinav_programi_sayfasi(1, "vize", None, SAYFA_BOYUTU)
+        veri.dersler()  # ikinci sekme: önbellekten
+        en_kalabalik = max(dersler, key=lambda d: d["ogr_say"], default=None)
+        if en_kalabalik is not None:
+            veri.kayit_matrisi().cakisan_dersler(en_kalabalik["id"])
+            veri_deposu.derse_kayitli_ogrenciler_sayfasi(en_kalabalik["id"], None, SAYFA_BOYUTU)
+        return dersler, program
+    dersler, program = olc(_ac)
+    return {"ders": len(dersler), "ilk_sayfa": len(program)}
+
+
+def _motor_senaryosu(motor: str) -> Senaryo:
+    def _calistir(o: Ortam, olc) -> Dict[str, Any]:
+        y, uyarilar, fatal = olc(lambda: planla(o.kisit, o.dersler, o.derslikler, motor=motor))
+        return {**cizelge_kalitesi(o.dersler, o.derslikler, y, BEKLEME_DK), "uyari": len(uyarilar), "fatal": fatal}
+    return _calistir
+
+
+for _motor in ("acgozlu", "graf"):
+    senaryo(f"planla/{_motor}")(_motor_senaryosu(_motor))
+
+
+@senaryo("fakulte_programini_kaydet")
+def _kaydet(o: Ortam, olc) -> None:
+    olc(lambda: veri_deposu.fakulte_programini_kaydet(YONETICI, "vize", o.program, BEKLEME_DK))
+
+
+def _oturma_girdileri(o: Ortam) -> List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    ders_by_id = {d["id"]: d for d in o.dersler}
+    ogr_by_id = {og["id"]: og for og in o.uni.ogrenciler}
+    oda_by_id = {dl["id"]: dl for dl in o.derslikler}
+    return [
+        ([ogr_by_id[oid] for oid in sorted(ders_by_id[y["ders_id"]]["ogr_ids"])],
+         [oda_by_id[dl] for dl in y["derslik_ids"]])
+        for y in o.program
+    ]
+
+
+def _oturma_senaryosu(atama_yap) -> Senaryo:
+    def _calistir(o: Ortam, olc) -> Dict[str, Any]:
+        girdiler = _oturma_girdileri(o)
+        sonuclar = olc(lambda: [atama_yap(ogr, odalar) for ogr, odalar in girdiler])
+        return {
+            "sinav": len(girdiler),
+            "ogrenci_sinav": sum(len(ogr) for ogr, _ in girdiler),
+            "atanan": sum(len(atamalar) for atamalar, _ in sonuclar),
+        }
+    return _calistir
+
+
+senaryo("oturma_atayici.atama_yap")(_oturma_senaryosu(oturma_atayici.atama_yap))
+senaryo("koltuk_atama.atama_yap")(_oturma_senaryosu(koltuk_atama.atama_yap))
+
+
+@senaryo("export_sinav_programi_to_excel")
+def _program_excel(o: Ortam, olc) -> None:
+    olc(lambda: veri_deposu.export_sinav_programi_to_excel(1, "vize", str(o.dizin / "program.xlsx")))
+
+
+@senaryo("export_cakisma_raporu_to_excel")
+def _cakisma_excel(o: Ortam, olc) -> None:
+    olc(lambda: veri_deposu.export_cakisma_raporu_to_excel(1, "vize", str(o.dizin / "cakisma.xlsx")))
+
+
+@senaryo("oturma_plani_pdf_yaz")
+def _oturma_pdf(o: Ortam, olc) -> Dict[str, Any]:
+    ogr, odalar = max(_oturma_girdileri(o), key=lambda g: len(g[0]), default=([], []))
+    atamalar, _ = oturma_atayici.atama_yap(ogr, odalar)
+    ogr_by_id = {og["id"]: og for og in ogr}
+    kod = {dl["id"]: dl["derslik_kodu"] for dl in odalar}
+    satirlar = [{"ogrenci_id": oid, "adsoyad": ogr_by_id[oid]["adsoyad"], "ogr_no": ogr_by_id[oid]["ogr_no"],
+                 "derslik_id": dl, "derslik_kodu": kod[dl], "sira_no": s, "sutun_no": c}
+                for oid, dl, s, c in atamalar]
+    olc(lambda: oturma_plani_pdf_yaz(str(o.dizin / "oturma.pdf"), "Benchmark", "", odalar, satirlar))
+    return {"ogrenci": len(satirlar), "derslik": len(odalar)}
+
+
+# ---------------- çalıştırıcı ----------------
+def _kisit(gun_sayisi: int) -> PlanKisit:
+    gun, kalan = TARIH_BAS, gun_sayisi
+    while True:
+        if gun.weekday() < 5:
+            kalan -= 1
+            if not kalan:
+                break
+        gun += timedelta(days=1)
+    return PlanKisit(tarih_bas=TARIH_BAS, tarih_bit=gun, gun_disi={5, 6}, slot_saatleri=SLOTLAR,
+                     varsayilan_sure_dk=90, bekleme_dk=BEKLEME_DK, sinav_turu="vize")
+
+
+def _olcucu(tekrar: int, kayit: Dict[str, Any]) -> Callable[[Callable[[], Any]], Any]:
+    def olc(fn: Callable[[], Any]) -> Any:
+        sureler = []
+        sonuc = None
+        for _ in range(max(1, tekrar)):
+            t0 = time.perf_counter()
+            sonuc = fn()
+            sureler.append(time.perf_counter() - t0)
+        tracemalloc.start()
+        try:
+            fn()
+            _, tepe = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        kayit.update(min_sn=round(min(sureler), 6), medyan_sn=round(statistics.median(sureler), 6),
+                     tekrar=len(sureler), tepe_bellek_mb=round(tepe / 2 ** 20, 3))
+        return sonuc
+    return olc
+
+
+def calistir(boyutlar: List[str], senaryolar: Optional[List[str]] = None,
+             tekrar: int = 3, tohum: int = 42) -> Dict[str, Any]:
+    adlar = senaryolar or list(SENARYOLAR)
+    bilinmeyen = [a for a in adlar if a not in SENARYOLAR]
+    if bilinmeyen:
+        raise ValueError(f"Bilinmeyen senaryo: {', '.join(bilinmeyen)} (geçerli: {', '.join(SENARYOLAR)})")
+    rapor: Dict[str, Any] = {
+        "surum": JSON_SURUMU,
+        "tarih": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "islemci": os.cpu_count(),
+        "tohum": tohum,
+        "sonuclar": [],
+    }
+    eski_yol = veritabani.VERITABANI_YOLU
+    try:
+        for boyut in boyutlar:
+            uni = universite_uret(boyut, tohum)
+            with tempfile.TemporaryDirectory() as td:
+                veritabani.VERITABANI_YOLU = Path(td) / "benchmark.db"
+                veritabani.veritabani_baslat()
+                veritabanina_yaz(uni)
+                dersler, derslikler = planlayici_girdisi(uni)
+                k = _kisit(uni.gun_sayisi)
+                program, _, _ = planla(k, dersler, derslikler)
+                veri_deposu.fakulte_programini_kaydet(YONETICI, "vize", program, BEKLEME_DK)
+                ortam = Ortam(uni, Path(td), dersler, derslikler, k, program)
+                veri = {"bolum": len(uni.bolumler), "ogrenci": len(uni.ogrenciler), "ders": len(uni.dersler),
+                        "derslik": len(uni.derslikler), "kayit": uni.kayit_sayisi,
+                        "slot": len(_kisitlari_coz(k)["slot_saatleri"]) * uni.gun_sayisi}
+                for ad in adlar:
+                    kayit: Dict[str, Any] = {"boyut": boyut, "senaryo": ad}
+                    kalite = SENARYOLAR[ad](ortam, _olcucu(tekrar, kayit))
+                    if kalite:
+                        kayit["kalite"] = kalite
+                    kayit["veri"] = veri
+                    rapor["sonuclar"].append(kayit)
+                    _yazdir(kayit)
+                veritabani.baglantilari_kapat()
+    finally:
+        veritabani.baglantilari_kapat()
+        veritabani.VERITABANI_YOLU = eski_yol
+    return rapor
+
+
+def _yazdir(kayit: Dict[str, Any], onceki: Optional[Dict[str, Any]] = None) -> None:
+    satir = (f"{kayit['boyut']:>2} {kayit['senaryo']:<32} {kayit['medyan_sn'] * 1000:10.1f} ms"
+             f" {kayit['tepe_bellek_mb']:8.1f} MB")
+    if onceki:
+        satir += (f" | önceki {onceki['medyan_sn'] * 1000:10.1f} ms ×{kayit['medyan_sn'] / max(onceki['medyan_sn'], 1e-9):5.2f}"
+                  f" {onceki['tepe_bellek_mb']:8.1f} MB")
+        farklar = {a: (onceki.get("kalite", {}).get(a), v) for a, v in (kayit.get("kalite") or {}).items()
+                   if onceki.get("kalite", {}).get(a) != v}
+        if farklar:
+            satir += " | kalite " + ", ".join(f"{a}: {e} → {y}" for a, (e, y) in farklar.items())
+    elif kayit.get("kalite"):
+        satir += " | " + ", ".join(f"{a}={v}" for a, v in kayit["kalite"].items())
+    print(satir)
+
+
+def karsilastir(yeni: Dict[str, Any], eski: Dict[str, Any]) -> None:
+    """İki JSON raporunu (boyut, senaryo) eşleyerek süre/bellek oranlarını ve kalite farklarını yazdırır."""
+    onceki = {(r["boyut"], r["senaryo"]): r for r in eski.get("sonuclar", [])}
+    print(f"\nKarşılaştırma: {eski.get('tarih', '?')} → {yeni.get('tarih', '?')}")
+    for r in yeni["sonuclar"]:
+        _yazdir(r, onceki.get((r["boyut"], r["senaryo"])))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Planlayıcı benchmark takımı")
+    ap.add_argument("--boyut", nargs="+", default=["S", "M"], choices=list(BOYUTLAR))
+    ap.add_argument("--senaryo", nargs="+", default=None, help=f"varsayılan: hepsi ({', '.join(SENARYOLAR)})")
+    ap.add_argument("--tekrar", type=int, default=3)
+    ap.add_argument("--tohum", type=int, default=42)
+    ap.add_argument("--json", help="sonuçların yazılacağı JSON dosyası")
+    ap.add_argument("--karsilastir", help="karşılaştırılacak önceki JSON dosyası")
+    args = ap.parse_args()
+    sonuc = calistir(args.boyut, args.senaryo, args.tekrar, args.tohum)
+    if args.json:
+        Path(args.json).write_text(json.dumps(sonuc, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.karsilastir:
+        karsilastir(sonuc, json.loads(Path(args.karsilastir).read_text(encoding="utf-8")))
@@ -0,0 +1,117 @@
+# benchmark/plan_kaynagi.py
+# -*- coding: utf-8 -*-
+"""
+plan_kaynagini_hazirla ölçümü: ders başına sorgu atan eski yöntem ile sabit
+sayıda sorgulu yeni yöntemi geçici bir veritabanında 1k / 10k / 100k kayıtla
+karşılaştırır.
+
+Çalıştırma (proje kökünden):
+    python -m benchmark.plan_kaynagi
+    python -m benchmark.plan_kaynagi --kayit 1000 10000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import veritabani
+import veri_deposu
+
+
+def _veri_uret(kayit_sayisi: int, tohum: int = 42) -> None:
+    """Tek bölümlük sentetik veri: öğrenci başına ~6 ders, ders başına ~60 öğrenci."""
+    r = random.Random(tohum)
+    ders_sayisi = max(10, kayit_sayisi // 60)
+    ogrenci_sayisi = max(10, kayit_sayisi // 6)
+    with veritabani.baglanti() as vt:
+        vt.execute("INSERT OR IGNORE INTO bolumler(id, ad) VALUES(1, 'Benchmark')")
+        vt.executemany(
+            "INSERT INTO dersler(bolum_id, kod, ad, hoca, sinif) VALUES(1, ?, ?, NULL, ?)",
+            [(f"BM{i:04d}", f"Ders {i}", None if i % 2 else 1 + i % 4) for i in range(ders_sayisi)],
+        )
+        vt.executemany(
+            "INSERT INTO ogrenciler(bolum_id, ogr_no, adsoyad, sinif) VALUES(1, ?, ?, ?)",
+            [(f"{i:09d}", f"Öğrenci {i}", r.randint(1, 4)) for i in range(ogrenci_sayisi)],
+        )
+        ders_ids = [row["id"] for row in vt.execute("SELECT id FROM dersler WHERE bolum_id=1")]
+        ogr_ids = [row["id"] for row in vt.execute("SELECT id FROM ogrenciler WHERE bolum_id=1")]
+        ciftler = set()
+        while len(ciftler) < kayit_sayisi:
+            ciftler.add((r.choice(ogr_ids), r.choice(ders_ids)))
+        vt.executemany("INSERT INTO ogrenci_ders(ogrenci_id, ders_id) VALUES(?,?)", sorted(ciftler))
+
+
+def _eski_plan_kaynagi(bolum_id: int) -> List[dict]:
+    """Karşılaştırma için eski yöntem: ders başına 1 (+ sınıfı yoksa 1) sorgu."""
+    with veritabani.baglanti() as vt:
+        dersler = vt.execute(
+            "SELECT d.id, d.kod, d.ad, d.hoca, d.sinif FROM dersler d WHERE d.bolum_id=? ORDER BY d.kod",
+            (bolum_id,),
+        ).fetchall()
+        out = []
+        for d in dersler:
+            ogr_ids = {r["ogrenci_id"] for r in vt.execute(
+                "SELECT ogrenci_id FROM ogrenci_ders WHERE ders_id=?", (d["id"],)
+            ).fetchall()}
+            ders_sinif = d["sinif"]
+            if ders_sinif is None and ogr_ids:
+                rows = vt.execute(
+                    f"SELECT sinif FROM ogrenciler WHERE id IN ({','.join(['?'] * len(ogr_ids))})",
+                    tuple(ogr_ids),
+                ).fetchall()
+                frek: Dict[int, int] = {}
+                for r in rows:
+                    if r["sinif"] is not None:
+                        frek[int(r["sinif"])] = frek.get(int(r["sinif"]), 0) + 1
+                if frek:
+                    ders_sinif = sorted(frek.items(), key=lambda x: (-x[1], x[0]))[0][0]
+            out.append({"id": d["id"], "kod": d["kod"], "ad": d["ad"], "hoca": d["hoca"],
+                        "sinif": ders_sinif, "ogr_say": len(ogr_ids), "ogr_ids": ogr_ids})
+        return out
+
+
+def _olc(fn, tekrar: int) -> float:
+    en_iyi = float("inf")
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        fn()
+        en_iyi = min(en_iyi, time.perf_counter() - t0)
+    return en_iyi
+
+
+def calistir(kayit_sayilari: List[int], tekrar: int = 3) -> List[Tuple[int, float, float]]:
+    sonuc = []
+    eski_yol = veritabani.VERITABANI_YOLU
+    try:
+        for n in kayit_sayilari:
+            with tempfile.TemporaryDirectory() as td:
+                veritabani.VERITABANI_YOLU = Path(td) / "benchmark.db"
+                veritabani.veritabani_baslat()
+                _veri_uret(n)
+
+                yeni = veri_deposu.plan_kaynagini_hazirla(1)[0]
+                if yeni != _eski_plan_kaynagi(1):
+                    raise AssertionError(f"{n} kayıt: eski ve yeni yöntem farklı sonuç verdi")
+
+                t_eski = _olc(lambda: _eski_plan_kaynagi(1), tekrar)
+                t_yeni = _olc(lambda: veri_deposu.plan_kaynagini_hazirla(1), tekrar)
+                veritabani.baglantilari_kapat()
+                sonuc.append((n, t_eski, t_yeni))
+                print(f"{n:>8} kayıt | eski: {t_eski * 1000:9.1f} ms | yeni: {t_yeni * 1000:9.1f} ms"
+                      f" | hızlanma: {t_eski / max(t_yeni, 1e-9):5.1f}x")
+    finally:
+        veritabani.baglantilari_kapat()
+        veritabani.VERITABANI_YOLU = eski_yol
+    return sonuc
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="plan_kaynagini_hazirla benchmark")
+    ap.add_argument("--kayit", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    ap.add_argument("--tekrar", type=int, default=3)
+    args = ap.parse_args()
+    calistir(args.kayit, args.tekrar)
@@ -0,0 +1,156 @@
+# benchmark/sentetik.py
+# -*- coding: utf-8 -*-
+"""
+Tohumlu sentetik üniversite üreticisi (benchmark.olcum için).
+
+Gerçek içe aktarımın ürettiği yapıyı taklit eder:
+  - bölümler; her bölümde 1-4. sınıf dersleri ve sınıfı belirsiz seçmeliler
+  - ders popülerliği log-normal: birkaç kalabalık ortak ders, çok sayıda küçük ders
+  - her öğrenci 5-8 ders alır: çoğu kendi bölümünün kendi sınıfından, bir kısmı
+    başka sınıftan (alttan/seçmeli), az bir kısmı başka bölümün servis dersi
+  - derslikler enine × boyuna koltuk, 2'li ya da 3'lü sıra yapısı; kapasite = enine × boyuna
+
+Aynı boyut ve tohum her zaman aynı veriyi üretir. Üretim bellekte yapılır;
+veritabanina_yaz aynı veriyi mevcut veritabanına (veritabani.VERITABANI_YOLU)
+içe aktarma akışındaki gibi yazar: başka bölümün dersini alan öğrenci o
+bölümde de aynı ogr_no ile ayrı bir satırdır.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Set, Tuple
+
+import veritabani
+
+# boyut -> (bölüm, öğrenci, ders, derslik, planlama günü)
+BOYUTLAR: Dict[str, Tuple[int, int, int, int, int]] = {
+    "S": (1, 400, 40, 10, 5),
+    "M": (3, 2_400, 150, 30, 10),
+    "L": (6, 8_000, 480, 72, 10),
+    "XL": (10, 24_000, 1_000, 150, 15),
+}
+
+KENDI_SINIFI = 0.75   # dersin öğrencinin kendi sınıfından seçilme olasılığı
+SERVIS_DERSI = 0.08   # başka bölümün (1. sınıf) dersinden seçilme olasılığı
+
+
+@dataclass
+class SentetikUniversite:
+    boyut: str
+    tohum: int
+    gun_sayisi: int
+    bolumler: List[Tuple[int, str]] = field(default_factory=list)
+    derslikler: List[Dict[str, Any]] = field(default_factory=list)
+    dersler: List[Dict[str, Any]] = field(default_factory=list)
+    ogrenciler: List[Dict[str, Any]] = field(default_factory=list)
+    kayitlar: List[Tuple[int, int]] = field(default_factory=list)  # (ogrenci_id, ders_id)
+
+    @property
+    def kayit_sayisi(self) -> int:
+        return len(self.kayitlar)
+
+
+def universite_uret(boyut: str = "S", tohum: int = 42) -> SentetikUniversite:
+    try:
+        n_bolum, n_ogr, n_ders, n_derslik, gun_sayisi = BOYUTLAR[boyut]
+    except KeyError:
+        raise ValueError(f"Bilinmeyen boyut: {boyut!r} (geçerli: {', '.join(BOYUTLAR)})")
+    r = random.Random(tohum)
+    uni = SentetikUniversite(boyut, tohum, gun_sayisi)
+
+    # bölüm → sınıf → [(ders_id, ağırlık)]
+    havuz: Dict[int, Dict[Any, List[Tuple[int, float]]]] = {}
+    ders_id = derslik_id = 0
+    for b in range(1, n_bolum + 1):
+        uni.bolumler.append((b, f"Bölüm {b}"))
+        for _ in range(n_derslik // n_bolum):
+            derslik_id += 1
+            enine, boyuna = r.choice((4, 6, 6, 8, 9, 12)), r.randint(6, 14)
+            uni.derslikler.append({
+                "id": derslik_id, "bolum_id": b, "derslik_kodu": f"B{b}-{100 + derslik_id}",
+                "derslik_adi": f"Derslik {derslik_id}", "kapasite": enine * boyuna,
+                "enine": enine, "boyuna": boyuna, "sira_yapisi": 3 if enine % 3 == 0 else 2,
+            })
+        havuz[b] = {}
+        for i in range(n_ders // n_bolum):
+            ders_id += 1
+            sinif = 1 + i % 5 if i % 5 < 4 else None  # her 5 dersten biri sınıfsız seçmeli
+            uni.dersler.append({
+                "id": ders_id, "bolum_id": b, "kod": f"B{b}D{i + 100}", "ad": f"Ders {ders_id}",
+                "hoca": f"Dr. Hoca {r.randint(1, max(2, n_ders // 3))}", "sinif": sinif,
+            })
+            havuz[b].setdefault(sinif, []).append((ders_id, r.lognormvariate(0.0, 0.8)))
+
+    def _sec(liste: List[Tuple[int, float]]) -> int:
+        return r.choices([d for d, _ in liste], weights=[w for _, w in liste])[0]
+
+    bolum_ids = [b for b, _ in uni.bolumler]
+    for o in range(1, n_ogr + 1):
+        b = bolum_ids[(o - 1) % n_bolum]
+        sinif = r.randint(1, 4)
+        uni.ogrenciler.append({"id": o, "bolum_id": b, "ogr_no": f"{20_000_000 + o}",
+                               "adsoyad": f"Öğrenci {o}", "sinif": sinif})
+        kendi = havuz[b].get(sinif) or [x for l in havuz[b].values() for x in l]
+        diger = [x for s, l in havuz[b].items() if s != sinif for x in l] or kendi
+        servis = [x for b2 in bolum_ids if b2 != b for x in havuz[b2].get(1, [])]
+        hedef = min(r.randint(5, 8), sum(len(l) for l in havuz[b].values()))
+        secilen: Set[int] = set()
+        deneme = 0
+        while len(secilen) < hedef and deneme < 50:
+            deneme += 1
+            x = r.random()
+            if servis and x < SERVIS_DERSI:
+                secilen.add(_sec(servis))
+            elif x < SERVIS_DERSI + KENDI_SINIFI:
+                secilen.add(_sec(kendi))
+            else:
+                secilen.add(_sec(diger))
+        uni.kayitlar.extend((o, d) for d in sorted(secilen))
+    return uni
+
+
+def planlayici_girdisi(uni: SentetikUniversite) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """fakulte_plan_kaynagini_hazirla biçiminde (dersler, derslikler); veritabanı kullanmaz."""
+    ogr_ids: Dict[int, Set[int]] = {d["id"]: set() for d in uni.dersler}
+    for o, d in uni.kayitlar:
+        ogr_ids[d].add(o)
+    dersler = [{**d, "ogr_say": len(ogr_ids[d["id"]]), "ogr_ids": ogr_ids[d["id"]]} for d in uni.dersler]
+    derslikler = sorted(uni.derslikler, key=lambda dl: (-dl["kapasite"], dl["id"]))
+    return dersler, derslikler
+
+
+def veritabanina_yaz(uni: SentetikUniversite) -> None:
+    """Veriyi mevcut (boş) veritabanına yazar; id'ler uni'dekilerle aynıdır."""
+    ders_bolum = {d["id"]: d["bolum_id"] for d in uni.dersler}
+    ogr_by_id = {o["id"]: o for o in uni.ogrenciler}
+    with veritabani.baglanti() as vt:
+        vt.executemany("INSERT INTO bolumler(id, ad) VALUES(?, ?)", uni.bolumler)
+        vt.executemany("""
+            INSERT INTO derslikler(id, bolum_id, derslik_kodu, derslik_adi, kapasite, enine, boyuna, sira_yapisi)
+            VALUES(:id, :bolum_id, :derslik_kodu, :derslik_adi, :kapasite, :enine, :boyuna, :sira_yapisi)
+        """, uni.derslikler)
+        vt.executemany("""
+            INSERT INTO dersler(id, bolum_id, kod, ad, hoca, sinif)
+            VALUES(:id, :bolum_id, :kod, :ad, :hoca, :sinif)
+        """, uni.dersler)
+        vt.executemany("""
+            INSERT INTO ogrenciler(id, bolum_id, ogr_no, adsoyad, sinif)
+            VALUES(:id, :bolum_id, :ogr_no, :adsoyad, :sinif)
+        """, uni.ogrenciler)
+
+        # başka bölümün dersi: öğrenci o bölüme de (aynı ogr_no ile) ayrı satır olarak girer
+        satir: Dict[Tuple[int, int], int] = {(o["bolum_id"], o["id"]): o["id"] for o in uni.ogrenciler}
+        sonraki = len(uni.ogrenciler)
+        kayitlar = []
+        for o, d in uni.kayitlar:
+            b = ders_bolum[d]
+            oid = satir.get((b, o))
+            if oid is None:
+                sonraki += 1
+                og = ogr_by_id[o]
+                vt.execute("INSERT INTO ogrenciler(id, bolum_id, ogr_no, adsoyad, sinif) VALUES(?,?,?,?,?)",
+                           (sonraki, b, og["ogr_no"], og["adsoyad"], og["sinif"]))
+                oid = satir[(b, o)] = sonraki
+            kayitlar.append((oid, d))
+        vt.executemany("INSERT INTO ogrenci_ders(ogrenci_id, ders_id) VALUES(?, ?)", kayitlar)
@@ -1,10 +1,26 @@
 # excel_parser.py
 from __future__ import annotations
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from itertools import chain, islice, repeat
+from typing import Any, Callable, List, Dict, Tuple, Optional, Iterator
+import openpyxl
 import pandas as pd
 
+from utils.ayristirma_onbellegi import AyristirmaOnbellegi, dosya_ozeti, sayfa_ozetleri
+
+# Ayrıştırma kuralları sonucu değiştirecek biçimde değişirse artırılır;
+# eski önbellek kayıtları böylece kendiliğinden geçersiz olur.
+AYRISTIRICI_SURUMU = 1
+ONBELLEK = AyristirmaOnbellegi()
+# Sayfaları paralel ayrıştıran süreç sayısı (None: işlemci sayısı, 1: sıralı)
+ISCI_SAYISI: Optional[int] = None
+# Bundan küçük dosyalarda süreç başlatma maliyeti kazançtan büyük; sıralı işlenir
+PARALEL_ESIK_BAYT = 256 * 1024
+
 
 # ---------------- yardımcılar ----------------
 def _norm(s: str) -> str:
@@ -101,261 +117,580 @@ def _infer_sinif_from_kod(kod: Optional[str]) -> Optional[int]:
 
 
 # skorlayıcılar
+# Skorlar sütunun ilk SKOR_ORNEK satırı üzerinde, eleman eleman Python çağrısı
+# yerine pandas str / to_numeric işlemleriyle hesaplanır; tespit maliyeti
+# satır sayısından bağımsızdır.
+SKOR_ORNEK = 2000
+_TR_KUCUK = str.maketrans("ışğöüç", "isgouc")
+
+
+def _ornek(series: pd.Series) -> pd.Series:
+    return series.iloc[:SKOR_ORNEK]
+
+
+def _metinler(series: pd.Series) -> pd.Series:
+    """Örneklemdeki boş olmayan değerler, str'ye çevrilip kırpılmış."""
+    return _ornek(series).dropna().astype(str).str.strip()
+
+
+def _dolu_sayisi(series: pd.Series) -> int:
+    """_safe_str'e göre dolu hücre sayısı (örneklem üzerinde)."""
+    s = _ornek(series)
+    return int((s.notna() & (s.astype(str).str.strip() != "")).sum())
+
+
+def _clean_headingish_seri(vals: pd.Series) -> pd.Series:
+    """_clean_headingish'in vektörel karşılığı."""
+    return (vals.str.replace(r"[.:;,\-_/]+", " ", regex=True)
+            .str.strip().str.lower().str.translate(_TR_KUCUK).str.strip())
+
+
 def _score_code_col(series: pd.Series) -> float:
-    vals = series.dropna().astype(str).map(str.strip)
+    vals = _metinler(series)
     n = len(vals)
     if not n: return 0.0
-    return vals.map(lambda x: bool(RE_KOD.match(x))).sum() / n
+    return vals.str.match(RE_KOD).sum() / n
 
 
 def _score_name_col(series: pd.Series) -> float:
-    vals = series.dropna().astype(str).map(str.strip)
+    vals = _metinler(series)
     if not len(vals): return 0.0
 
-    def sc(s: str) -> float:
-        if _clean_headingish(s) in HEADING_LIKE:
-            return 0.0
-        letters = 1.0 if RE_TEXTY.search(s) else 0.0
-        spaces = min(s.count(" "), 3) * 0.6
-        length = 1.0 if len(s) >= 4 else 0.0
-        return letters * 1.5 + spaces + length
-
-    return vals.map(sc).mean()
+    letters = vals.str.contains(RE_TEXTY).astype(float)
+    spaces = vals.str.count(" ").clip(upper=3) * 0.6
+    length = (vals.str.len() >= 4).astype(float)
+    sc = letters * 1.5 + spaces + length
+    sc[_clean_headingish_seri(vals).isin(HEADING_LIKE)] = 0.0
+    return sc.mean()
 
 
 def _score_ogrno_col(series: pd.Series) -> float:
-    vals = series.dropna().astype(str).map(str.strip)
-    return (vals.map(lambda x: bool(RE_OGRNO.match(x))).sum() / len(vals)) if len(vals) else 0.0
+    vals = _metinler(series)
+    return (vals.str.match(RE_OGRNO).sum() / len(vals)) if len(vals) else 0.0
 
 
 def _score_grade_col(series: pd.Series) -> float:
-    vals = series.dropna()
+    vals = _ornek(series).dropna()
     if not len(vals): return 0.0
 
-    def _ok(v) -> bool:
-        iv = _as_int_or_none(v)
-        return iv is not None and 0 <= iv <= 8
+    # _as_int_or_none(v) in 0..8  <=>  -1 < float(v) < 9  (int() sıfıra doğru keser)
+    x = pd.to_numeric(vals.astype(str).str.strip(), errors="coerce")
+    return ((x > -1) & (x < 9)).sum() / len(vals)
+
+
+# ---------------- önbellek ----------------
+def _dosya_anahtari(tur: str, yol: str) -> Optional[str]:
+    try:
+        return f"{tur}-{AYRISTIRICI_SURUMU}-{dosya_ozeti(yol)}"
+    except OSError:
+        return None
+
 
-    return vals.map(_ok).sum() / len(vals)
+def _sayfa_isci(yol: str, sheet: str, sayfa_fn: Callable[[pd.DataFrame, str], Any]
+                ) -> Tuple[Any, Optional[str]]:
+    """Tek sayfayı okuyup ayrıştırır → (sonuc, None) ya da (None, hata). Süreç havuzunda da çalışır."""
+    try:
+        df = pd.read_excel(Path(yol), sheet_name=sheet, dtype=object)
+    except Exception as e:
+        return None, f"Sayfa '{sheet}' okunamadı: {e}"
+    return sayfa_fn(df, sheet), None
+
+
+def _sayfalari_paralel_isle(yol: str, sayfalar: List[str], sayfa_fn: Callable[[pd.DataFrame, str], Any],
+                            isci_sayisi: int) -> Optional[List[Tuple[Any, Optional[str]]]]:
+    """Sayfaları süreç havuzunda ayrıştırır; sonuçlar `sayfalar` sırasıyla. Havuz kurulamazsa None."""
+    try:
+        with ProcessPoolExecutor(max_workers=min(isci_sayisi, len(sayfalar))) as havuz:
+            return list(havuz.map(_sayfa_isci, repeat(yol), sayfalar, repeat(sayfa_fn)))
+    except (OSError, NotImplementedError, BrokenProcessPool):
+        return None
+
+
+def _sayfa_sonuclari(tur: str, yol: str, sayfa_fn: Callable[[pd.DataFrame, str], Any],
+                     onbellek: bool, isci_sayisi: Optional[int] = None
+                     ) -> List[Tuple[str, Any, Optional[str]]]:
+    """
+    Her sayfa için, çalışma kitabındaki sırayla (sayfa, sonuc, hata). İçeriği
+    değişmemiş sayfaların sonucu önbellekten gelir ve sayfa hiç okunmaz;
+    okunamayan sayfada sonuc None, hata mesajdır. Dosya açılamazsa istisna
+    yükselir.
+
+    Ayrıştırılacak birden çok sayfa varsa ve dosya PARALEL_ESIK_BAYT'tan
+    büyükse sayfalar en fazla `isci_sayisi` (varsayılan ISCI_SAYISI, o da None
+    ise işlemci sayısı) süreçte paralel işlenir; isci_sayisi=1 ya da havuz
+    kurulamazsa sırayla işlenir. Birleştirme her durumda sayfa sırasıyla
+    yapıldığından sonuç aynıdır.
+    """
+    xls = pd.ExcelFile(Path(yol))
+    ozetler = (sayfa_ozetleri(yol) or {}) if onbellek else {}
+    anahtarlar = {sheet: f"{tur}-sayfa-{AYRISTIRICI_SURUMU}-{ozetler[sheet]}"
+                  for sheet in xls.sheet_names if sheet in ozetler}
+
+    sonuclar: Dict[str, Tuple[Any, Optional[str]]] = {}
+    for sheet, anahtar in anahtarlar.items():
+        sonuc = ONBELLEK.getir(anahtar)
+        if sonuc is not None:
+            sonuclar[sheet] = (sonuc, None)
+    eksik = [sheet for sheet in xls.sheet_names if sheet not in sonuclar]
+
+    isci_sayisi = isci_sayisi or ISCI_SAYISI or os.cpu_count() or 1
+    paralel = None
+    if isci_sayisi > 1 and len(eksik) > 1 and os.path.getsize(yol) >= PARALEL_ESIK_BAYT:
+        paralel = _sayfalari_paralel_isle(yol, eksik, sayfa_fn, isci_sayisi)
+    if paralel is None:
+        paralel = []
+        for sheet in eksik:
+            try:
+                df = xls.parse(sheet, dtype=object)
+            except Exception as e:
+                paralel.append((None, f"Sayfa '{sheet}' okunamadı: {e}"))
+                continue
+            paralel.append((sayfa_fn(df, sheet), None))
+
+    for sheet, (sonuc, hata) in zip(eksik, paralel):
+        sonuclar[sheet] = (sonuc, hata)
+        if sonuc is not None and sheet in anahtarlar:
+            ONBELLEK.koy(anahtarlar[sheet], sonuc)
+    return [(sheet, *sonuclar[sheet]) for sheet in xls.sheet_names]
 
 
 # ---------------- DERSLER ----------------
-def ders_excel_parse(yol: str) -> Tuple[List[Dict], List[str]]:
+KOD_KEYS = {"ders kodu", "kod", "kodu", "course code", "code", "ders"}
+AD_KEYS = {"dersin adi", "ders adi", "ders ismi", "ad", "adi", "course", "name"}
+HOCA_KEYS = {"hoca", "ogretim uyesi", "instructor", "ogretim gorevlisi", "ogretim elemani"}
+DERS_SINIF_KEYS = {"sinif", "grade", "year", "sinifi"}
+TUR_KEYS = {"tur", "type", "zorunlu", "zorunlu/secmeli", "z/s"}
+
+
+def _ders_sayfasi(df: pd.DataFrame, sheet: str) -> Dict[str, Dict]:
+    """Tek sayfanın dersleri: {kod: ders}; aynı kod tekrar ederse son satır geçerli."""
+    dersler_map: Dict[str, Dict] = {}
+    if df.empty:
+        return dersler_map
+
+    start = _first_nonempty_row_idx(df)
+    if start > 0:
+        df = df.iloc[start:].reset_index(drop=True)
+
+    # -------- 1) Başlık satırı arama --------
+    header_found = False
+    for hi in range(min(len(df), 25)):
+        vals = [_safe_str(v) or "" for v in df.iloc[hi].values]
+        norm = [_clean_headingish(v) for v in vals]
+        colmap: Dict[str, int] = {}
+
+        def _find(keys, name):
+            for j, v in enumerate(norm):
+                if v in keys and name not in colmap:
+                    colmap[name] = j
+                    break
+
+        _find(KOD_KEYS, "kod")
+        _find(AD_KEYS, "ad")
+        _find(HOCA_KEYS, "hoca")
+        _find(DERS_SINIF_KEYS, "sinif")
+        _find(TUR_KEYS, "tur")
+
+        if "kod" in colmap and "ad" in colmap:
+            header_found = True
+            for ridx in range(hi + 1, len(df)):
+                row = df.iloc[ridx]
+                kod = _safe_str(row.iloc[colmap["kod"]])
+                ad = _safe_str(row.iloc[colmap["ad"]])
+                hoca = _safe_str(row.iloc[colmap["hoca"]]) if "hoca" in colmap else None
+                sinif = _as_int_or_none(row.iloc[colmap["sinif"]]) if "sinif" in colmap else None
+                tur = _safe_str(row.iloc[colmap["tur"]]) if "tur" in colmap else None
+
+                if kod and _clean_headingish(kod) in HEADING_LIKE:   continue
+                if ad and _clean_headingish(ad) in HEADING_LIKE:   continue
+                if hoca and _clean_headingish(hoca) in HEADING_LIKE: continue
+                if not kod or not ad:                                 continue
+                if not RE_KOD.match(kod):                             continue
+
+                # güçlü swap
+                if _looks_like_person(ad) or (not _looks_like_course(ad) and _looks_like_course(hoca)):
+                    ad, hoca = (hoca, ad) if (hoca or ad) else (ad, hoca)
+
+                # ---- YENİ: sınıf boş ise koddan sez ----
+                if sinif is None:
+                    sinif = _infer_sinif_from_kod(kod)
+
+                dersler_map[kod] = {"kod": kod, "ad": ad, "hoca": hoca, "sinif": sinif, "tur": tur}
+            break
+
+    if header_found:
+        return dersler_map
+
+    # -------- 2) Otomatik kolon bulma --------
+    usable = []
+    for c in df.columns:
+        nonempty = _dolu_sayisi(df[c])
+        if nonempty >= max(3, int(min(len(df), SKOR_ORNEK) * 0.1)):
+            usable.append(c)
+    if len(usable) < 2:
+        usable = list(df.columns)[:2]
+
+    scores = [(c, _score_code_col(df[c].astype(object)), _score_name_col(df[c].astype(object)),
+               _score_grade_col(df[c].astype(object))) for c in usable]
+    if not scores:
+        return dersler_map
+
+    candidates = [s for s in scores if s[1] >= 0.60]
+    if not candidates:
+        return dersler_map
+    kod_col = max(candidates, key=lambda x: x[1])[0]
+    ad_col = max([s for s in scores if s[0] != kod_col], key=lambda x: x[2], default=scores[0])[0]
+
+    hoca_col = None; sinif_col = None; tur_col = None
+    for c, sc_code, sc_name, sc_grade in scores:
+        if c not in (kod_col, ad_col) and sc_name >= 1.2 and sc_code < 0.2:
+            hoca_col = c; break
+    for c, sc_code, sc_name, sc_grade in scores:
+        if c not in (kod_col, ad_col) and sc_grade >= 0.5:
+            sinif_col = c; break
+    for c, sc_code, sc_name, sc_grade in scores:
+        if c not in (kod_col, ad_col, hoca_col, sinif_col):
+            vals = _metinler(df[c])
+            if len(vals) and (vals.str.len().mean() <= 12):
+                tur_col = c; break
+
+    for ridx, row in df.iterrows():
+        kod = _safe_str(row.get(kod_col))
+        ad = _safe_str(row.get(ad_col))
+        if kod and _clean_headingish(kod) in HEADING_LIKE:   continue
+        if ad and _clean_headingish(ad) in HEADING_LIKE:   continue
+        if not kod or not ad:                                  continue
+        if not RE_KOD.match(kod):                              continue
+
+        hoca = _safe_str(row.get(hoca_col)) if hoca_col else None
+        if hoca and _clean_headingish(hoca) in HEADING_LIKE:
+            hoca = None
+        sinif = _as_int_or_none(row.get(sinif_col)) if sinif_col else None
+        tur = _safe_str(row.get(tur_col)) if tur_col else None
+
+        # güçlü swap
+        if _looks_like_person(ad) or (not _looks_like_course(ad) and _looks_like_course(hoca)):
+            ad, hoca = (hoca, ad) if (hoca or ad) else (ad, hoca)
+
+        # ---- YENİ: sınıf boş ise koddan sez ----
+        if sinif is None:
+            sinif = _infer_sinif_from_kod(kod)
+
+        dersler_map[kod] = {"kod": kod, "ad": ad, "hoca": hoca, "sinif": sinif, "tur": tur}
+
+    return dersler_map
+
+
+def ders_excel_parse(yol: str, onbellek: bool = True,
+                     isci_sayisi: Optional[int] = None) -> Tuple[List[Dict], List[str]]:
+    anahtar = _dosya_anahtari("ders", yol) if onbellek else None
+    sonuc = ONBELLEK.getir(anahtar) if anahtar else None
+    if sonuc is not None:
+        return sonuc
+
     dersler_map: Dict[str, Dict] = {}
-    hatalar: List[str] = []
     try:
-        xls = pd.ExcelFile(Path(yol))
+        sayfalar = _sayfa_sonuclari("ders", yol, _ders_sayfasi, onbellek, isci_sayisi)
     except Exception as e:
         return [], [f"Excel açılamadı: {e}"]
+    for sheet, sayfa, hata in sayfalar:
+        if sayfa is not None:
+            dersler_map.update(sayfa)
 
-    KOD_KEYS = {"ders kodu", "kod", "kodu", "course code", "code", "ders"}
-    AD_KEYS = {"dersin adi", "ders adi", "ders ismi", "ad", "adi", "course", "name"}
-    HOCA_KEYS = {"hoca", "ogretim uyesi", "instructor", "ogretim gorevlisi", "ogretim elemani"}
-    SINIF_KEYS = {"sinif", "grade", "year", "sinifi"}
-    TUR_KEYS = {"tur", "type", "zorunlu", "zorunlu/secmeli", "z/s"}
-
-    for sheet in xls.sheet_names:
-        try:
-            df = xls.parse(sheet, dtype=object)
-        except Exception as e:
-            hatalar.append(f"Sayfa '{sheet}' okunamadı: {e}")
-            continue
-        if df.empty:
-            continue
+    sonuc = (list(dersler_map.values()), [])
+    if anahtar:
+        ONBELLEK.koy(anahtar, sonuc)
+    return sonuc
+
+
+# ---------------- ÖĞRENCİLER ----------------
+OGRNO_KEYS = {"ogr_no", "ogrenci no", "ogrenci_no", "ogrenci numarasi", "ogrencino", "numara", "student id",
+              "ogrenci id"}
+ADSOYAD_KEYS = {"adsoyad", "ad soyad", "adi soyadi", "isim", "name"}
+SINIF_KEYS = {"sinif", "grade", "year", "sinifi"}
 
-        start = _first_nonempty_row_idx(df)
-        if start > 0:
-            df = df.iloc[start:].reset_index(drop=True)
-
-        # -------- 1) Başlık satırı arama --------
-        header_found = False
-        for hi in range(min(len(df), 25)):
-            vals = [_safe_str(v) or "" for v in df.iloc[hi].values]
-            norm = [_clean_headingish(v) for v in vals]
-            colmap: Dict[str, int] = {}
-
-            def _find(keys, name):
-                for j, v in enumerate(norm):
-                    if v in keys and name not in colmap:
-                        colmap[name] = j
-                        break
-
-            _find(KOD_KEYS, "kod")
-            _find(AD_KEYS, "ad")
-            _find(HOCA_KEYS, "hoca")
-            _find(SINIF_KEYS, "sinif")
-            _find(TUR_KEYS, "tur")
-
-            if "kod" in colmap and "ad" in colmap:
-                header_found = True
-                for ridx in range(hi + 1, len(df)):
-                    row = df.iloc[ridx]
-                    kod = _safe_str(row.iloc[colmap["kod"]])
-                    ad = _safe_str(row.iloc[colmap["ad"]])
-                    hoca = _safe_str(row.iloc[colmap["hoca"]]) if "hoca" in colmap else None
-                    sinif = _as_int_or_none(row.iloc[colmap["sinif"]]) if "sinif" in colmap else None
-                    tur = _safe_str(row.iloc[colmap["tur"]]) if "tur" in colmap else None
-
-                    if kod and _clean_headingish(kod) in HEADING_LIKE:   continue
-                    if ad and _clean_headingish(ad) in HEADING_LIKE:   continue
-                    if hoca and _clean_headingish(hoca) in HEADING_LIKE: continue
-                    if not kod or not ad:                                 continue
-                    if not RE_KOD.match(kod):                             continue
-
-                    # güçlü swap
-                    if _looks_like_person(ad) or (not _looks_like_course(ad) and _looks_like_course(hoca)):
-                        ad, hoca = (hoca, ad) if (hoca or ad) else (ad, hoca)
-
-                    # ---- YENİ: sınıf boş ise koddan sez ----
-                    if sinif is None:
-                        sinif = _infer_sinif_from_kod(kod)
-
-                    dersler_map[kod] = {"kod": kod, "ad": ad, "hoca": hoca, "sinif": sinif, "tur": tur}
-                break
-
-        if header_found:
-            continue
 
-        # -------- 2) Otomatik kolon bulma --------
-        usable = []
+def _ogrenci_sutunlari(df: pd.DataFrame) -> Tuple[Optional[str], Optional[str], Optional[str], List[str]]:
+    """
+    Sütun adları normalize edilmiş sayfadan (col_ogrno, col_adsoyad, col_sinif, ders_cols) seçer:
+    önce başlık anahtarları, bulunamazsa içerik skorları.
+    """
+    col_ogrno = next((c for c in df.columns if c in OGRNO_KEYS), None)
+    col_adsoyad = next((c for c in df.columns if c in ADSOYAD_KEYS), None)
+    col_sinif = next((c for c in df.columns if c in SINIF_KEYS), None)
+
+    ders_cols = [c for c in df.columns if c.startswith("ders")]
+    ders_cols += [c for c in df.columns if c in {"ders_kodu", "ders kodu", "kod", "course code", "code", "course"}]
+    ders_cols = list(dict.fromkeys(ders_cols))
+
+    if col_ogrno is None:
+        sc = [(c, _score_ogrno_col(df[c].astype(object))) for c in df.columns]
+        sc.sort(key=lambda x: x[1], reverse=True)
+        if sc and sc[0][1] > 0: col_ogrno = sc[0][0]
+    if col_adsoyad is None:
+        sc = [(c, _score_name_col(df[c].astype(object))) for c in df.columns]
+        sc.sort(key=lambda x: x[1], reverse=True)
+        if sc: col_adsoyad = sc[0][0]
+    if col_sinif is None:
+        sc = [(c, _score_grade_col(df[c].astype(object))) for c in df.columns]
+        sc.sort(key=lambda x: x[1], reverse=True)
+        if sc and sc[0][1] > 0: col_sinif = sc[0][0]
+    if not ders_cols:
+        cand = []
         for c in df.columns:
-            nonempty = df[c].map(_safe_str).notna().sum()
-            if nonempty >= max(3, int(len(df) * 0.1)):
-                usable.append(c)
-        if len(usable) < 2:
-            usable = list(df.columns)[:2]
-
-        scores = [(c, _score_code_col(df[c].astype(object)), _score_name_col(df[c].astype(object)),
-                   _score_grade_col(df[c].astype(object))) for c in usable]
-        if not scores:
-            continue
+            sc = _score_code_col(df[c].astype(object))
+            if sc >= 0.2:
+                cand.append((c, sc))
+        cand.sort(key=lambda x: x[1], reverse=True)
+        ders_cols = [c for c, _ in cand[:6]]
+    return col_ogrno, col_adsoyad, col_sinif, ders_cols
+
 
-        candidates = [s for s in scores if s[1] >= 0.60]
-        if not candidates:
+def _ogrenci_sayfasi(df: pd.DataFrame, sheet: str) -> Tuple[Dict[str, Dict], set, List[str]]:
+    """Tek sayfa: ({ogr_no: ogrenci}, {(ogr_no, ders_kod)}, hatalar)."""
+    ogrenciler: Dict[str, Dict] = {}
+    kayit_set: set[Tuple[str, str]] = set()
+    hatalar: List[str] = []
+    if df.empty:
+        return ogrenciler, kayit_set, hatalar
+
+    start = _first_nonempty_row_idx(df)
+    if start > 0:
+        df = df.iloc[start:].reset_index(drop=True)
+
+    cols_norm = [_clean_headingish(c) for c in df.columns]
+    df.columns = cols_norm
+
+    col_ogrno, col_adsoyad, col_sinif, ders_cols = _ogrenci_sutunlari(df)
+
+    for ridx, row in df.iterrows():
+        ogr_no = _safe_str(row.get(col_ogrno)) if col_ogrno else None
+        adsoyad = _safe_str(row.get(col_adsoyad)) if col_adsoyad else None
+        sinif = _as_int_or_none(row.get(col_sinif)) if col_sinif else None
+
+        if not ogr_no:
+            hatalar.append(f"Sayfa '{sheet}', satır {ridx + 1}: 'ogr_no' boş veya bulunamadı.")
             continue
-        kod_col = max(candidates, key=lambda x: x[1])[0]
-        ad_col = max([s for s in scores if s[0] != kod_col], key=lambda x: x[2], default=scores[0])[0]
-
-        hoca_col = None; sinif_col = None; tur_col = None
-        for c, sc_code, sc_name, sc_grade in scores:
-            if c not in (kod_col, ad_col) and sc_name >= 1.2 and sc_code < 0.2:
-                hoca_col = c; break
-        for c, sc_code, sc_name, sc_grade in scores:
-            if c not in (kod_col, ad_col) and sc_grade >= 0.5:
-                sinif_col = c; break
-        for c, sc_code, sc_name, sc_grade in scores:
-            if c not in (kod_col, ad_col, hoca_col, sinif_col):
-                vals = df[c].dropna().astype(str).map(str.strip)
-                if len(vals) and (vals.map(len).mean() <= 12):
-                    tur_col = c; break
-
-        for ridx, row in df.iterrows():
-            kod = _safe_str(row.get(kod_col))
-            ad = _safe_str(row.get(ad_col))
-            if kod and _clean_headingish(kod) in HEADING_LIKE:   continue
-            if ad and _clean_headingish(ad) in HEADING_LIKE:   continue
-            if not kod or not ad:                                  continue
-            if not RE_KOD.match(kod):                              continue
-
-            hoca = _safe_str(row.get(hoca_col)) if hoca_col else None
-            if hoca and _clean_headingish(hoca) in HEADING_LIKE:
-                hoca = None
-            sinif = _as_int_or_none(row.get(sinif_col)) if sinif_col else None
-            tur = _safe_str(row.get(tur_col)) if tur_col else None
-
-            # güçlü swap
-            if _looks_like_person(ad) or (not _looks_like_course(ad) and _looks_like_course(hoca)):
-                ad, hoca = (hoca, ad) if (hoca or ad) else (ad, hoca)
-
-            # ---- YENİ: sınıf boş ise koddan sez ----
-            if sinif is None:
-                sinif = _infer_sinif_from_kod(kod)
-
-            dersler_map[kod] = {"kod": kod, "ad": ad, "hoca": hoca, "sinif": sinif, "tur": tur}
-
-    return list(dersler_map.values()), []
 
+        key = ogr_no
+        if key not in ogrenciler:
+            ogrenciler[key] = {"ogr_no": key, "adsoyad": adsoyad, "sinif": sinif}
+        else:
+            if adsoyad is not None: ogrenciler[key]["adsoyad"] = adsoyad
+            if sinif is not None: ogrenciler[key]["sinif"] = sinif
+
+        for c in ders_cols:
+            v = _safe_str(row.get(c))
+            if not v: continue
+            if RE_KOD.match(v):
+                kayit_set.add((key, v))
+
+    return ogrenciler, kayit_set, hatalar
+
+
+def ogrenci_excel_parse(yol: str, onbellek: bool = True,
+                        isci_sayisi: Optional[int] = None) -> Tuple[List[Dict], List[Tuple[str, str]], List[str]]:
+    anahtar = _dosya_anahtari("ogrenci", yol) if onbellek else None
+    sonuc = ONBELLEK.getir(anahtar) if anahtar else None
+    if sonuc is not None:
+        return sonuc
 
-# ---------------- ÖĞRENCİLER ----------------
-def ogrenci_excel_parse(yol: str) -> Tuple[List[Dict], List[Tuple[str, str]], List[str]]:
     ogrenciler: Dict[str, Dict] = {}
     kayit_set: set[Tuple[str, str]] = set()
     hatalar: List[str] = []
     try:
-        xls = pd.ExcelFile(Path(yol))
+        sayfalar = _sayfa_sonuclari("ogrenci", yol, _ogrenci_sayfasi, onbellek, isci_sayisi)
     except Exception as e:
         return [], [], [f"Excel açılamadı: {e}"]
 
-    for sheet in xls.sheet_names:
-        try:
-            df = xls.parse(sheet, dtype=object)
-        except Exception as e:
-            hatalar.append(f"Sayfa '{sheet}' okunamadı: {e}")
+    for sheet, sayfa, hata in sayfalar:
+        if sayfa is None:
+            hatalar.append(hata)
             continue
-        if df.empty:
+        s_ogr, s_kayit, s_hata = sayfa
+        for key, o in s_ogr.items():
+            if key not in ogrenciler:
+                ogrenciler[key] = dict(o)
+            else:
+                if o["adsoyad"] is not None: ogrenciler[key]["adsoyad"] = o["adsoyad"]
+                if o["sinif"] is not None: ogrenciler[key]["sinif"] = o["sinif"]
+        kayit_set |= s_kayit
+        hatalar.extend(s_hata)
+
+    sonuc = (list(ogrenciler.values()), sorted(kayit_set), hatalar)
+    if anahtar:
+        ONBELLEK.koy(anahtar, sonuc)
+    return sonuc
+
+
+# ---------------- ÖĞRENCİLER (akış) ----------------
+AKIS_PARCA = 5000        # bir parçadaki en fazla satır sayısı
+AKIS_ORNEK_SATIR = 500   # sütun tespiti (skorlama) için tamponlanan ilk satırlar
+
+
+def _hucre(v):
+    """openpyxl hücre değerini pandas'ın okuduğu biçime yaklaştırır (12345.0 → 12345)."""
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+
+def _dolu_satir(satir: tuple) -> bool:
+    return any(v is not None and (not isinstance(v, str) or v.strip()) for v in satir)
+
+
+def _baslik_adlari(satir: tuple) -> List[str]:
+    """Başlık satırından pandas ile aynı sütun adlarını üretir (Unnamed: i, tekrar için .1, .2)."""
+    adlar: List[str] = []
+    gorulen: Dict[str, int] = {}
+    for i, v in enumerate(satir):
+        ad = f"Unnamed: {i}" if v is None or str(v).strip() == "" else str(v)
+        n = gorulen.get(ad, 0)
+        gorulen[ad] = n + 1
+        adlar.append(ad if n == 0 else f"{ad}.{n}")
+    return [_clean_headingish(a) for a in adlar]
+
+
+def _ogrenci_sayfa_akisi(ws, parca_boyutu: int, hatalar: List[str]
+                        ) -> Iterator[Tuple[List[Dict], List[Tuple[str, str]]]]:
+    """Tek çalışma sayfasını satır satır okuyup (ogrenciler, kayitlar) parçaları üretir."""
+    satirlar = ws.iter_rows(values_only=True)
+    sutunlar: Optional[List[str]] = None
+    ornek: List[Tuple[int, tuple]] = []
+    for satir_no, satir in enumerate(satirlar, start=1):
+        if not _dolu_satir(satir):
+            continue  # boş satırlar (pandas skip_blank_lines gibi)
+        if sutunlar is None:
+            sutunlar = _baslik_adlari(satir)
             continue
+        ornek.append((satir_no, satir))
+        if len(ornek) >= AKIS_ORNEK_SATIR:
+            break
+    if not ornek:
+        return
+
+    genislik = len(sutunlar)
+    df = pd.DataFrame([tuple(_hucre(v) for v in s[:genislik]) for _, s in ornek],
+                      columns=sutunlar, dtype=object)
+    col_ogrno, col_adsoyad, col_sinif, ders_cols = _ogrenci_sutunlari(df)
+    i_ogrno = sutunlar.index(col_ogrno) if col_ogrno else None
+    i_adsoyad = sutunlar.index(col_adsoyad) if col_adsoyad else None
+    i_sinif = sutunlar.index(col_sinif) if col_sinif else None
+    i_ders = [sutunlar.index(c) for c in ders_cols]
+
+    def _al(satir: tuple, i: Optional[int]):
+        return _hucre(satir[i]) if i is not None and i < len(satir) else None
 
-        start = _first_nonempty_row_idx(df)
-        if start > 0:
-            df = df.iloc[start:].reset_index(drop=True)
-
-        cols_norm = [_clean_headingish(c) for c in df.columns]
-        df.columns = cols_norm
-
-        OGRNO_KEYS = {"ogr_no", "ogrenci no", "ogrenci_no", "ogrenci numarasi", "ogrencino", "numara", "student id",
-                      "ogrenci id"}
-        ADSOYAD_KEYS = {"adsoyad", "ad soyad", "adi soyadi", "isim", "name"}
-        SINIF_KEYS = {"sinif", "grade", "year", "sinifi"}
-
-        col_ogrno = next((c for c in df.columns if c in OGRNO_KEYS), None)
-        col_adsoyad = next((c for c in df.columns if c in ADSOYAD_KEYS), None)
-        col_sinif = next((c for c in df.columns if c in SINIF_KEYS), None)
-
-        ders_cols = [c for c in df.columns if c.startswith("ders")]
-        ders_cols += [c for c in df.columns if c in {"ders_kodu", "ders kodu", "kod", "course code", "code", "course"}]
-        ders_cols = list(dict.fromkeys(ders_cols))
-
-        if col_ogrno is None:
-            sc = [(c, _score_ogrno_col(df[c].astype(object))) for c in df.columns]
-            sc.sort(key=lambda x: x[1], reverse=True)
-            if sc and sc[0][1] > 0: col_ogrno = sc[0][0]
-        if col_adsoyad is None:
-            sc = [(c, _score_name_col(df[c].astype(object))) for c in df.columns]
-            sc.sort(key=lambda x: x[1], reverse=True)
-            if sc: col_adsoyad = sc[0][0]
-        if col_sinif is None:
-            sc = [(c, _score_grade_col(df[c].astype(object))) for c in df.columns]
-            sc.sort(key=lambda x: x[1], reverse=True)
-            if sc and sc[0][1] > 0: col_sinif = sc[0][0]
-        if not ders_cols:
-            cand = []
-            for c in df.columns:
-                sc = _score_code_col(df[c].astype(object))
-                if sc >= 0.2:
-                    cand.append((c, sc))
-            cand.sort(key=lambda x: x[1], reverse=True)
-            ders_cols = [c for c, _ in cand[:6]]
-
-        for ridx, row in df.iterrows():
-            ogr_no = _safe_str(row.get(col_ogrno)) if col_ogrno else None
-            adsoyad = _safe_str(row.get(col_adsoyad)) if col_adsoyad else None
-            sinif = _as_int_or_none(row.get(col_sinif)) if col_sinif else None
-
-            if not ogr_no:
-                hatalar.append(f"Sayfa '{sheet}', satır {ridx + 1}: 'ogr_no' boş veya bulunamadı.")
-                continue
+    ogrenciler: Dict[str, Dict] = {}
+    kayit_set: set[Tuple[str, str]] = set()
+    sayac = 0
+    kalan = ((n, s) for n, s in enumerate(satirlar, start=ornek[-1][0] + 1)
+             if _dolu_satir(s))
+    for satir_no, satir in chain(ornek, kalan):
+        ogr_no = _safe_str(_al(satir, i_ogrno))
+        if not ogr_no:
+            hatalar.append(f"Sayfa '{ws.title}', satır {satir_no}: 'ogr_no' boş veya bulunamadı.")
+            continue
+        adsoyad = _safe_str(_al(satir, i_adsoyad))
+        sinif = _as_int_or_none(_al(satir, i_sinif))
+
+        o = ogrenciler.get(ogr_no)
+        if o is None:
+            ogrenciler[ogr_no] = {"ogr_no": ogr_no, "adsoyad": adsoyad, "sinif": sinif}
+        else:
+            if adsoyad is not None: o["adsoyad"] = adsoyad
+            if sinif is not None: o["sinif"] = sinif
+        for i in i_ders:
+            v = _safe_str(_al(satir, i))
+            if v and RE_KOD.match(v):
+                kayit_set.add((ogr_no, v))
+
+        sayac += 1
+        if sayac >= parca_boyutu:
+            yield list(ogrenciler.values()), sorted(kayit_set)
+            ogrenciler, kayit_set, sayac = {}, set(), 0
+    if ogrenciler:
+        yield list(ogrenciler.values()), sorted(kayit_set)
+
+
+def _onbellekli_sayfa_akisi(ws, anahtar: str, parca_boyutu: int, hatalar: List[str]
+                            ) -> Iterator[Tuple[List[Dict], List[Tuple[str, str]]]]:
+    """Sayfa akışını üretirken parçaları önbelleğe de yazar; akış yarıda kalırsa kayıt atılır."""
+    sayfa_hatalari: List[str] = []
+    with ONBELLEK.akis_yaz(anahtar) as yaz:
+        for ogr, kayit in _ogrenci_sayfa_akisi(ws, parca_boyutu, sayfa_hatalari):
+            yaz(("parca", ogr, kayit))
+            yield ogr, kayit
+        yaz(("hata", sayfa_hatalari))
+    hatalar.extend(sayfa_hatalari)
+
+
+def ogrenci_excel_akis(yol: str, parca_boyutu: int = AKIS_PARCA,
+                       hatalar: Optional[List[str]] = None, onbellek: bool = True
+                       ) -> Iterator[Tuple[List[Dict], List[Tuple[str, str]]]]:
+    """
+    .xlsx öğrenci listesini openpyxl read_only modunda satır satır okur ve
+    (ogrenciler, kayitlar) parçaları üretir; bellek kullanımı sayfa boyutundan
+    bağımsızdır. Sütunlar ogrenci_excel_parse ile aynı kurallarla, her sayfanın
+    ilk AKIS_ORNEK_SATIR satırlık örneğinden seçilir.
 
-            key = ogr_no
-            if key not in ogrenciler:
-                ogrenciler[key] = {"ogr_no": key, "adsoyad": adsoyad, "sinif": sinif}
-            else:
-                if adsoyad is not None: ogrenciler[key]["adsoyad"] = adsoyad
-                if sinif is not None: ogrenciler[key]["sinif"] = sinif
+    Bir öğrencinin satırındaki kayıtlar aynı parçada gelir. Parça içinde aynı
+    öğrenci tekilleştirilir; parçalar arası tekrarları yazıcı (upsert) birleştirir.
+    hatalar listesi verilirse atlanan satır mesajları ona eklenir.
 
-            for c in ders_cols:
-                v = _safe_str(row.get(c))
-                if not v: continue
-                if RE_KOD.match(v):
-                    kayit_set.add((key, v))
+    onbellek açıkken içeriği değişmemiş sayfaların parçaları önbellekten
+    okunur; tüm sayfalar önbellekteyse çalışma kitabı hiç açılmaz.
+    """
+    hatalar = hatalar if hatalar is not None else []
+    ozetler = sayfa_ozetleri(yol) if onbellek else None
+    wb = None
 
-    return list(ogrenciler.values()), sorted(kayit_set), hatalar
+    def _kitap():
+        nonlocal wb
+        if wb is None:
+            wb = openpyxl.load_workbook(Path(yol), read_only=True, data_only=True)
+        return wb
+
+    try:
+        if ozetler is None:
+            try:
+                sayfalar = [(ws, None) for ws in _kitap().worksheets]
+            except Exception as e:
+                hatalar.append(f"Excel açılamadı: {e}")
+                return
+        else:
+            sayfalar = [(ad, f"ogrenci-akis-{AYRISTIRICI_SURUMU}-{parca_boyutu}-{ozet}")
+                        for ad, ozet in ozetler.items()]
+
+        for ws, anahtar in sayfalar:
+            if anahtar is None:
+                yield from _ogrenci_sayfa_akisi(ws, parca_boyutu, hatalar)
+                continue
+            verilen = 0  # önbellekten verilmiş parça sayısı
+            kayitli = ONBELLEK.akis_getir(anahtar)
+            if kayitli is not None:
+                hata_sayisi = len(hatalar)
+                try:
+                    for oge in kayitli:
+                        if oge[0] == "parca":
+                            yield oge[1], oge[2]
+                            verilen += 1
+                        else:
+                            hatalar.extend(oge[1])
+                    continue
+                except Exception:
+                    # yarım/bozuk kayıt: silinir, sayfa baştan ayrıştırılır. Aynı içerik
+                    # aynı parçaları aynı sırayla verdiğinden önbellekten verilenler atlanır.
+                    ONBELLEK.sil(anahtar)
+                    del hatalar[hata_sayisi:]
+            try:
+                ws = _kitap()[ws]
+            except Exception as e:
+                hatalar.append(f"Sayfa '{ws}' okunamadı: {e}")
+                continue
+            if not hasattr(ws, "iter_rows"):
+                continue  # grafik sayfası
+            yield from islice(_onbellekli_sayfa_akisi(ws, anahtar, parca_boyutu, hatalar), verilen, None)
+    finally:
+        if wb is not None:
+            wb.close()
@@ -0,0 +1,143 @@
+# planlayici/artimli.py
+# -*- coding: utf-8 -*-
+"""
+Artımlı yeniden planlama (planla(..., sabit=mevcut_yerlestirmeler)).
+
+Mevcut program sabit kabul edilir; yalnızca "kirli" dersler yeniden
+yerleştirilir, diğer sınavlar yerinden oynatılmaz:
+
+  - yeni ders: mevcut programda yerleşimi yok
+  - süresi değişmiş ders: kayıtlı süre, ders_istisna_sure / varsayılan süreden farklı
+  - yerleşimi artık geçersiz ders: tarih aralığı / hariç gün dışında kalmış,
+    dersliği silinmiş ya da kapasitesi öğrenci sayısına yetmiyor, ya da
+    (kayıt listesi ya da kısıtlar değiştiği için) daha önce korunan bir sınavla
+    öğrenci (bekleme süresi ve günlük sınır dahil), derslik veya tek_seans çakışması var
+
+Çakışan iki sabit sınavdan öğrenci sayısı büyük olan yerinde kalır; böylece
+yer değiştiren öğrenci sayısı küçük tutulur. Kirli dersler, korunan
+sınavlarla dolu çizelgelere kronolojik ilk uygun slota yerleştirilir.
+Mevcut programda olup ders listesinde bulunmayan sınavlar düşürülür.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from planner import _derslik_bilgisi, _derslik_sec_coklu, _derslik_zamani
+from planlayici.denetim import PlanDenetimi
+from planlayici.musaitlik import AralikIndeksi, ogrenci_indeksi_olustur
+from planlayici.ogrenci_takvimi import ogrenci_takvimi_olustur
+from planlayici.zaman_cizelgesi import ZamanCizelgesi
+
+
+def artimli_planla(k: Dict[str, Any],
+                   dersler: List[Dict[str, Any]],
+                   derslikler: List[Any],
+                   sabit: List[Dict[str, Any]],
+                   musaitlik: str = "bitset",
+                   denetim: Optional[PlanDenetimi] = None) -> Tuple[List[Dict[str, Any]], List[str], bool]:
+    """
+    k: planner._kisitlari_coz çıktısı; dersler zaten dahil_ders_ids ile süzülmüş olmalı.
+    sabit: mevcut program [{ders_id, baslangic, bitis, derslik_ids, ...}]
+           (bkz. veri_deposu.mevcut_yerlestirmeler)
+    Dönüş planla ile aynıdır: (yerlestirmeler, uyarilar, fatal). Yerinde kalan
+    sınavlar sabit kaydının kopyasıdır ve "sabit": True taşır; yeni yerleşenler
+    "sabit": False taşır.
+    denetim: her kirli ders öncesinde bildirilir; durursa geçerli sabit sınavlar ve
+    o ana kadar yerleşenler döner.
+    """
+    uyarilar: List[str] = []
+    yerlestirmeler: List[Dict[str, Any]] = []
+
+    tek_seans: bool = k["tek_seans"]
+    bekleme: int = k["bekleme_dk"]
+    zc = ZamanCizelgesi(k)
+
+    ders_by_id: Dict[int, Dict[str, Any]] = {int(d["id"]): d for d in dersler}
+    sure: Dict[int, int] = zc.sureler(ders_by_id)
+
+    derslik_bilgi = _derslik_bilgisi(derslikler)
+    kapasite: Dict[int, int] = dict(derslik_bilgi)
+    kullanim_say: Dict[int, int] = {dl_id: 0 for dl_id, _ in derslik_bilgi}
+    derslik_zaman = _derslik_zamani(zc, derslikler)  # başka bölümlerin sınavları baştan dolu
+    genel_zaman = AralikIndeksi()  # tek_seans için: anahtar 0 = tüm sınavlar
+    ogr_zaman = ogrenci_indeksi_olustur(musaitlik)
+    ogr_maske: Dict[int, Any] = {did: ogr_zaman.maske(d.get("ogr_ids") or []) for did, d in ders_by_id.items()}
+    takvim = ogrenci_takvimi_olustur(k, dersler)
+    kohort = {did: takvim.kohort(d.get("ogr_ids") or ()) for did, d in ders_by_id.items()} if takvim is not None else {}
+
+    def _ogrenciler_uygun(did: int, bas: int, bit: int) -> bool:
+        return (ogr_zaman.musait_mi(ogr_maske[did], bas - bekleme, bit + bekleme)
+                and (takvim is None or takvim.uygun_mu(kohort[did], bas // 1440)))
+
+    def _yerlestir(did: int, bas: int, bit: int, dl_ids: List[int]) -> None:
+        for dl_id in dl_ids:
+            derslik_zaman.ekle(dl_id, bas, bit)
+            kullanim_say[dl_id] += 1
+        ogr_zaman.ekle(ogr_maske[did], bas, bit)
+        if takvim is not None:
+            takvim.ekle(kohort[did], bas // 1440)
+        if tek_seans:
+            genel_zaman.ekle(0, bas, bit)
+
+    # ---- 1) Sabit sınavları doğrula; geçerli olanları çizelgelere yükle ----
+    kirli: Set[int] = set(ders_by_id)
+    sabit_sirali = sorted(
+        (y for y in sabit if int(y["ders_id"]) in ders_by_id),
+        key=lambda y: (-int(ders_by_id[int(y["ders_id"])].get("ogr_say") or 0), y["baslangic"], int(y["ders_id"])),
+    )
+    for y in sabit_sirali:
+        did = int(y["ders_id"])
+        if did not in kirli:
+            continue  # aynı ders için ikinci kayıt: ilki korunur
+        bas, bit = zc.dakika(y["baslangic"]), zc.dakika(y["bitis"])
+        dl_ids = [int(x) for x in (y.get("derslik_ids") or [])]
+        gecerli = (
+            bit - bas == sure[did]
+            and k["tarih_bas"] <= y["baslangic"].date() <= k["tarih_bit"]
+            and y["baslangic"].weekday() not in k["gun_disi"]
+            and dl_ids and all(dl in kapasite for dl in dl_ids)
+            and sum(kapasite[dl] for dl in dl_ids) >= int(ders_by_id[did].get("ogr_say") or 0)
+            and all(derslik_zaman.musait_mi(dl, bas, bit) for dl in dl_ids)
+            and (not tek_seans or genel_zaman.musait_mi(0, bas, bit))
+            and _ogrenciler_uygun(did, bas, bit)
+        )
+        if not gecerli:
+            continue
+        _yerlestir(did, bas, bit, dl_ids)
+        kirli.discard(did)
+        yerlestirmeler.append({**y, "derslik_ids": dl_ids, "sabit": True})
+
+    # ---- 2) Kirli dersleri kronolojik ilk uygun slota yerleştir ----
+    baslar: List[int] = sorted(zc.baslar)
+    kirli_sirali = sorted(kirli, key=lambda i: (-int(ders_by_id[i].get("ogr_say") or 0), i))
+    for n, did in enumerate(kirli_sirali):
+        if denetim is not None and denetim.bildir(
+                "artimli", len(yerlestirmeler), len(kirli_sirali) - n, lambda: list(yerlestirmeler)):
+            break
+        d = ders_by_id[did]
+        ogr_say = int(d.get("ogr_say") or 0)
+        secim = None
+        for bas in baslar:
+            bit = bas + sure[did]
+            if tek_seans and not genel_zaman.musait_mi(0, bas, bit):
+                continue
+            if not _ogrenciler_uygun(did, bas, bit):
+                continue
+            dl_ids = _derslik_sec_coklu(derslik_bilgi, kullanim_say, derslik_zaman, ogr_say, bas, bit)
+            if dl_ids is not None:
+                secim = (bas, bit, dl_ids)
+                break
+
+        if secim is None:
+            uyarilar.append(
+                f"Ders {d.get('kod', '?')} için çakışmasız slot veya uygun/kapasiteli derslik bulunamadı."
+            )
+            continue
+
+        bas, bit, dl_ids = secim
+        _yerlestir(did, bas, bit, dl_ids)
+        yerlestirmeler.append({**zc.yerlestirme(did, bas, sure[did], dl_ids), "sabit": False})
+
+    yerlestirmeler.sort(key=lambda y: (y["baslangic"], y["ders_id"]))
+    fatal = False
+    return yerlestirmeler, uyarilar, fatal
@@ -0,0 +1,65 @@
+# planlayici/cakisma_grafi.py
+# -*- coding: utf-8 -*-
+"""
+Ders çakışma grafı: düğümler dersler, kenar ağırlığı iki dersi birlikte alan
+öğrenci sayısıdır. Graf, ogrenci_ders kaydından (dersin `ogr_ids` kümesi)
+bir kez kurulur; planlayıcı her slotta öğrenci listelerini yeniden gezmez.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List
+
+try:  # numpy varsa ortak öğrenci sayıları tek matris çarpımıyla hesaplanır
+    from planlayici.kayit_matrisi import KayitMatrisi
+except Exception:  # pragma: no cover - numpy yoksa saf Python yolu
+    KayitMatrisi = None
+
+
+def cakisma_grafi_olustur(dersler: Iterable[Dict[str, Any]],
+                          matris: "KayitMatrisi | None" = None) -> Dict[int, Dict[int, int]]:
+    """
+    dersler: [{id, ogr_ids, ...}]
+    matris:  önceden kurulmuş KayitMatrisi (verilmezse ve numpy varsa derslerden kurulur)
+    Dönüş: {ders_id: {komsu_ders_id: ortak_ogrenci_sayisi}}  (simetrik; her ders anahtar olarak bulunur)
+    """
+    if matris is None and KayitMatrisi is not None:
+        dersler = list(dersler)
+        matris = KayitMatrisi.derslerden(dersler)
+    if matris is not None:
+        return matris.cakisma_grafi()
+    return _cakisma_grafi_saf(dersler)
+
+
+def _cakisma_grafi_saf(dersler: Iterable[Dict[str, Any]]) -> Dict[int, Dict[int, int]]:
+    """
+    Öğrenci → dersler ters indeksi üzerinden kurar; maliyet öğrenci başına
+    ders sayısının karesiyle orantılıdır (ders×ders küme kesişimi yapılmaz).
+    """
+    graf: Dict[int, Dict[int, int]] = {}
+    ogr_dersleri: Dict[int, List[int]] = {}
+    for d in dersler:
+        did = int(d["id"])
+        graf.setdefault(did, {})
+        for oid in (d.get("ogr_ids") or ()):
+            ogr_dersleri.setdefault(int(oid), []).append(did)
+
+    for liste in ogr_dersleri.values():
+        n = len(liste)
+        if n < 2:
+            continue
+        for i in range(n):
+            a = liste[i]
+            ka = graf[a]
+            for j in range(i + 1, n):
+                b = liste[j]
+                if a == b:
+                    continue
+                ka[b] = ka.get(b, 0) + 1
+                kb = graf[b]
+                kb[a] = kb.get(a, 0) + 1
+    return graf
+
+
+def agirlikli_derece(graf: Dict[int, Dict[int, int]]) -> Dict[int, int]:
+    """{ders_id: komşu kenar ağırlıkları toplamı} (Welsh-Powell sıralaması için)."""
+    return {did: sum(komsular.values()) for did, komsular in graf.items()}
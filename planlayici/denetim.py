@@ -0,0 +1,109 @@
+# planlayici/denetim.py
+# -*- coding: utf-8 -*-
+"""
+"Her an durdurulabilir" planlama için motorlara geçirilen denetim nesnesi.
+
+planla(..., son_zaman=, iptal=, ilerleme=) bir PlanDenetimi kurar; motorlar
+doğal denetim noktalarında (açgözlü: her slot, graf/artımlı: her ders,
+yerel arama: her 1024 adım, portföy: her varyant, kesin: her yeni çözüm)
+denetim.bildir(...) çağırır. bildir True dönerse motor o ana kadarki
+yerleştirmelerle (kısmi ama geçerli bir programla) hemen döner. Durma
+nedenleri:
+  - iptal:   iptal.is_set() (ör. threading.Event; bkz. arayuz.arka_plan)
+  - sure:    time.monotonic() >= son_zaman
+  - yeterli: ilerleme geri çağrısı True döndürdü ("bu kadarı yeter")
+
+ilerleme(PlanIlerleme) en çok aralik_sn'de bir çağrılır. Kısmi program
+ilerleme.yerlestirmeler() ile geri çağrı içinde kurulur; motor sürdükçe
+değişeceğinden saklanacaksa kopyası alınmalıdır.
+"""
+from __future__ import annotations
+
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional
+
+# ilerleme geri çağrıları arasındaki en kısa süre (sn)
+ILERLEME_ARALIGI_SN = 0.1
+
+DURMA_NEDENLERI = {
+    "iptal": "iptal edildi",
+    "sure": "süre sınırına ulaşıldı",
+    "yeterli": "sonuç yeterli bulundu",
+}
+
+
+class PlanIlerleme:
+    """Bir denetim noktasındaki durum: aşama (motor adı), yerleşen ve kalan ders sayısı."""
+
+    __slots__ = ("asama", "yerlesen", "kalan", "_uret")
+
+    def __init__(self, asama: str, yerlesen: int, kalan: int,
+                 uret: Callable[[], List[Dict[str, Any]]]):
+        self.asama = asama
+        self.yerlesen = yerlesen
+        self.kalan = kalan
+        self._uret = uret
+
+    @property
+    def oran(self) -> float:
+        toplam = self.yerlesen + self.kalan
+        return self.yerlesen / toplam if toplam else 1.0
+
+    def yerlestirmeler(self) -> List[Dict[str, Any]]:
+        """O ana kadarki yerleştirmeler (planla çıktısı biçiminde)."""
+        return self._uret()
+
+    def __repr__(self) -> str:
+        return f"PlanIlerleme({self.asama!r}, yerlesen={self.yerlesen}, kalan={self.kalan})"
+
+
+class PlanDenetimi:
+    """
+    son_zaman: time.monotonic() cinsinden bitiş anı (None: sınırsız)
+    iptal: is_set() metodu olan iptal belirteci (None: iptal yok)
+    ilerleme: PlanIlerleme alan geri çağrı; True dönerse planlama durur
+    """
+
+    def __init__(self, son_zaman: Optional[float] = None, iptal: Any = None,
+                 ilerleme: Optional[Callable[[PlanIlerleme], Any]] = None,
+                 aralik_sn: float = ILERLEME_ARALIGI_SN):
+        self.son_zaman = son_zaman
+        self.iptal = iptal
+        self.ilerleme = ilerleme
+        self.aralik_sn = aralik_sn
+        self.neden: Optional[str] = None  # durduysa DURMA_NEDENLERI anahtarı
+        self._son_bildirim = float("-inf")
+
+    @property
+    def durdu(self) -> bool:
+        return self.neden is not None
+
+    def kalan_sn(self) -> Optional[float]:
+        """Son zamana kalan süre (sınır yoksa None)."""
+        return None if self.son_zaman is None else max(0.0, self.son_zaman - monotonic())
+
+    def dur_mu(self) -> bool:
+        """İptal ya da süre sınırını denetler (ilerleme çağrılmaz)."""
+        if self.neden is None:
+            if self.iptal is not None and self.iptal.is_set():
+                self.neden = "iptal"
+            elif self.son_zaman is not None and monotonic() >= self.son_zaman:
+                self.neden = "sure"
+        return self.neden is not None
+
+    def bildir(self, asama: str, yerlesen: int, kalan: int,
+               uret: Callable[[], List[Dict[str, Any]]], zorla: bool = False) -> bool:
+        """Denetim noktası: gerekiyorsa ilerleme çağrılır; motor durmalıysa True."""
+        if self.dur_mu():
+            return True
+        if self.ilerleme is not None:
+            simdi = monotonic()
+            if zorla or simdi - self._son_bildirim >= self.aralik_sn:
+                self._son_bildirim = simdi
+                if self.ilerleme(PlanIlerleme(asama, yerlesen, kalan, uret)):
+                    self.neden = "yeterli"
+        return self.neden is not None
+
+    def uyari(self, yerlesmeyen: int) -> str:
+        return (f"Planlama erken durdu ({DURMA_NEDENLERI[self.neden]}); "
+                f"{yerlesmeyen} ders yerleştirilmedi ya da denenmedi.")
@@ -0,0 +1,136 @@
+# planlayici/graf_motoru.py
+# -*- coding: utf-8 -*-
+"""
+Graf boyama tabanlı planlama motoru (planla(..., motor="graf")).
+
+Ders çakışma grafı bir kez kurulur; her (gün, slot) bir "renk"tir. Dersler
+DSatur sırasıyla seçilir: en çok farklı slotu komşuları tarafından
+engellenmiş ders önce, eşitlikte ağırlıklı derecesi (Welsh-Powell) ve
+öğrenci sayısı büyük olan önce. Seçilen ders, kronolojik ilk uygun slota,
+o slotta boş ve kapasitesi yeten dersliğe (tek derslik yetmiyorsa boş
+dersliklerin birleşimine) yerleştirilir; slot kapasitesi böylece derslik
+sayısıyla sınırlanır.
+
+Zaman tamsayı dakikadır (bkz. planlayici.zaman_cizelgesi). Farklı süreli
+sınavlar için "engelli slot" zaman üzerinden hesaplanır:
+komşusu [b, e) aralığına yerleşen bir ders, başlangıcı (b - kendi_süresi, e)
+aralığına düşen slotlara konamaz.
+"""
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from planner import _derslik_bilgisi, _derslik_sec_coklu, _derslik_zamani
+from planlayici.cakisma_grafi import agirlikli_derece, cakisma_grafi_olustur
+from planlayici.denetim import PlanDenetimi
+from planlayici.musaitlik import AralikIndeksi
+from planlayici.ogrenci_takvimi import ogrenci_takvimi_olustur
+from planlayici.zaman_cizelgesi import ZamanCizelgesi
+
+
+def graf_ile_planla(k: Dict[str, Any],
+                    dersler: List[Dict[str, Any]],
+                    derslikler: List[Any],
+                    graf: Optional[Dict[int, Dict[int, int]]] = None,
+                    denetim: Optional[PlanDenetimi] = None) -> Tuple[List[Dict[str, Any]], List[str], bool]:
+    """
+    k: planner._kisitlari_coz çıktısı; dersler zaten dahil_ders_ids ile süzülmüş olmalı.
+    graf: önceden kurulmuş çakışma grafı (verilmezse derslerden kurulur)
+    denetim: her ders seçiminde bildirilir; durursa o ana kadarki yerleştirmeler döner
+    Dönüş planla ile aynıdır: (yerlestirmeler, uyarilar, fatal)
+    """
+    uyarilar: List[str] = []
+    yerlestirmeler: List[Dict[str, Any]] = []
+
+    zc = ZamanCizelgesi(k)
+    baslar: List[int] = sorted(zc.baslar)
+    tek_seans: bool = k["tek_seans"]
+    bekleme: int = k["bekleme_dk"]
+
+    ders_by_id: Dict[int, Dict[str, Any]] = {int(d["id"]): d for d in dersler}
+    sure: Dict[int, int] = zc.sureler(ders_by_id)
+
+    if graf is None:
+        graf = cakisma_grafi_olustur(dersler)
+    derece = agirlikli_derece(graf)
+
+    derslik_bilgi = _derslik_bilgisi(derslikler)
+    kullanim_say: Dict[int, int] = {dl_id: 0 for dl_id, _ in derslik_bilgi}
+    derslik_zaman = _derslik_zamani(zc, derslikler)
+    takvim = ogrenci_takvimi_olustur(k, dersler)
+    kohort = {did: takvim.kohort(d.get("ogr_ids") or ()) for did, d in ders_by_id.items()} if takvim is not None else {}
+    genel_zaman = AralikIndeksi()  # tek_seans için: anahtar 0 = tüm sınavlar
+
+    engel: Dict[int, Set[int]] = {did: set() for did in ders_by_id}
+    bekleyen: Set[int] = set(ders_by_id)
+
+    def _oncelik(did: int) -> Tuple[int, int, int, int]:
+        d = ders_by_id[did]
+        return (-len(engel[did]), -derece.get(did, 0), -int(d.get("ogr_say") or 0), did)
+
+    yigin = [_oncelik(did) for did in ders_by_id]
+    heapq.heapify(yigin)
+
+    while yigin:
+        oncelik = heapq.heappop(yigin)
+        did = oncelik[-1]
+        if did not in bekleyen or -oncelik[0] != len(engel[did]):
+            continue  # eski kayıt (doygunluk değişmiş) ya da ders zaten işlenmiş
+        if denetim is not None and denetim.bildir(
+                "graf", len(yerlestirmeler), len(bekleyen), lambda: list(yerlestirmeler)):
+            break
+        bekleyen.discard(did)
+
+        d = ders_by_id[did]
+        ogr_say = int(d.get("ogr_say") or 0)
+        dur = sure[did]
+        engelli = engel[did]
+
+        secim = None
+        for si, bas in enumerate(baslar):
+            if si in engelli:
+                continue
+            bit = bas + dur
+            if tek_seans and not genel_zaman.musait_mi(0, bas, bit):
+                continue
+            if takvim is not None and not takvim.uygun_mu(kohort[did], bas // 1440):
+                continue
+            dl_ids = _derslik_sec_coklu(derslik_bilgi, kullanim_say, derslik_zaman, ogr_say, bas, bit)
+            if dl_ids is not None:
+                secim = (bas, bit, dl_ids)
+                break
+
+        if secim is None:
+            uyarilar.append(
+                f"Ders {d.get('kod', '?')} için çakışmasız slot veya uygun/kapasiteli derslik bulunamadı."
+            )
+            continue
+
+        bas, bit, dl_ids = secim
+        yerlestirmeler.append(zc.yerlestirme(did, bas, dur, dl_ids))
+        for dl_id in dl_ids:
+            derslik_zaman.ekle(dl_id, bas, bit)
+            kullanim_say[dl_id] += 1
+        if tek_seans:
+            genel_zaman.ekle(0, bas, bit)
+        if takvim is not None:
+            takvim.ekle(kohort[did], bas // 1440)
+
+        # Komşuların engelli slotlarını güncelle (doygunluk arttıysa yığına yeniden it);
+        # bekleme süresi kadar önce/sonra başlayan slotlar da engellidir
+        for komsu in graf.get(did, ()):
+            if komsu not in bekleyen:
+                continue
+            lo = bisect_right(baslar, bas - sure[komsu] - bekleme)
+            hi = bisect_left(baslar, bit + bekleme)
+            ke = engel[komsu]
+            onceki = len(ke)
+            ke.update(range(lo, hi))
+            if len(ke) != onceki:
+                heapq.heappush(yigin, _oncelik(komsu))
+
+    yerlestirmeler.sort(key=lambda y: (y["baslangic"], y["ders_id"]))
+    fatal = False
+    return yerlestirmeler, uyarilar, fatal
@@ -0,0 +1,168 @@
+# planlayici/kayit_matrisi.py
+# -*- coding: utf-8 -*-
+"""
+Öğrenci × ders kayıt matrisi (CSR) ve ders × ders ortak öğrenci matrisi.
+
+Matris bölüm başına bir kez kurulur: satırlar öğrenciler, sütunlar dersler,
+her kayıt (ogrenci_id, ders_id) bir 1'dir. Ortak öğrenci matrisi C = AᵀA tek
+bir matris çarpımıyla elde edilir; C[i, j] i. ve j. dersi birlikte alan öğrenci
+sayısı, C[i, i] dersin öğrenci sayısıdır.
+
+scipy kuruluysa seyrek çarpım kullanılır; değilse aynı çarpım, öğrenciler ders
+sayılarına göre gruplanıp NumPy ile vektörel olarak hesaplanır. Her iki yolda da
+sonuç seyrek (satır, sütun, ortak) üçlüleri olarak tutulur.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:  # opsiyonel: seyrek çarpım
+    from scipy import sparse as _sparse  # type: ignore
+except Exception:  # pragma: no cover - scipy yoksa NumPy gruplu yol
+    _sparse = None
+
+
+class KayitMatrisi:
+    """
+    CSR biçiminde öğrenci × ders kayıt matrisi.
+
+      ders_ids   : sütun sırasındaki ders id'leri (np.int64)
+      ogrenci_ids: satır sırasındaki öğrenci id'leri (np.int64)
+      indptr     : satır başlangıçları (len = öğrenci sayısı + 1)
+      indices    : her kaydın ders sütun numarası
+    """
+
+    def __init__(self, ders_ids: np.ndarray, ogrenci_ids: np.ndarray,
+                 indptr: np.ndarray, indices: np.ndarray):
+        self.ders_ids = ders_ids
+        self.ogrenci_ids = ogrenci_ids
+        self.indptr = indptr
+        self.indices = indices
+        self._sutun: Dict[int, int] = {int(d): i for i, d in enumerate(ders_ids)}
+        self._ortak: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    # ---------------- kurulum ----------------
+    @classmethod
+    def ciftlerden(cls, ogrenci_ids: Sequence[int], ders_ids: Sequence[int],
+                   tum_ders_ids: Optional[Iterable[int]] = None) -> "KayitMatrisi":
+        """
+        (ogrenci_id, ders_id) kayıt çiftlerinden kurar (ör. tek bir ogrenci_ders sorgusu).
+        tum_ders_ids verilirse öğrencisi olmayan dersler de sütun olarak yer alır.
+        """
+        o = np.asarray(ogrenci_ids, dtype=np.int64)
+        d = np.asarray(ders_ids, dtype=np.int64)
+        if tum_ders_ids is not None:
+            sutunlar = np.unique(np.concatenate([np.fromiter((int(x) for x in tum_ders_ids), dtype=np.int64), d]))
+        else:
+            sutunlar = np.unique(d)
+        satirlar, satir_no = np.unique(o, return_inverse=True)
+        sutun_no = np.searchsorted(sutunlar, d)
+
+        # satıra göre sırala; aynı çift iki kez gelirse tekille
+        genislik = max(len(sutunlar), 1)
+        anahtar = np.unique(satir_no.astype(np.int64) * genislik + sutun_no)
+        satir_no, sutun_no = anahtar // genislik, anahtar % genislik
+
+        indptr = np.zeros(len(satirlar) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(satir_no, minlength=len(satirlar)), out=indptr[1:])
+        return cls(sutunlar, satirlar, indptr, sutun_no.astype(np.int32))
+
+    @classmethod
+    def derslerden(cls, dersler: Iterable[Dict[str, Any]]) -> "KayitMatrisi":
+        """planla'ya giden ders listesinden ({id, ogr_ids}) kurar."""
+        tum: List[int] = []
+        o_parca: List[int] = []
+        d_parca: List[int] = []
+        for d in dersler:
+            did = int(d["id"])
+            tum.append(did)
+            ogr = d.get("ogr_ids") or ()
+            o_parca.extend(int(x) for x in ogr)
+            d_parca.extend([did] * len(ogr))
+        return cls.ciftlerden(o_parca, d_parca, tum_ders_ids=tum)
+
+    # ---------------- sorgular ----------------
+    @property
+    def ogrenci_sayisi(self) -> int:
+        return len(self.ogrenci_ids)
+
+    @property
+    def ders_sayisi(self) -> int:
+        return len(self.ders_ids)
+
+    def ders_ogr_say(self) -> Dict[int, int]:
+        """{ders_id: öğrenci sayısı}"""
+        say = np.bincount(self.indices, minlength=self.ders_sayisi)
+        return {int(d): int(n) for d, n in zip(self.ders_ids, say)}
+
+    def ortak_ciftler(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        AᵀA'nın sıfır olmayan elemanları: (satır, sütun, ortak) dizileri, köşegen dahil.
+        Sonuç önbelleğe alınır; yoğun ders × ders matrisi kurulmaz.
+        """
+        if self._ortak is not None:
+            return self._ortak
+        n = self.ders_sayisi
+        if _sparse is not None:
+            a = _sparse.csr_matrix(
+                (np.ones(len(self.indices), dtype=np.int32), self.indices, self.indptr),
+                shape=(self.ogrenci_sayisi, n),
+            )
+            c = (a.T @ a).tocoo()
+            i, j, w = c.row, c.col, c.data
+        else:
+            # scipy yoksa: aynı sayıda ders alan öğrenciler tek blokta, tüm (a, b)
+            # sütun çiftleri yayınlama (broadcast) ile üretilip sayılır.
+            uzunluk = np.diff(self.indptr)
+            parcalar = []
+            for k in np.unique(uzunluk):
+                if k == 0:
+                    continue
+                satirlar = np.nonzero(uzunluk == k)[0]
+                blok = self.indices[self.indptr[satirlar][:, None] + np.arange(k)].astype(np.int64)
+                parcalar.append((blok[:, :, None] * n + blok[:, None, :]).ravel())
+            anahtar = np.concatenate(parcalar) if parcalar else np.empty(0, dtype=np.int64)
+            ks, w = np.unique(anahtar, return_counts=True)
+            i, j = ks // max(n, 1), ks % max(n, 1)
+        self._ortak = (np.asarray(i, dtype=np.int64), np.asarray(j, dtype=np.int64), np.asarray(w, dtype=np.int32))
+        return self._ortak
+
+    def ortak_ogrenci_matrisi(self) -> np.ndarray:
+        """ders × ders ortak öğrenci sayıları (yoğun int32, simetrik)."""
+        n = self.ders_sayisi
+        i, j, w = self.ortak_ciftler()
+        c = np.zeros((n, n), dtype=np.int32)
+        c[i, j] = w
+        return c
+
+    def cakisma_ciftleri(self, esik: int = 1) -> List[Tuple[int, int, int]]:
+        """[(ders_a, ders_b, ortak)] — her çift bir kez, ortak >= esik; ortağa göre azalan."""
+        i, j, w = self.ortak_ciftler()
+        m = (i < j) & (w >= max(1, esik))
+        i, j, w = i[m], j[m], w[m]
+        sira = np.lexsort((j, i, -w))
+        ids = self.ders_ids
+        return [(int(ids[i[s]]), int(ids[j[s]]), int(w[s])) for s in sira]
+
+    def cakisan_dersler(self, ders_id: int) -> List[Tuple[int, int]]:
+        """Bir dersle ortak öğrencisi olan dersler: [(ders_id, ortak)] ortağa göre azalan."""
+        i = self._sutun.get(int(ders_id))
+        if i is None:
+            return []
+        a, b, w = self.ortak_ciftler()
+        m = (a == i) & (b != i)
+        b, w = b[m], w[m]
+        sira = np.lexsort((b, -w))
+        return [(int(self.ders_ids[b[s]]), int(w[s])) for s in sira]
+
+    def cakisma_grafi(self) -> Dict[int, Dict[int, int]]:
+        """planlayici.cakisma_grafi ile aynı biçimde {ders_id: {komsu: ortak}}."""
+        ids = [int(x) for x in self.ders_ids]
+        graf: Dict[int, Dict[int, int]] = {did: {} for did in ids}
+        i, j, w = self.ortak_ciftler()
+        for a, b, w in zip(i.tolist(), j.tolist(), w.tolist()):
+            if a != b:
+                graf[ids[a]][ids[b]] = w
+        return graf
@@ -0,0 +1,251 @@
+# planlayici/kesin_cozucu.py
+# -*- coding: utf-8 -*-
+"""
+OR-Tools CP-SAT ile kesin planlama motoru (planla(..., motor="kesin")).
+
+Model (zaman birimi: tarih_bas gece yarısından itibaren dakika):
+
+  - her ders için isteğe bağlı bir aralık: başlangıcı yalnızca geçerli slot
+    başlangıçlarını (gun_disi hariç) alabilir, uzunluğu dersin süresidir;
+    varlığı "ders yerleşti" değişkenidir
+  - her derslik için isteğe bağlı bir kopya aralık; yerleşen dersin seçili
+    dersliklerinin toplam kapasitesi öğrenci sayısına yeter (büyük sınavlar
+    birkaç dersliğe bölünür), her derslikte aralıklar çakışmaz
+  - öğrenci çakışması: aynı ders kümesini alan öğrenciler tek kısıtta
+    birleşir; her farklı küme için NoOverlap. bekleme_dk > 0 ise bu
+    kısıtlardaki aralıklar sınav süresi + bekleme uzunluğundadır
+  - gunluk_azami_sinav: her ders için "şu günde" ikili değişkenleri; sınırdan
+    çok dersi olan her farklı küme için her gün toplam ≤ sınır
+  - tek_seans: tüm ders aralıkları için tek NoOverlap
+
+Amaç yerleşen ders sayısını en büyüklemektir; çözümde gereğinden fazla
+seçilmiş derslikler sonradan (en küçükten başlayarak, kapasite yettikçe)
+bırakılır. Açgözlü motorun çözümü ipucu (warm start) olarak verilir ve dönen
+sonuç hiçbir zaman ondan kötü olmaz:
+çözücü süre dolduğunda daha az ders yerleştirmişse, ortools kurulu değilse
+ya da süre içinde hiç çözüm bulunamazsa açgözlü sonuç bir uyarıyla döner.
+
+denetim verilirse (bkz. planlayici.denetim) süre sınırı son_zaman'a göre
+kısaltılır, her yeni çözüm bildirilir ve iptal bir izleyici iş parçacığıyla
+aramayı durdurur; o ana kadarki en iyi çözüm döner.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from planner import _acgozlu_planla, _derslik_bilgisi, _getv
+from planlayici.denetim import PlanDenetimi
+from planlayici.zaman_cizelgesi import ZamanCizelgesi
+
+try:  # opsiyonel: pip install ortools
+    from ortools.sat.python import cp_model  # type: ignore
+except Exception:  # pragma: no cover - ortools yoksa açgözlü motora düşülür
+    cp_model = None
+
+VARSAYILAN_SURE_SN = 30.0
+
+
+def kesin_planla(k: Dict[str, Any],
+                 dersler: List[Dict[str, Any]],
+                 derslikler: List[Any],
+                 musaitlik: str = "bitset",
+                 sure_sn: float = VARSAYILAN_SURE_SN,
+                 tohum: int = 0,
+                 denetim: Optional[PlanDenetimi] = None) -> Tuple[List[Dict[str, Any]], List[str], bool]:
+    """
+    k: planner._kisitlari_coz çıktısı; dersler zaten dahil_ders_ids ile süzülmüş olmalı.
+    sure_sn: çözücü süre sınırı; tohum: çözücünün rastgele tohumu.
+    Dönüş planla ile aynıdır: (yerlestirmeler, uyarilar, fatal)
+    """
+    acgozlu, acgozlu_uyarilar, fatal = _acgozlu_planla(k, dersler, derslikler, musaitlik, denetim=denetim)
+    if cp_model is None:
+        return acgozlu, ["Kesin çözücü için ortools kurulu değil; açgözlü motor kullanıldı."] + acgozlu_uyarilar, fatal
+    if denetim is not None:
+        if denetim.durdu:
+            return acgozlu, acgozlu_uyarilar, fatal
+        kalan_sn = denetim.kalan_sn()
+        if kalan_sn is not None:
+            sure_sn = min(sure_sn, kalan_sn)
+
+    zc = ZamanCizelgesi(k)
+    baslar = sorted(set(zc.baslar))
+    if not baslar or not dersler:
+        return acgozlu, acgozlu_uyarilar, fatal
+
+    ders_ids = sorted(int(d["id"]) for d in dersler)
+    ders_by_id = {int(d["id"]): d for d in dersler}
+    derslik_bilgi = _derslik_bilgisi(derslikler)
+
+    model = cp_model.CpModel()
+    alan = cp_model.Domain.FromValues(baslar)
+    bas_var: Dict[int, Any] = {}
+    var_mi: Dict[int, Any] = {}
+    aralik: Dict[int, Any] = {}
+    ogr_aralik: Dict[int, Any] = {}
+    bekleme = int(k["bekleme_dk"])
+    oda_var: Dict[int, Dict[int, Any]] = {}
+    oda_araliklari: Dict[int, List[Any]] = {dl_id: [] for dl_id, _ in derslik_bilgi}
+    # başka bölümlerin ortak derslikteki sınavları sabit aralıklardır
+    for dl in derslikler:
+        for n, (dolu_bas, dolu_bit) in enumerate(_getv(dl, "dolu") or ()):
+            b0, b1 = zc.dakika(dolu_bas), zc.dakika(dolu_bit)
+            oda_araliklari[int(_getv(dl, "id"))].append(
+                model.NewIntervalVar(b0, b1 - b0, b1, f"dolu_{_getv(dl, 'id')}_{n}"))
+
+    for did in ders_ids:
+        sure = zc.sure(did)
+        ogr_say = int(ders_by_id[did].get("ogr_say") or 0)
+        b = model.NewIntVarFromDomain(alan, f"bas_{did}")
+        p = model.NewBoolVar(f"var_{did}")
+        bas_var[did], var_mi[did] = b, p
+        aralik[did] = model.NewOptionalFixedSizeIntervalVar(b, sure, p, f"sinav_{did}")
+        ogr_aralik[did] = aralik[did] if not bekleme else \
+            model.NewOptionalFixedSizeIntervalVar(b, sure + bekleme, p, f"ogr_{did}")
+        oda_var[did] = {}
+        for dl_id, kap in derslik_bilgi:
+            y = model.NewBoolVar(f"oda_{did}_{dl_id}")
+            oda_var[did][dl_id] = y
+            oda_araliklari[dl_id].append(model.NewOptionalFixedSizeIntervalVar(b, sure, y, f"sinav_{did}_{dl_id}"))
+            model.AddImplication(y, p)
+        # yerleşen dersin derslikleri öğrencilerini almalı; yerleşmeyen derslik tutmaz
+        model.Add(sum(kap * oda_var[did][dl_id] for dl_id, kap in derslik_bilgi) >= max(1, ogr_say) * p)
+
+    for araliklar in oda_araliklari.values():
+        if len(araliklar) > 1:
+            model.AddNoOverlap(araliklar)
+
+    # öğrenci kısıtları: her farklı ders kümesi bir kez
+    ogr_dersleri: Dict[int, List[int]] = {}
+    for did in ders_ids:
+        for oid in (ders_by_id[did].get("ogr_ids") or ()):
+            ogr_dersleri.setdefault(int(oid), []).append(did)
+    kumeler: Set[Tuple[int, ...]] = {tuple(sorted(set(l))) for l in ogr_dersleri.values() if len(l) > 1}
+    for kume in sorted(kumeler):
+        model.AddNoOverlap([ogr_aralik[did] for did in kume])
+
+    azami = k.get("gunluk_azami_sinav")
+    gun_var: Dict[int, Dict[int, Any]] = {}
+    if azami is not None:
+        gunler = sorted({b // 1440 for b in baslar})
+        for did in ders_ids:
+            gun_var[did] = {}
+            for g in gunler:
+                z = model.NewBoolVar(f"gun_{did}_{g}")
+                gun_var[did][g] = z
+                model.Add(bas_var[did] >= g * 1440).OnlyEnforceIf(z)
+                model.Add(bas_var[did] < (g + 1) * 1440).OnlyEnforceIf(z)
+            model.Add(sum(gun_var[did].values()) == var_mi[did])
+        for kume in sorted(kumeler):
+            if len(kume) > azami:
+                for g in gunler:
+                    model.Add(sum(gun_var[did][g] for did in kume) <= azami)
+
+    if k["tek_seans"]:
+        model.AddNoOverlap(list(aralik.values()))
+
+    model.Maximize(sum(var_mi.values()))
+
+    # açgözlü çözüm ipucu
+    ipucu = {int(y["ders_id"]): y for y in acgozlu}
+    for did in ders_ids:
+        y = ipucu.get(did)
+        model.AddHint(var_mi[did], y is not None)
+        if y is None:
+            continue
+        model.AddHint(bas_var[did], zc.dakika(y["baslangic"]))
+        for g, z in gun_var.get(did, {}).items():
+            model.AddHint(z, zc.dakika(y["baslangic"]) // 1440 == g)
+        secili = set(int(x) for x in (y.get("derslik_ids") or []))
+        for dl_id, v in oda_var[did].items():
+            model.AddHint(v, dl_id in secili)
+
+    cozucu = cp_model.CpSolver()
+    cozucu.parameters.max_time_in_seconds = float(sure_sn)
+    cozucu.parameters.num_search_workers = max(1, os.cpu_count() or 1)
+    cozucu.parameters.random_seed = int(tohum)
+
+    def _cozum(c) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """Çözücünün (ya da çözüm geri çağrısının) değerlerinden (yerlestirmeler, yerleşmeyen ders id'leri)."""
+        yerlestirmeler: List[Dict[str, Any]] = []
+        yerlesmeyen: List[int] = []
+        for did in ders_ids:
+            if not c.BooleanValue(var_mi[did]):
+                yerlesmeyen.append(did)
+                continue
+            secili = [(dl_id, kap) for dl_id, kap in derslik_bilgi if c.BooleanValue(oda_var[did][dl_id])]
+            yerlestirmeler.append(zc.yerlestirme(
+                did, c.Value(bas_var[did]), zc.sure(did),
+                _fazla_derslikleri_birak(secili, int(ders_by_id[did].get("ogr_say") or 0)),
+            ))
+        yerlestirmeler.sort(key=lambda y: (y["baslangic"], y["ders_id"]))
+        return yerlestirmeler, yerlesmeyen
+
+    geri_cagri = izleyici = None
+    bitti = threading.Event()
+    if denetim is not None:
+        class _Bildirici(cp_model.CpSolverSolutionCallback):
+            def on_solution_callback(self):
+                yerlesen = sum(self.BooleanValue(p) for p in var_mi.values())
+                if denetim.bildir("kesin", yerlesen, len(ders_ids) - yerlesen,
+                                  lambda: _cozum(self)[0], zorla=True):
+                    self.StopSearch()
+
+        def _izle():
+            # çözüm gelmese de iptal/son zaman denetlenir
+            while not bitti.wait(0.1):
+                if denetim.dur_mu():
+                    cozucu.StopSearch()
+                    return
+
+        geri_cagri = _Bildirici()
+        if hasattr(cozucu, "StopSearch"):  # eski ortools sürümlerinde yok
+            izleyici = threading.Thread(target=_izle, name="kesin_izleyici", daemon=True)
+            izleyici.start()
+    try:
+        durum = cozucu.Solve(model, geri_cagri)
+    finally:
+        bitti.set()
+        if izleyici is not None:
+            izleyici.join()
+
+    if durum not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return acgozlu, [
+            f"Kesin çözücü {sure_sn:g} sn içinde çözüm bulamadı; açgözlü motorun sonucu kullanıldı."
+        ] + acgozlu_uyarilar, fatal
+
+    if sum(cozucu.BooleanValue(p) for p in var_mi.values()) < len(acgozlu):
+        # ipucu tek iş parçacığında her zaman korunmaz; ısıtma çözümünden kötüsü döndürülmez
+        return acgozlu, [
+            f"Kesin çözücü {sure_sn:g} sn içinde açgözlü çözümü iyileştiremedi "
+            f"(üst sınır: {int(cozucu.BestObjectiveBound())} ders); açgözlü motorun sonucu kullanıldı."
+        ] + acgozlu_uyarilar, fatal
+
+    uyarilar: List[str] = []
+    if durum != cp_model.OPTIMAL:
+        uyarilar.append(
+            f"Kesin çözücü süre sınırına ({sure_sn:g} sn) ulaştı; en iyi bulunan çözüm kullanıldı (optimallik kanıtlanmadı)."
+        )
+    yerlestirmeler, yerlesmeyen = _cozum(cozucu)
+    uyarilar.extend(
+        f"Ders {ders_by_id[did].get('kod', '?')} için çakışmasız slot veya uygun/kapasiteli derslik bulunamadı."
+        for did in yerlesmeyen
+    )
+    return yerlestirmeler, uyarilar, False
+
+
+def _fazla_derslikleri_birak(secili: List[Tuple[int, int]], ogr_say: int) -> List[int]:
+    """
+    secili: çözücünün seçtiği [(id, kapasite)], kapasiteye göre büyükten küçüğe.
+    Amaç derslik sayısını içermediği için gereksiz derslikler seçilebilir;
+    toplam kapasite yettiği sürece derslikler en küçükten başlayarak bırakılır.
+    Bırakmak hiçbir kısıtı bozmaz.
+    """
+    kalan = list(secili)
+    toplam = sum(kap for _, kap in kalan)
+    for dl in sorted(secili, key=lambda x: (x[1], x[0])):
+        if len(kalan) > 1 and toplam - dl[1] >= ogr_say:
+            kalan.remove(dl)
+            toplam -= dl[1]
+    return [dl_id for dl_id, _ in kalan]
@@ -0,0 +1,167 @@
+# planlayici/musaitlik.py
+# -*- coding: utf-8 -*-
+"""
+Planlayıcı için müsaitlik indeksleri.
+
+Derslik ve öğrenci zaman çizelgeleri, her sorguda tüm (bas, bit) listesini
+taramak yerine başlangıca göre sıralı tutulur ve bisect ile sorgulanır.
+Öğrenci tarafında iki gerçekleme vardır:
+
+  - "bitset": her öğrenciye bir bit atanır; bir dersin öğrenci kümesi tek bir
+    Python tamsayısıdır (maske). Aynı aralıktaki tüm sınavların öğrencileri
+    tek bir maskede birleşir; "bu küme [bas, bit) aralığında boş mu?" sorusu
+    kesişen her farklı aralık için tek bir AND işlemine iner.
+  - "aralik": öğrenci başına sıralı aralık listesi (bisect). Öğrenci kümeleri
+    küçük, aralık sayısı çok olduğunda tercih edilebilir.
+
+Zaman değerleri karşılaştırılabilir herhangi bir tür olabilir (datetime, dakika
+ofseti vb.); çıkarma işlemi için `sure` değerleri aynı türün farkı olmalıdır.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from typing import Any, Dict, Hashable, Iterable, List, Tuple
+
+
+class AralikIndeksi:
+    """
+    Anahtar (ör. derslik_id) başına [bas, bit) aralıklarını başlangıca göre
+    sıralı tutar. Sorgu, yalnızca bas - en_uzun_sure sonrasında başlayan
+    aralıklara bakar.
+    """
+
+    def __init__(self):
+        self._aralik: Dict[Hashable, List[Tuple[Any, Any]]] = {}
+        self._en_uzun: Dict[Hashable, Any] = {}
+
+    def musait_mi(self, anahtar: Hashable, bas: Any, bit: Any) -> bool:
+        liste = self._aralik.get(anahtar)
+        if not liste:
+            return True
+        en_uzun = self._en_uzun[anahtar]
+        # bit'ten önce başlayan son aralıktan geriye doğru tara
+        j = bisect_left(liste, (bit,)) - 1
+        while j >= 0:
+            b0, b1 = liste[j]
+            if b1 > bas:
+                return False
+            if b0 + en_uzun <= bas:
+                break
+            j -= 1
+        return True
+
+    def ekle(self, anahtar: Hashable, bas: Any, bit: Any) -> None:
+        liste = self._aralik.setdefault(anahtar, [])
+        insort(liste, (bas, bit))
+        sure = bit - bas
+        if anahtar not in self._en_uzun or sure > self._en_uzun[anahtar]:
+            self._en_uzun[anahtar] = sure
+
+
+class OgrenciIndeksi(ABC):
+    """
+    Öğrenci müsaitlik indeksi için küçük API (soyut; eksik metotlu alt sınıf
+    örneklenirken TypeError verir):
+
+      maske(ogr_ids)            -> indeksin kendi temsili (bir kez hesaplanır)
+      musait_mi(maske, bas, bit) -> kümedeki herkes [bas, bit) aralığında boş mu?
+      ekle(maske, bas, bit)      -> kümeyi [bas, bit) aralığında meşgul işaretle
+    """
+
+    @abstractmethod
+    def maske(self, ogr_ids: Iterable[int]) -> Any: ...
+
+    @abstractmethod
+    def musait_mi(self, maske: Any, bas: Any, bit: Any) -> bool: ...
+
+    @abstractmethod
+    def ekle(self, maske: Any, bas: Any, bit: Any) -> None: ...
+
+
+class BitsetOgrenciIndeksi(OgrenciIndeksi):
+    """Öğrenci kümeleri tamsayı bitset; aynı aralıktaki sınavlar tek maskede birleşir."""
+
+    def __init__(self):
+        self._bit_no: Dict[int, int] = {}
+        self._baslar: List[Tuple[Any, Any]] = []      # sıralı (bas, bit) anahtarları
+        self._mesgul: Dict[Tuple[Any, Any], int] = {}  # (bas, bit) -> birleşik maske
+        self._en_uzun: Any = None
+
+    def maske(self, ogr_ids: Iterable[int]) -> int:
+        # bitler önce bir bayt dizisinde toplanır: her öğrenci için büyük bir
+        # tamsayıyı yeniden kurmak (m |= 1 << n) öğrenci sayısıyla karesel büyür
+        bit_no = self._bit_no
+        nolar = []
+        for oid in ogr_ids:
+            oid = int(oid)
+            n = bit_no.get(oid)
+            if n is None:
+                n = bit_no[oid] = len(bit_no)
+            nolar.append(n)
+        if not nolar:
+            return 0
+        tampon = bytearray((max(nolar) >> 3) + 1)
+        for n in nolar:
+            tampon[n >> 3] |= 1 << (n & 7)
+        return int.from_bytes(tampon, "little")
+
+    def musait_mi(self, maske: int, bas: Any, bit: Any) -> bool:
+        if not maske or not self._baslar:
+            return True
+        baslar = self._baslar
+        en_uzun = self._en_uzun
+        j = bisect_left(baslar, (bit,)) - 1
+        while j >= 0:
+            aralik = baslar[j]
+            if aralik[1] > bas and self._mesgul[aralik] & maske:
+                return False
+            if aralik[0] + en_uzun <= bas:
+                break
+            j -= 1
+        return True
+
+    def ekle(self, maske: int, bas: Any, bit: Any) -> None:
+        if not maske:
+            return
+        aralik = (bas, bit)
+        if aralik in self._mesgul:
+            self._mesgul[aralik] |= maske
+            return
+        self._mesgul[aralik] = maske
+        insort(self._baslar, aralik)
+        sure = bit - bas
+        if self._en_uzun is None or sure > self._en_uzun:
+            self._en_uzun = sure
+
+
+class AralikOgrenciIndeksi(OgrenciIndeksi):
+    """Öğrenci başına sıralı aralık listesi (AralikIndeksi üzerine ince katman)."""
+
+    def __init__(self):
+        self._indeks = AralikIndeksi()
+
+    def maske(self, ogr_ids: Iterable[int]) -> Tuple[int, ...]:
+        return tuple(int(o) for o in ogr_ids)
+
+    def musait_mi(self, maske: Tuple[int, ...], bas: Any, bit: Any) -> bool:
+        musait = self._indeks.musait_mi
+        return all(musait(oid, bas, bit) for oid in maske)
+
+    def ekle(self, maske: Tuple[int, ...], bas: Any, bit: Any) -> None:
+        for oid in maske:
+            self._indeks.ekle(oid, bas, bit)
+
+
+OGRENCI_INDEKSLERI = {
+    "bitset": BitsetOgrenciIndeksi,
+    "aralik": AralikOgrenciIndeksi,
+}
+
+
+def ogrenci_indeksi_olustur(tur: str = "bitset") -> OgrenciIndeksi:
+    """'bitset' | 'aralik' → yeni öğrenci indeksi. Bilinmeyen tür ValueError."""
+    try:
+        return OGRENCI_INDEKSLERI[tur]()
+    except KeyError:
+        raise ValueError(f"Bilinmeyen müsaitlik indeksi: {tur!r} (geçerli: {', '.join(OGRENCI_INDEKSLERI)})")
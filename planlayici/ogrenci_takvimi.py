@@ -0,0 +1,62 @@
+# planlayici/ogrenci_takvimi.py
+# -*- coding: utf-8 -*-
+"""
+Öğrenci başına günlük sınav sayacı (gunluk_azami_sinav kısıtı için).
+
+Sayaçlar tek bir uint8 dizisinde tutulur: satırlar günler (tarih_bas'tan
+itibaren gün numarası), sütunlar öğrenciler. Bir dersin öğrenci kümesi
+(kohort) bir kez sütun numaralarına çevrilir; "bu kohortta o gün sınırı
+dolmuş öğrenci var mı?" sorusu tek bir satırdan vektörel toplama + max'tır,
+yerleştirme/kaldırma da tek bir indeksli toplama. Python'da öğrenci başına
+döngü yoktur.
+
+Bellek: gün sayısı × öğrenci sayısı bayt (ör. 30 gün × 20 000 öğrenci ≈ 600 KB).
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# uint8 sayaç: günlük sınır en fazla bu kadar olabilir
+AZAMI_GUNLUK_SINIR = 255
+
+
+class OgrenciTakvimi:
+    """
+    dersler: tüm derslerin öğrenci kümeleri (ogr_ids) buradan numaralanır.
+    gun_sayisi: ufuktaki gün sayısı; azami: bir öğrencinin bir gündeki en çok sınav sayısı.
+    """
+
+    def __init__(self, dersler: Iterable[Dict[str, Any]], gun_sayisi: int, azami: int):
+        if not 1 <= int(azami) <= AZAMI_GUNLUK_SINIR:
+            raise ValueError(f"Günlük azami sınav sayısı 1 ile {AZAMI_GUNLUK_SINIR} arasında olmalı: {azami!r}")
+        self.azami = int(azami)
+        self._no: Dict[int, int] = {}
+        for d in dersler:
+            for oid in d.get("ogr_ids") or ():
+                self._no.setdefault(int(oid), len(self._no))
+        self._sayac = np.zeros((max(1, int(gun_sayisi)), len(self._no)), dtype=np.uint8)
+
+    def kohort(self, ogr_ids: Iterable[int]) -> np.ndarray:
+        """Öğrenci id'leri → sayaç sütun numaraları (bir kez hesaplanır, ders başına saklanır)."""
+        no = self._no
+        return np.fromiter((no[int(o)] for o in ogr_ids), dtype=np.intp)
+
+    def uygun_mu(self, kohort: np.ndarray, gun: int) -> bool:
+        """Kohorttaki herkesin o gün bir sınava daha yeri var mı?"""
+        return not len(kohort) or int(self._sayac[gun, kohort].max()) < self.azami
+
+    def ekle(self, kohort: np.ndarray, gun: int) -> None:
+        self._sayac[gun, kohort] += 1
+
+    def cikar(self, kohort: np.ndarray, gun: int) -> None:
+        self._sayac[gun, kohort] -= 1
+
+
+def ogrenci_takvimi_olustur(k: Dict[str, Any], dersler: List[Dict[str, Any]]) -> Optional[OgrenciTakvimi]:
+    """k["gunluk_azami_sinav"] verilmemişse None (kısıt yok; motorlar kontrolü atlar)."""
+    azami = k.get("gunluk_azami_sinav")
+    if azami is None:
+        return None
+    return OgrenciTakvimi(dersler, (k["tarih_bit"] - k["tarih_bas"]).days + 1, azami)
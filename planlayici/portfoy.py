@@ -0,0 +1,269 @@
+# planlayici/portfoy.py
+# -*- coding: utf-8 -*-
+"""
+Süreç havuzunda paralel planlama portföyü (planla(..., motor="portfoy")).
+
+Açgözlü ve graf motorları ders sırasına duyarlıdır; tek bir sıralamanın
+kaçırdığı yerleşimi bir başkası bulabilir. Portföy aynı girdiyi farklı
+varyantlarla (motor + ders sıralaması + tohum) çözer ve puanı en iyi olan
+sonucu döndürür:
+
+  acgozlu/ogr_say   planla'nın varsayılanı (büyük dersler önce)
+  graf/dsatur       graf motoru
+  acgozlu/derece    çakışma grafında ağırlıklı derecesi büyük olan önce
+  acgozlu/sure      sınavı uzun süren önce
+  acgozlu/rastgele  ogr_say × U(0.8, 1.2) — her tohum ayrı bir sıralama
+
+Her işçi süreç girdiyi ve çakışma grafını havuz kurulurken bir kez alır
+(salt okunur paylaşılan yapı); görevler yalnızca küçük Varyant kayıtlarıdır.
+Puan yerel aramanın amacıyla aynıdır ve sözlük sırasıyla karşılaştırılır:
+(yerleşemeyen ders, yakınlık cezası) — küçük daha iyi. Eşit puanda varyant
+listesindeki sıra belirleyicidir.
+
+Erken durma da varyant sırasına bağlıdır, bitiş sırasına değil: puanı
+`hedef`e ulaşan (varsayılan: her şey yerleşti, ceza yok) ilk varyant j ve
+ondan önceki tüm varyantlar bitince kalanlar iptal edilir ve en iyi sonuç
+0..j arasından seçilir — sıralı çalıştırmanın seçeceği sonucun aynısı.
+Böylece aynı girdi ve tohumla sonuç işçi sayısından ve süreçlerin bitiş
+sırasından bağımsızdır. Yalnızca denetim (iptal/son zaman) ile durdurulan
+çalıştırmalar, o ana kadar biten varyantlara bağlı olduğundan
+belirlenimci değildir.
+"""
+from __future__ import annotations
+
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from planner import _acgozlu_planla, _getv
+from planlayici.cakisma_grafi import agirlikli_derece, cakisma_grafi_olustur
+from planlayici.denetim import PlanDenetimi
+from planlayici.graf_motoru import graf_ile_planla
+from planlayici.yerel_arama import _Durum, yerel_arama
+from planlayici.zaman_cizelgesi import ZamanCizelgesi
+
+# Varyantları çalıştıran süreç sayısı (None: işlemci sayısı, 1: sıralı)
+ISCI_SAYISI: Optional[int] = None
+VARSAYILAN_VARYANT_SAYISI = 8
+
+Puan = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class Varyant:
+    """Tek bir portföy denemesi. iyilestirme_sn > 0 ise sonuç yerel aramayla iyileştirilir."""
+    motor: str = "acgozlu"          # acgozlu | graf
+    siralama: str = "ogr_say"       # ogr_say | derece | sure | rastgele (yalnızca acgozlu)
+    tohum: int = 0
+    iyilestirme_sn: float = 0.0
+
+    @property
+    def ad(self) -> str:
+        if self.motor == "graf":
+            ad = "graf/dsatur"
+        else:
+            ad = f"{self.motor}/{self.siralama}"
+            if self.siralama == "rastgele":
+                ad += f"#{self.tohum}"
+        if self.iyilestirme_sn > 0:
+            ad += "+tavlama"
+        return ad
+
+
+def varsayilan_varyantlar(sayi: int = VARSAYILAN_VARYANT_SAYISI, tohum: int = 0,
+                          iyilestirme_sn: float = 0.0) -> List[Varyant]:
+    """Sabit dört varyant, kalanı farklı tohumlu rastgele sıralamalar (en az 4)."""
+    sabit = [
+        Varyant("acgozlu", "ogr_say", tohum, iyilestirme_sn),
+        Varyant("graf", "ogr_say", tohum, iyilestirme_sn),
+        Varyant("acgozlu", "derece", tohum, iyilestirme_sn),
+        Varyant("acgozlu", "sure", tohum, iyilestirme_sn),
+    ]
+    return sabit + [Varyant("acgozlu", "rastgele", tohum + i, iyilestirme_sn)
+                    for i in range(1, max(0, sayi - len(sabit)) + 1)]
+
+
+# ---------------- işçi tarafı ----------------
+_ORTAK: Dict[str, Any] = {}
+
+
+def _isci_baslat(k: Dict[str, Any], dersler: List[Dict[str, Any]],
+                 derslikler: List[Dict[str, Any]], musaitlik: str) -> None:
+    """Havuz başlatıcısı: girdiyi saklar, çakışma grafını bir kez kurar."""
+    graf = cakisma_grafi_olustur(dersler)
+    _ORTAK.clear()
+    _ORTAK.update(k=k, dersler=dersler, derslikler=derslikler, musaitlik=musaitlik,
+                  graf=graf, derece=agirlikli_derece(graf))
+
+
+def _sirala(v: Varyant) -> List[Dict[str, Any]]:
+    dersler = _ORTAK["dersler"]
+    ogr = lambda d: int(d.get("ogr_say") or 0)
+    if v.siralama == "derece":
+        derece = _ORTAK["derece"]
+        anahtar = lambda d: (-derece.get(int(d["id"]), 0), -ogr(d), int(d["id"]))
+    elif v.siralama == "sure":
+        zc = ZamanCizelgesi(_ORTAK["k"])
+        anahtar = lambda d: (-zc.sure(int(d["id"])), -ogr(d), int(d["id"]))
+    elif v.siralama == "rastgele":
+        rnd = random.Random(v.tohum)
+        carpan = {int(d["id"]): rnd.uniform(0.8, 1.2) for d in sorted(dersler, key=lambda d: int(d["id"]))}
+        anahtar = lambda d: (-ogr(d) * carpan[int(d["id"])], int(d["id"]))
+    else:
+        raise ValueError(f"Bilinmeyen sıralama: {v.siralama!r} (geçerli: ogr_say, derece, sure, rastgele)")
+    return sorted(dersler, key=anahtar)
+
+
+def cizelge_puani(k: Dict[str, Any], dersler: List[Dict[str, Any]], derslikler: List[Any],
+                  yerlestirmeler: List[Dict[str, Any]],
+                  graf: Optional[Dict[int, Dict[int, int]]] = None) -> Puan:
+    """(yerleşemeyen ders, yakınlık cezası); ceza yerel aramanın amacındaki ağırlıklarla hesaplanır."""
+    d = _Durum(k, dersler, derslikler, graf)
+    d.yukle(yerlestirmeler)
+    return d.yerlesmeyen, d.ceza_toplam
+
+
+def _varyant_calistir(v: Varyant) -> Tuple[List[Dict[str, Any]], List[str], bool, Puan, float]:
+    """Bir varyantı çözer → (yerlestirmeler, uyarilar, fatal, puan, sure_sn). Süreç havuzunda da çalışır."""
+    t0 = perf_counter()
+    k, dersler, derslikler, graf = _ORTAK["k"], _ORTAK["dersler"], _ORTAK["derslikler"], _ORTAK["graf"]
+    if v.motor == "graf":
+        y, uyarilar, fatal = graf_ile_planla(k, dersler, derslikler, graf=graf)
+    elif v.motor == "acgozlu":
+        if v.siralama == "ogr_say":
+            y, uyarilar, fatal = _acgozlu_planla(k, dersler, derslikler, _ORTAK["musaitlik"])
+        else:
+            y, uyarilar, fatal = _acgozlu_planla(k, _sirala(v), derslikler, _ORTAK["musaitlik"], sirali=True)
+    else:
+        raise ValueError(f"Portföyde desteklenmeyen motor: {v.motor!r} (geçerli: acgozlu, graf)")
+    if v.iyilestirme_sn > 0 and not fatal:
+        y, uyarilar, _ = yerel_arama(k, dersler, derslikler, y, sure_sn=v.iyilestirme_sn,
+                                     tohum=v.tohum, graf=graf)
+    puan = (len(dersler), 0) if fatal else cizelge_puani(k, dersler, derslikler, y, graf)
+    return y, uyarilar, fatal, puan, perf_counter() - t0
+
+
+# ---------------- portföy ----------------
+def portfoy_planla(k: Dict[str, Any],
+                   dersler: List[Dict[str, Any]],
+                   derslikler: List[Any],
+                   varyantlar: Optional[List[Varyant]] = None,
+                   musaitlik: str = "bitset",
+                   tohum: int = 0,
+                   isci_sayisi: Optional[int] = None,
+                   hedef: Puan = (0, 0),
+                   ilerleme: Optional[Callable[[int, int, str, Puan], None]] = None,
+                   denetim: Optional[PlanDenetimi] = None,
+                   ) -> Tuple[List[Dict[str, Any]], List[str], bool, Dict[str, Any]]:
+    """
+    k: planner._kisitlari_coz çıktısı; dersler zaten dahil_ders_ids ile süzülmüş olmalı.
+    varyantlar: denenecek varyantlar (verilmezse varsayilan_varyantlar(tohum=tohum))
+    isci_sayisi: süreç sayısı (varsayılan ISCI_SAYISI, o da None ise işlemci sayısı);
+      1 ya da havuz kurulamazsa varyantlar sırayla çalışır.
+    hedef: bu puana ulaşan ilk varyant ve öncekilerin hepsi bitince kalanlar iptal edilir.
+    ilerleme: her varyant bitince (tamamlanan, toplam, en_iyi_ad, en_iyi_puan) ile çağrılır.
+    denetim: her varyant bitince en iyi sonuçla bildirilir; iptal/son zaman varyantlar
+      beklenirken de denetlenir. Durunca en iyi sonuç döner (en az bir varyant her
+      zaman tamamlanır; süreçte çalışmakta olan varyantlar yarıda kesilmez).
+    Dönüş: (yerlestirmeler, uyarilar, fatal, rapor) — rapor: secilen, puan,
+      sonuclar [(ad, puan, sure_sn)], iptal (çalıştırılmayan varyant sayısı)
+    """
+    if varyantlar is None:
+        varyantlar = varsayilan_varyantlar(tohum=tohum)
+    if not varyantlar:
+        raise ValueError("Portföyde en az bir varyant olmalı.")
+    # sqlite satırları süreçler arasında taşınamaz; yalnızca motorların okuduğu alanlar gider
+    # ("dolu": başka bölümlerin ortak dersliklerdeki sınavları, (baslangic, bitis) çiftleri)
+    derslikler = [{"id": int(_getv(dl, "id")), "kapasite": int(_getv(dl, "kapasite", 0) or 0),
+                   "dolu": tuple((bas, bit) for bas, bit in _getv(dl, "dolu") or ())}
+                  for dl in derslikler]
+    girdi = (k, dersler, derslikler, musaitlik)
+
+    en_iyi: Optional[Tuple[Puan, int]] = None
+    sonuclar: Dict[int, Tuple[List[Dict[str, Any]], List[str], bool, Puan, float]] = {}
+    biten_on_ek = 0               # 0..biten_on_ek-1 varyantlarının hepsi bitti
+    kesim: Optional[int] = None   # hedefe ulaşan ilk varyant (erken durma)
+
+    def _topla(i: int, sonuc) -> bool:
+        nonlocal en_iyi, biten_on_ek, kesim
+        sonuclar[i] = sonuc
+        if en_iyi is None or (sonuc[3], i) < en_iyi:
+            en_iyi = (sonuc[3], i)
+        if ilerleme is not None:
+            ilerleme(len(sonuclar), len(varyantlar), varyantlar[en_iyi[1]].ad, en_iyi[0])
+        if denetim is not None and denetim.bildir(
+                "portfoy", len(dersler) - en_iyi[0][0], en_iyi[0][0],
+                lambda: list(sonuclar[en_iyi[1]][0]), zorla=True):
+            return True
+        # bitiş sırasıyla değil varyant sırasıyla: önceki varyantlar bitmeden durulmaz
+        while biten_on_ek in sonuclar:
+            if sonuclar[biten_on_ek][3] <= hedef:
+                kesim = biten_on_ek
+                return True
+            biten_on_ek += 1
+        return False
+
+    isci_sayisi = isci_sayisi or ISCI_SAYISI or os.cpu_count() or 1
+    paralel = False
+    if isci_sayisi > 1 and len(varyantlar) > 1:
+        paralel = _paralel_calistir(girdi, varyantlar, min(isci_sayisi, len(varyantlar)), _topla,
+                                    dur=denetim.dur_mu if denetim is not None else None)
+        if not paralel:
+            sonuclar.clear()
+            en_iyi, biten_on_ek, kesim = None, 0, None
+    if not paralel:
+        _isci_baslat(*girdi)
+        try:
+            for i, v in enumerate(varyantlar):
+                if _topla(i, _varyant_calistir(v)):
+                    break
+        finally:
+            _ORTAK.clear()
+
+    if kesim is not None:
+        # hedefe ulaşan ilk varyanttan sonra bitenler seçime katılmaz
+        en_iyi = min((sonuclar[j][3], j) for j in range(kesim + 1))
+    puan, i = en_iyi
+    y, uyarilar, fatal, _, _ = sonuclar[i]
+    rapor = {
+        "secilen": varyantlar[i].ad,
+        "puan": puan,
+        "sonuclar": [(varyantlar[j].ad, s[3], round(s[4], 3)) for j, s in sorted(sonuclar.items())],
+        "iptal": len(varyantlar) - len(sonuclar),
+    }
+    return y, uyarilar, fatal, rapor
+
+
+def _paralel_calistir(girdi: Tuple[Any, ...], varyantlar: List[Varyant], isci_sayisi: int,
+                      topla: Callable[[int, Any], bool],
+                      dur: Optional[Callable[[], bool]] = None) -> bool:
+    """
+    Varyantları süreç havuzunda çalıştırır; sonuçlar bitiş sırasıyla `topla`ya gider.
+    dur() True dönerse (en az bir sonuç geldiyse) kalanlar iptal edilir. Havuz kurulamazsa False.
+    """
+    try:
+        havuz = ProcessPoolExecutor(max_workers=isci_sayisi, initializer=_isci_baslat, initargs=girdi)
+    except (OSError, NotImplementedError):
+        return False
+    try:
+        bekleyen: Dict[Future, int] = {havuz.submit(_varyant_calistir, v): i for i, v in enumerate(varyantlar)}
+        while bekleyen:
+            bitenler, _ = wait(bekleyen, timeout=None if dur is None else 0.1, return_when=FIRST_COMPLETED)
+            for f in sorted(bitenler, key=bekleyen.__getitem__):
+                if topla(bekleyen.pop(f), f.result()):
+                    for kalan in bekleyen:
+                        kalan.cancel()
+                    return True
+            if dur is not None and len(bekleyen) < len(varyantlar) and dur():
+                for kalan in bekleyen:
+                    kalan.cancel()
+                return True
+        return True
+    except (OSError, BrokenProcessPool):
+        return False
+    finally:
+        havuz.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,432 @@
+# planlayici/yerel_arama.py
+# -*- coding: utf-8 -*-
+"""
+Açgözlü planın ardından çalışan yerel arama (benzetimli tavlama).
+
+Başlangıç çözümü herhangi bir motorun çıktısıdır (planla(..., iyilestirme_sn=...)).
+Sert kısıtlar her adımda korunur: öğrenci çakışması yok (iki sınavı arasında
+en az bekleme_dk), günlük sınav sınırı aşılmaz, derslik çakışması yok,
+kapasite yeter, tek_seans ise aynı anda tek sınav. Amaç (küçük daha iyi):
+
+  W_YERLESMEYEN × yerleşemeyen ders sayısı
+  + Σ ortak öğrenci × (W_AYNI_GUN  aynı gündeki her sınav çifti için
+                       + W_ARDISIK aynı günde art arda iki slot için)
+
+Çözüm tamsayılarla tutulur: her ders bir slot indeksi (-1: yerleşmemiş) ve
+bir ya da (tek derslik yetmiyorsa) birkaç derslik alır; slot başlangıçları dakika cinsindendir. Her (ders, slot)
+için iki tablo artımlı olarak güncellenir:
+
+  engel[c][s]: c, s'ye konsa zamanı çakışacak (ya da bekleme süresinden yakın
+               olacak) yerleşik komşu sayısı
+  yakin[c][s]: c, s'deyken yerleşik komşularıyla yakınlık cezası
+
+Böylece bir hamlenin uygunluğu ve maliyet farkı O(1) okunur; tablolar yalnızca
+kabul edilen hamlelerde taşınan dersin komşuları için güncellenir.
+
+Hamleler: bir dersi rastgele bir slota taşı, iki dersin slotlarını değiştir,
+yerleşmemiş bir dersi rastgele bir slota zorla koyup çakıştığı komşuları en
+ucuz uygun slotlara yeniden yerleştir (ejeksiyon). Aynı `tohum` ve
+`azami_adim` aynı sonucu verir; yalnızca süre sınırı verilirse sonuç makine
+hızına bağlıdır.
+"""
+from __future__ import annotations
+
+import math
+import random
+from bisect import bisect_left, bisect_right
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from planner import _derslik_bilgisi, _derslik_paketle, _derslik_zamani
+from planlayici.cakisma_grafi import cakisma_grafi_olustur
+from planlayici.denetim import PlanDenetimi
+from planlayici.ogrenci_takvimi import ogrenci_takvimi_olustur
+from planlayici.zaman_cizelgesi import ZamanCizelgesi
+
+W_YERLESMEYEN = 1_000_000
+W_AYNI_GUN = 1
+W_ARDISIK = 4
+
+
+class _Durum:
+    """Slot/derslik ataması ve artımlı engel/yakınlık tabloları."""
+
+    def __init__(self, k: Dict[str, Any], dersler: List[Dict[str, Any]], derslikler: List[Any],
+                 graf: Optional[Dict[int, Dict[int, int]]] = None):
+        self.ders_ids: List[int] = sorted(int(d["id"]) for d in dersler)
+        self.sira: Dict[int, int] = {did: i for i, did in enumerate(self.ders_ids)}
+        ders_by_id = {int(d["id"]): d for d in dersler}
+        self.dersler = [ders_by_id[did] for did in self.ders_ids]
+        n = len(self.ders_ids)
+
+        # slotlar: tarih_bas gece yarısından itibaren dakika, kronolojik
+        self.zc = ZamanCizelgesi(k)
+        self.bas: List[int] = sorted(self.zc.baslar)
+        gun = [b // 1440 for b in self.bas]
+        S = self.slot_sayisi = len(self.bas)
+        # aynı günün slotları bitişik indekslerdir: [gun_bas[s], gun_son[s])
+        self.gun_bas: List[int] = [bisect_left(gun, g) for g in gun]
+        self.gun_son: List[int] = [bisect_right(gun, g) for g in gun]
+
+        self.sure: List[int] = [self.zc.sure(did) for did in self.ders_ids]
+        # d dakikalık bir sınavla s'deki x dakikalık sınav çakışır ⇔ t ∈ [lo[d][s], hi[x][s])
+        sureler = set(self.sure)
+        self.lo_tab: Dict[int, List[int]] = {d: [bisect_right(self.bas, b - d) for b in self.bas] for d in sureler}
+        self.hi_tab: Dict[int, List[int]] = {d: [bisect_left(self.bas, b + d) for b in self.bas] for d in sureler}
+        self.lo_en_uzun: List[int] = self.lo_tab[max(sureler)] if sureler else []
+        # öğrenci çakışması için aynı tablolar, iki yana bekleme süresi eklenmiş
+        bekleme = int(k["bekleme_dk"])
+        if bekleme:
+            self.ogr_lo: Dict[int, List[int]] = {d: [bisect_right(self.bas, b - d - bekleme) for b in self.bas] for d in sureler}
+            self.ogr_hi: Dict[int, List[int]] = {d: [bisect_left(self.bas, b + d + bekleme) for b in self.bas] for d in sureler}
+        else:
+            self.ogr_lo, self.ogr_hi = self.lo_tab, self.hi_tab
+
+        if graf is None:
+            graf = cakisma_grafi_olustur(dersler)
+        self.komsu: List[List[Tuple[int, int]]] = [
+            sorted((self.sira[m], w) for m, w in graf.get(did, {}).items() if m in self.sira)
+            for did in self.ders_ids
+        ]
+        self.ogr_say: List[int] = [int(d.get("ogr_say") or 0) for d in self.dersler]
+
+        # her ders için tek başına yeten derslikler, küçükten büyüğe (en iyi uyum);
+        # hiçbiri yetmiyorsa boş dersliklerin birleşimi aranır
+        bilgi = sorted(_derslik_bilgisi(derslikler), key=lambda x: (x[1], x[0]))
+        self.oda_ids: List[int] = [dl_id for dl_id, _ in bilgi]
+        self.kap: List[int] = [kap for _, kap in bilgi]
+        self.oda_sira: Dict[int, int] = {dl_id: i for i, dl_id in enumerate(self.oda_ids)}
+        self.uygun_oda: List[List[int]] = [
+            [r for r, kap in enumerate(self.kap) if kap >= self.ogr_say[c]] for c in range(n)
+        ]
+        self.toplam_kap = sum(self.kap)
+        # başka bölümlerin ortak derslikteki sınavları (derslik id'siyle, dakika)
+        self.dis_dolu = _derslik_zamani(self.zc, derslikler)
+
+        self.tek_seans: bool = k["tek_seans"]
+        self.takvim = ogrenci_takvimi_olustur(k, self.dersler)
+        self.kohort = [self.takvim.kohort(d.get("ogr_ids") or ()) for d in self.dersler] if self.takvim else []
+        self.gun_no: List[int] = [b // 1440 for b in self.bas]
+        self.slot: List[int] = [-1] * n
+        self.oda: List[Tuple[int, ...]] = [()] * n
+        self.slot_dersleri: List[set] = [set() for _ in range(S)]
+        self.oda_slot: List[Dict[int, int]] = [{} for _ in self.oda_ids]
+        self.engel: List[List[int]] = [[0] * S for _ in range(n)]
+        self.yakin: List[List[int]] = [[0] * S for _ in range(n)]
+        self.yerlesmeyen = n
+        self.ceza_toplam = 0
+
+    def amac(self) -> int:
+        return W_YERLESMEYEN * self.yerlesmeyen + self.ceza_toplam
+
+    # ---------------- uygunluk ----------------
+    def _oda_bos(self, r: int, s: int, hi: int, haric: Tuple[int, ...], b1: int) -> bool:
+        bas, sure = self.bas, self.sure
+        b0 = bas[s]
+        if not self.dis_dolu.musait_mi(self.oda_ids[r], b0, b1):
+            return False
+        dolu = self.oda_slot[r]
+        for t in range(self.lo_en_uzun[s], hi):
+            e = dolu.get(t)
+            if e is not None and e not in haric and b0 < bas[t] + sure[e]:
+                return False
+        return True
+
+    def gun_uygun(self, c: int, s: int) -> bool:
+        """Günlük sınav sınırı: c'nin öğrencilerinin s'nin gününde bir sınava daha yeri var mı?"""
+        return self.takvim is None or self.takvim.uygun_mu(self.kohort[c], self.gun_no[s])
+
+    def derslik_bul(self, c: int, s: int, haric: Tuple[int, ...] = (),
+                    tercih: Tuple[int, ...] = ()) -> Optional[Tuple[int, ...]]:
+        """
+        Öğrenci çakışması dışındaki sert kısıtlar (tek_seans, derslik): c, s'ye
+        `haric` dersleri yokmuş gibi konabiliyorsa derslik sıraları, değilse None.
+        `tercih` verilmişse, boşsa ve kapasitesi yetiyorsa önce o derslikler kullanılır.
+        """
+        bas, sure = self.bas, self.sure
+        b0 = bas[s]
+        b1 = b0 + sure[c]
+        hi = self.hi_tab[sure[c]][s]
+        if self.tek_seans:
+            for t in range(self.lo_en_uzun[s], hi):
+                for e in self.slot_dersleri[t]:
+                    if e not in haric and b0 < bas[t] + sure[e]:
+                        return None
+        if tercih and sum(self.kap[r] for r in tercih) >= self.ogr_say[c] \
+                and all(self._oda_bos(r, s, hi, haric, b1) for r in tercih):
+            return tuple(tercih)
+        for r in self.uygun_oda[c]:
+            if self._oda_bos(r, s, hi, haric, b1):
+                return (r,)
+        if self.uygun_oda[c] and len(self.uygun_oda[c]) == len(self.kap):
+            return None  # her derslik tek başına yeterdi; hepsi dolu
+        bos = [(r, self.kap[r]) for r in range(len(self.kap) - 1, -1, -1) if self._oda_bos(r, s, hi, haric, b1)]
+        secilen = _derslik_paketle(bos, self.ogr_say[c])
+        return tuple(secilen) if secilen is not None else None
+
+    # ---------------- değişiklik ----------------
+    def _komsulari_guncelle(self, c: int, s: int, yon: int) -> None:
+        """c'nin s'ye konması (yon=+1) / s'den kalkması (yon=-1) komşu tablolarına işlenir."""
+        hi = self.ogr_hi[self.sure[c]][s]
+        g0, g1 = self.gun_bas[s], self.gun_son[s]
+        engel, yakin, lo_tab, sure = self.engel, self.yakin, self.ogr_lo, self.sure
+        for m, w in self.komsu[c]:
+            em = engel[m]
+            for t in range(lo_tab[sure[m]][s], hi):
+                em[t] += yon
+            ym = yakin[m]
+            a = yon * w * W_AYNI_GUN
+            for t in range(g0, g1):
+                ym[t] += a
+            a = yon * w * W_ARDISIK
+            if s - 1 >= g0:
+                ym[s - 1] += a
+            if s + 1 < g1:
+                ym[s + 1] += a
+
+    def koy(self, c: int, s: int, odalar: Tuple[int, ...]) -> None:
+        self.ceza_toplam += self.yakin[c][s]
+        self.slot[c], self.oda[c] = s, odalar
+        self.slot_dersleri[s].add(c)
+        for r in odalar:
+            self.oda_slot[r][s] = c
+        self.yerlesmeyen -= 1
+        if self.takvim is not None:
+            self.takvim.ekle(self.kohort[c], self.gun_no[s])
+        self._komsulari_guncelle(c, s, +1)
+
+    def kaldir(self, c: int) -> Tuple[int, Tuple[int, ...]]:
+        s, odalar = self.slot[c], self.oda[c]
+        self.slot[c], self.oda[c] = -1, ()
+        self.slot_dersleri[s].discard(c)
+        for r in odalar:
+            del self.oda_slot[r][s]
+        self.ceza_toplam -= self.yakin[c][s]
+        self.yerlesmeyen += 1
+        if self.takvim is not None:
+            self.takvim.cikar(self.kohort[c], self.gun_no[s])
+        self._komsulari_guncelle(c, s, -1)
+        return s, odalar
+
+    def en_ucuz_yerlestir(self, c: int) -> bool:
+        """Yerleşmemiş c'yi yakınlık cezası en küçük uygun slota koyar."""
+        ec, yc = self.engel[c], self.yakin[c]
+        for s in sorted((s for s in range(self.slot_sayisi) if ec[s] == 0), key=lambda s: (yc[s], s)):
+            if not self.gun_uygun(c, s):
+                continue
+            r = self.derslik_bul(c, s)
+            if r is not None:
+                self.koy(c, s, r)
+                return True
+        return False
+
+    # ---------------- dönüşüm ----------------
+    def yukle(self, yerlestirmeler: List[Dict[str, Any]]) -> None:
+        """Başlangıç çözümü; slot listesinde olmayan ya da artık uymayan yerleşimler yerleşmemiş sayılır."""
+        slot_no = {b: i for i, b in enumerate(self.bas)}
+        for y in sorted(yerlestirmeler, key=lambda y: (y["baslangic"], int(y["ders_id"]))):
+            c = self.sira.get(int(y["ders_id"]))
+            if c is None or self.slot[c] >= 0 or y.get("baslangic") is None:
+                continue
+            s = slot_no.get(self.zc.dakika(y["baslangic"]))
+            if s is None or self.engel[c][s] or not self.gun_uygun(c, s):
+                continue
+            dl_ids = [int(x) for x in (y.get("derslik_ids") or [])]
+            tercih = tuple(self.oda_sira[x] for x in dl_ids) if all(x in self.oda_sira for x in dl_ids) else ()
+            r = self.derslik_bul(c, s, tercih=tercih)
+            if r is not None:
+                self.koy(c, s, r)
+
+    def yerlestirmeler(self, slot: List[int], oda: List[Tuple[int, ...]]) -> List[Dict[str, Any]]:
+        out = []
+        for c, s in enumerate(slot):
+            if s < 0:
+                continue
+            out.append(self.zc.yerlestirme(self.ders_ids[c], self.bas[s], self.sure[c],
+                                           [self.oda_ids[r] for r in oda[c]]))
+        out.sort(key=lambda y: (y["baslangic"], y["ders_id"]))
+        return out
+
+
+def _kabul(fark: int, sicak: float, rnd: random.Random) -> bool:
+    return fark <= 0 or rnd.random() < math.exp(-fark / sicak)
+
+
+def _tasi(d: _Durum, c: int, rnd: random.Random, sicak: float) -> bool:
+    s0 = d.slot[c]
+    s = rnd.randrange(d.slot_sayisi)
+    if s == s0 or d.engel[c][s]:
+        return False
+    if d.gun_no[s] != d.gun_no[s0] and not d.gun_uygun(c, s):
+        return False
+    r = d.derslik_bul(c, s, haric=(c,))
+    if r is None or not _kabul(d.yakin[c][s] - d.yakin[c][s0], sicak, rnd):
+        return False
+    d.kaldir(c)
+    d.koy(c, s, r)
+    return True
+
+
+def _degistir(d: _Durum, c: int, rnd: random.Random, sicak: float) -> bool:
+    e = rnd.randrange(len(d.slot))
+    sc, se = d.slot[c], d.slot[e]
+    if e == c or se < 0 or se == sc:
+        return False
+    # karşılıklı çakışma: c se'ye, e sc'ye giderken birbirinin eski yerini engel sayar
+    w = next((w for m, w in d.komsu[c] if m == e), 0)
+    lo, hi = d.ogr_lo, d.ogr_hi
+    ortusur_c = 1 if w and lo[d.sure[c]][se] <= se < hi[d.sure[e]][se] else 0
+    ortusur_e = 1 if w and lo[d.sure[e]][sc] <= sc < hi[d.sure[c]][sc] else 0
+    if d.engel[c][se] - ortusur_c or d.engel[e][sc] - ortusur_e:
+        return False
+    if w and lo[d.sure[e]][se] <= sc < hi[d.sure[c]][se]:
+        return False  # yeni yerlerinde birbirleriyle çakışırlar
+
+    def _p(a: int, b: int) -> int:
+        if d.gun_bas[a] != d.gun_bas[b]:
+            return 0
+        return w * (W_AYNI_GUN + (W_ARDISIK if abs(a - b) == 1 else 0))
+
+    fark = (d.yakin[c][se] - _p(se, se)) - (d.yakin[c][sc] - _p(sc, se)) \
+        + (d.yakin[e][sc] - _p(sc, sc)) - (d.yakin[e][se] - _p(se, sc))
+    if not _kabul(fark, sicak, rnd):
+        return False
+    rc = d.derslik_bul(c, se, haric=(c, e), tercih=d.oda[e])
+    if rc is None:
+        return False
+    _, r_c = d.kaldir(c)
+    _, r_e = d.kaldir(e)
+    if not d.gun_uygun(c, se):
+        d.koy(c, sc, r_c)
+        d.koy(e, se, r_e)
+        return False
+    d.koy(c, se, rc)
+    re_ = d.derslik_bul(e, sc, tercih=r_c) if d.gun_uygun(e, sc) else None
+    if re_ is None:
+        d.kaldir(c)
+        d.koy(c, sc, r_c)
+        d.koy(e, se, r_e)
+        return False
+    d.koy(e, sc, re_)
+    return True
+
+
+def _zorla(d: _Durum, c: int, rnd: random.Random, sicak: float) -> bool:
+    """Yerleşmemiş c'yi rastgele slota koy; çakıştığı komşuları çıkarıp en ucuz yerlere taşı."""
+    s = rnd.randrange(d.slot_sayisi)
+    lo = d.ogr_lo
+    hi_c = d.ogr_hi[d.sure[c]][s]
+    cikan = [m for m, _ in d.komsu[c] if d.slot[m] >= 0 and lo[d.sure[m]][s] <= d.slot[m] < hi_c]
+    r = d.derslik_bul(c, s, haric=tuple(cikan))
+    if r is None:
+        return False
+    onceki = d.amac()
+    eski = [(m, d.slot[m], d.oda[m]) for m in cikan]
+    for m in cikan:
+        d.kaldir(m)
+    if not d.gun_uygun(c, s):
+        for m, sm, rm in eski:
+            d.koy(m, sm, rm)
+        return False
+    d.koy(c, s, r)
+    for m in sorted(cikan, key=lambda m: (-d.ogr_say[m], m)):
+        d.en_ucuz_yerlestir(m)
+    if _kabul(d.amac() - onceki, sicak, rnd):
+        return True
+    for m in cikan:
+        if d.slot[m] >= 0:
+            d.kaldir(m)
+    d.kaldir(c)
+    for m, sm, rm in eski:
+        d.koy(m, sm, rm)
+    return False
+
+
+def yerel_arama(k: Dict[str, Any],
+                dersler: List[Dict[str, Any]],
+                derslikler: List[Any],
+                baslangic: List[Dict[str, Any]],
+                sure_sn: float = 5.0,
+                tohum: int = 0,
+                azami_adim: Optional[int] = None,
+                sicaklik: Optional[float] = None,
+                graf: Optional[Dict[int, Dict[int, int]]] = None,
+                denetim: Optional[PlanDenetimi] = None) -> Tuple[List[Dict[str, Any]], List[str], Dict[str, Any]]:
+    """
+    k: planner._kisitlari_coz çıktısı; dersler zaten dahil_ders_ids ile süzülmüş olmalı.
+    baslangic: bir motorun yerleştirmeleri (iyileştirilecek çözüm)
+    sure_sn / azami_adim: hangisi önce dolarsa arama durur; azami_adim verilirse
+      soğuma adım sayısına göre ilerler ve sonuç tohumla tekrarlanabilir olur.
+    sicaklik: başlangıç sıcaklığı (verilmezse ortalama kenar ağırlığından)
+    graf: önceden kurulmuş çakışma grafı (verilmezse derslerden kurulur)
+    denetim: 1024 adımda bir en iyi çözümle bildirilir; durursa en iyi çözüm döner
+    Dönüş: (yerlestirmeler, uyarilar, istatistik) — istatistik: adim, kabul,
+      sure_sn, baslangic_amac, son_amac, yerlesmeyen
+    """
+    bas_zaman = perf_counter()
+    d = _Durum(k, dersler, derslikler, graf)
+    n = len(d.ders_ids)
+    d.yukle(baslangic)
+    rnd = random.Random(tohum)
+    baslangic_amac = d.amac()
+
+    # başlangıçta yerleşmemiş dersler bir kez en ucuz uygun slota denenir
+    if d.slot_sayisi:
+        for c in sorted(range(n), key=lambda c: (-d.ogr_say[c], c)):
+            if d.slot[c] < 0:
+                d.en_ucuz_yerlestir(c)
+
+    en_iyi = d.amac()
+    en_iyi_cozum = (list(d.slot), list(d.oda))
+
+    agirliklar = [w for kom in d.komsu for _, w in kom]
+    t0 = sicaklik if sicaklik is not None else \
+        (W_AYNI_GUN + W_ARDISIK) * max(1.0, sum(agirliklar) / max(1, len(agirliklar)))
+    t_son = t0 / 1000.0
+
+    # tüm dersliklerin toplamı bile yetmeyen dersler hiçbir hamleyle yerleşemez
+    adaylar = [c for c in range(n) if d.ogr_say[c] <= d.toplam_kap and d.kap]
+
+    adim = kabul = 0
+    sicak = t0
+    while adaylar and d.slot_sayisi:
+        if adim & 1023 == 0:
+            gecen = perf_counter() - bas_zaman
+            if gecen >= sure_sn or (azami_adim is not None and adim >= azami_adim):
+                break
+            if denetim is not None:
+                eksik = sum(1 for s in en_iyi_cozum[0] if s < 0)
+                if denetim.bildir("iyilestirme", n - eksik, eksik, lambda: d.yerlestirmeler(*en_iyi_cozum)):
+                    break
+            ilerleme = adim / azami_adim if azami_adim else gecen / sure_sn if sure_sn > 0 else 1.0
+            sicak = t0 * (t_son / t0) ** min(1.0, ilerleme)
+        adim += 1
+
+        c = adaylar[rnd.randrange(len(adaylar))]
+        if d.slot[c] < 0:
+            hamle = _zorla
+        elif rnd.random() < 0.5:
+            hamle = _tasi
+        else:
+            hamle = _degistir
+        if hamle(d, c, rnd, sicak):
+            kabul += 1
+            amac = d.amac()
+            if amac < en_iyi:
+                en_iyi = amac
+                en_iyi_cozum = (list(d.slot), list(d.oda))
+
+    slot, oda = en_iyi_cozum
+    uyarilar = [
+        f"Ders {d.dersler[c].get('kod', '?')} için çakışmasız slot veya uygun/kapasiteli derslik bulunamadı."
+        for c in range(n) if slot[c] < 0
+    ]
+    istatistik = {
+        "adim": adim,
+        "kabul": kabul,
+        "sure_sn": round(perf_counter() - bas_zaman, 3),
+        "baslangic_amac": baslangic_amac,
+        "son_amac": en_iyi,
+        "yerlesmeyen": sum(1 for s in slot if s < 0),
+    }
+    return d.yerlestirmeler(slot, oda), uyarilar, istatistik
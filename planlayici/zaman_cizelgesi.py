@@ -0,0 +1,75 @@
+# planlayici/zaman_cizelgesi.py
+# -*- coding: utf-8 -*-
+"""
+Planlama ufkunun tamsayı dakikalara önceden dönüştürülmesi.
+
+Motorlar iç döngüde datetime.combine / timedelta / datetime karşılaştırması
+yapmaz: her slot bir kez `tarih_bas` gece yarısından itibaren dakika
+ofsetine çevrilir, gun_disi günleri listeye hiç girmez ve ders süreleri
+tamsayı dakika olarak bir kez çözülür. Müsaitlik indeksleri (bkz.
+planlayici.musaitlik) tamsayılarla çalışır; datetime yalnızca sonuç
+üretilirken kurulur.
+
+Slot saatleri dakika çözünürlüğündedir (saniye kısmı yok sayılır).
+"""
+from __future__ import annotations
+
+from array import array
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List
+
+
+class ZamanCizelgesi:
+    """
+    k: planner._kisitlari_coz çıktısı. Slot sırası planner._gun_slotlari ile
+    aynıdır (günler sırayla, her günde slotlar girildiği sırayla).
+
+      baslar : array('q') — slot başlangıçları (dakika)
+      gunler : list[date] — slotun günü
+      saatler: list[time] — slotun saati
+    """
+
+    def __init__(self, k: Dict[str, Any]):
+        self.sifir = datetime.combine(k["tarih_bas"], time())
+        self.gunler: List[date] = []
+        self.saatler: List[time] = []
+        self.baslar = array("q")
+        gun, gun_no = k["tarih_bas"], 0
+        while gun <= k["tarih_bit"]:
+            if gun.weekday() not in k["gun_disi"]:
+                for s in k["slot_saatleri"]:
+                    self.gunler.append(gun)
+                    self.saatler.append(s)
+                    self.baslar.append(gun_no * 1440 + s.hour * 60 + s.minute)
+            gun += timedelta(days=1)
+            gun_no += 1
+        self._varsayilan_sure = int(k["varsayilan_sure_dk"])
+        self._istisna = k["ders_istisna_sure"]
+
+    def __len__(self) -> int:
+        return len(self.baslar)
+
+    def sure(self, ders_id: int) -> int:
+        """Dersin sınav süresi (dk): ders_istisna_sure ya da varsayılan."""
+        return int(self._istisna.get(ders_id, self._varsayilan_sure))
+
+    def sureler(self, ders_ids: Iterable[int]) -> Dict[int, int]:
+        return {int(did): self.sure(int(did)) for did in ders_ids}
+
+    def dakika(self, zaman: datetime) -> int:
+        """datetime → ufuk başından dakika."""
+        return int((zaman - self.sifir).total_seconds() // 60)
+
+    def zaman(self, dakika: int) -> datetime:
+        """Ufuk başından dakika → datetime (yalnızca sonuç üretirken)."""
+        return self.sifir + timedelta(minutes=int(dakika))
+
+    def yerlestirme(self, ders_id: int, bas: int, sure: int, derslik_ids: List[int]) -> Dict[str, Any]:
+        """Motorların ortak çıktı satırı: {ders_id, baslangic, bitis, derslik_ids}."""
+        baslangic = self.zaman(bas)
+        return {
+            "ders_id": ders_id,
+            "baslangic": baslangic,
+            "bitis": baslangic + timedelta(minutes=sure),
+            "derslik_ids": derslik_ids,
+        }
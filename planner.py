@@ -2,9 +2,15 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, date, time
-from typing import Dict, List, Any, Tuple, Iterable, Union, Optional, Set
+from typing import Dict, List, Any, Tuple, Iterable, Union, Optional, Set, Callable
+
+from planlayici.denetim import PlanDenetimi, PlanIlerleme
+from planlayici.musaitlik import AralikIndeksi, ogrenci_indeksi_olustur
+from planlayici.ogrenci_takvimi import ogrenci_takvimi_olustur
+from planlayici.zaman_cizelgesi import ZamanCizelgesi
 
 
 # ------------------------------
@@ -124,11 +130,12 @@ class PlanKisit:
       gunluk_slot_saatleri:   (eski isim) slot_saatleri ile eşdeğer
       varsayilan_sure_dk:     sınav süresi (dk)
       default_sure / sure_dk / vars_sure_dk: varsayilan_sure_dk için takma adlar
-      bekleme_dk:             öğrencinin ardışık sınavları arası asgari boşluk (dk)
+      bekleme_dk:             öğrencinin ardışık sınavları arası asgari boşluk (dk); tüm motorlarda sert kısıt
       bekleme / bekleme_suresi_dk: bekleme_dk takma adları
       sinav_turu:             'vize' / 'final' vb.
       tek_seans:              True → aynı anda yalnızca 1 sınav (paralel yasak)
       paralel_yasak / tek_oturum: tek_seans için takma adlar
+      gunluk_azami_sinav:     bir öğrencinin bir günde girebileceği en çok sınav (None: sınırsız)
       dahil_ders_ids:         sadece bu ders id'leri planlansın
       gun_disi:               planlamadan hariç günler
       ders_istisna_sure:      {ders_id: dakika} (alias: ders_sureleri, ders_ozel_sureleri, per_ders_sure)
@@ -156,6 +163,8 @@ class PlanKisit:
     paralel_yasak: Optional[bool] = None
     tek_oturum: Optional[bool] = None
 
+    gunluk_azami_sinav: Optional[int] = None
+
     dahil_ders_ids: Optional[List[int]] = None
     gun_disi: Optional[Iterable[Any]] = None
 
@@ -199,25 +208,15 @@ class PlanKisit:
 
 
 # ------------------------------
-# Ana planlayıcı
+# Kısıt normalizasyonu
 # ------------------------------
 
-def planla(kisitlar: Union[PlanKisit, Dict[str, Any]],
-           dersler: List[Dict[str, Any]],
-           derslikler: List[Any]) -> Tuple[List[Dict[str, Any]], List[str], bool]:
+def _kisitlari_coz(kisitlar: Union[PlanKisit, Dict[str, Any]]) -> Dict[str, Any]:
     """
-    Kurallı yerleştirici:
-      - Aynı öğrencinin aynı anda iki sınavı olmaz.
-      - Aynı derslik aynı saat aralığında ikinci kez kullanılmaz.
-      - Derslik kapasitesi yetmiyorsa uygun başka derslik aranır; bulunamazsa uyarı üretir.
-      - 'tek_seans=True' ise aynı anda yalnızca 1 ders (paralel yasak).
-      - 'dahil_ders_ids' verilirse sadece bu ID’lerdeki dersler planlanır.
-      - 'gun_disi' verilirse bu günlerde slot denenmez.
-      - 'ders_istisna_sure' verilirse ders bazlı süre uygulanır.
-    Dönenler:
-      - yerlestirmeler: [{ders_id, baslangic, bitis, derslik_ids}]
-      - uyarilar: [str, ...]
-      - fatal: bool
+    PlanKisit | dict → tüm motorların ortak kullandığı normalize sözlük:
+      tarih_bas, tarih_bit, slot_saatleri (list[time]), varsayilan_sure_dk, bekleme_dk,
+      gunluk_azami_sinav (int | None), sinav_turu, tek_seans, dahil_ders_ids, gun_disi (set[int]),
+      ders_istisna_sure ({ders_id: dk})
     """
     # PlanKisit -> dict
     if isinstance(kisitlar, PlanKisit):
@@ -227,6 +226,7 @@ def planla(kisitlar: Union[PlanKisit, Dict[str, Any]],
             "slot_saatleri": kisitlar._slotlar,
             "varsayilan_sure_dk": kisitlar.varsayilan_sure_dk,
             "bekleme_dk": kisitlar.bekleme_dk,
+            "gunluk_azami_sinav": kisitlar.gunluk_azami_sinav,
             "sinav_turu": kisitlar.sinav_turu,
             "tek_seans": kisitlar.tek_seans,
             "dahil_ders_ids": kisitlar.dahil_ders_ids,
@@ -269,9 +269,6 @@ def planla(kisitlar: Union[PlanKisit, Dict[str, Any]],
         else:
             k["ders_istisna_sure"] = _normalize_ders_sureleri(k["ders_istisna_sure"])
 
-    uyarilar: List[str] = []
-    yerlestirmeler: List[Dict[str, Any]] = []
-
     # slot saatlerini normalize et (string gelebilir)
     raw_slots = k.get("slot_saatleri", [])
     slot_saatleri: List[time] = []
@@ -280,130 +277,336 @@ def planla(kisitlar: Union[PlanKisit, Dict[str, Any]],
         if t:
             slot_saatleri.append(t)
 
-    tarih_bas: date = k["tarih_bas"]
-    tarih_bit: date = k["tarih_bit"]
-    default_sure_dk: int = int(k.get("varsayilan_sure_dk", 75) or 75)
-    bekleme_dk: int = int(k.get("bekleme_dk", 0) or 0)  # şu an bilgi amaçlı
-    tek_seans: bool = bool(k.get("tek_seans", False))
-    dahil_ders_ids: Optional[List[int]] = k.get("dahil_ders_ids")
-    gun_disi: Set[int] = _normalize_gun_disi(k.get("gun_disi"))
-    ders_sure_map: Dict[int, int] = k.get("ders_istisna_sure") or {}
+    return {
+        "tarih_bas": k["tarih_bas"],
+        "tarih_bit": k["tarih_bit"],
+        "slot_saatleri": slot_saatleri,
+        "varsayilan_sure_dk": int(k.get("varsayilan_sure_dk", 75) or 75),
+        "bekleme_dk": int(k.get("bekleme_dk", 0) or 0),
+        "gunluk_azami_sinav": None if k.get("gunluk_azami_sinav") is None else int(k["gunluk_azami_sinav"]),
+        "sinav_turu": k.get("sinav_turu", "vize"),
+        "tek_seans": bool(k.get("tek_seans", False)),
+        "dahil_ders_ids": k.get("dahil_ders_ids"),
+        "gun_disi": _normalize_gun_disi(k.get("gun_disi")),
+        "ders_istisna_sure": k.get("ders_istisna_sure") or {},
+    }
+
+
+def _gun_slotlari(k: Dict[str, Any]) -> List[Tuple[date, time]]:
+    """Planlama aralığındaki (gün, slot saati) çiftleri; hariç günler atlanır; günler sırayla, slotlar girildiği sırayla."""
+    out: List[Tuple[date, time]] = []
+    gun = k["tarih_bas"]
+    while gun <= k["tarih_bit"]:
+        if gun.weekday() not in k["gun_disi"]:
+            for slot in k["slot_saatleri"]:
+                out.append((gun, slot))
+        gun += timedelta(days=1)
+    return out
+
+
+# ------------------------------
+# Derslik seçimi
+# ------------------------------
+
+def _derslik_bilgisi(derslikler: List[Any]) -> List[Tuple[int, int]]:
+    """Derslikleri [(id, kapasite)] olarak kapasiteye göre büyükten küçüğe sıralar."""
+    out = [(int(_getv(dl, "id")), int(_getv(dl, "kapasite", 0))) for dl in derslikler]
+    out.sort(key=lambda x: x[1], reverse=True)
+    return out
+
+
+def _derslik_zamani(zc: ZamanCizelgesi, derslikler: List[Any]) -> AralikIndeksi:
+    """
+    Derslik müsaitlik indeksi (anahtarlar dakika). Derslik satırı "dolu"
+    taşıyorsa ([(baslangic, bitis)], planlanmayan bölümlerin ortak
+    derslikteki sınavları; bkz. veri_deposu.plan_kaynagini_hazirla) bu
+    aralıklar baştan sabit olarak yüklenir.
+    """
+    derslik_zaman = AralikIndeksi()
+    for dl in derslikler:
+        for bas, bit in _getv(dl, "dolu") or ():
+            derslik_zaman.ekle(int(_getv(dl, "id")), zc.dakika(bas), zc.dakika(bit))
+    return derslik_zaman
+
+
+def _derslik_sec(derslik_bilgi: List[Tuple[int, int]],
+                 kullanim_say: Dict[int, int],
+                 derslik_zaman: AralikIndeksi,
+                 ogr_say: int,
+                 bas: Any, bit: Any) -> Optional[int]:
+    """
+    Kapasitesi yeten ve [bas, bit) aralığında boş derslikler arasından
+    en az kullanılanı, eşitse kapasitesi küçük olanı seçer; yoksa None.
+    """
+    secilen: Optional[int] = None
+    en_iyi: Optional[Tuple[int, int]] = None
+    for dl_id, kap in derslik_bilgi:
+        if kap >= ogr_say and derslik_zaman.musait_mi(dl_id, bas, bit):
+            anahtar = (kullanim_say[dl_id], kap)
+            if en_iyi is None or anahtar < en_iyi:
+                secilen, en_iyi = dl_id, anahtar
+    return secilen
+
+
+def _derslik_paketle(bos: List[Tuple[int, int]], ogr_say: int) -> Optional[List[int]]:
+    """
+    bos: boş derslikler [(id, kapasite)], kapasiteye göre büyükten küçüğe.
+    Toplam kapasitesi ogr_say'a yeten en az sayıda dersliği seçer; bu sayı
+    içinde boş koltuğu azaltmak için her adımda, kalan ihtiyacı sonraki en
+    büyük dersliklerle hâlâ karşılayabilen en küçük derslik alınır.
+    Kapasite önek toplamları üzerinde ikili arama: O(m + k·log m). Yetmezse None.
+    """
+    m = len(bos)
+    if not m:
+        return None
+    onek = [0]
+    for _, kap in bos:
+        onek.append(onek[-1] + kap)
+    k = max(1, bisect_left(onek, ogr_say))  # en büyük k derslik yeter
+    if k > m:
+        return None
+    secilen: List[int] = []
+    kalan, i = ogr_say, 0
+    for q in range(k, 0, -1):
+        # j ∈ [i, m-q]: j ve sonraki q-1 derslik kalanı karşılıyorsa aday; en büyük j en sıkısı
+        j = i + bisect_right(range(i, m - q + 1), -kalan, key=lambda j: onek[j] - onek[j + q]) - 1
+        secilen.append(bos[j][0])
+        kalan -= bos[j][1]
+        i = j + 1
+    return secilen
+
+
+def _derslik_sec_coklu(derslik_bilgi: List[Tuple[int, int]],
+                       kullanim_say: Dict[int, int],
+                       derslik_zaman: AralikIndeksi,
+                       ogr_say: int,
+                       bas: Any, bit: Any) -> Optional[List[int]]:
+    """
+    Tek derslik yetiyorsa _derslik_sec ile aynı seçimi [id] olarak döndürür;
+    yetmiyorsa sınav [bas, bit) aralığında boş dersliklerin en az sayıda ve en
+    sıkı birleşimine bölünür (bkz. _derslik_paketle). Hiçbiri olmazsa None.
+    """
+    dl_id = _derslik_sec(derslik_bilgi, kullanim_say, derslik_zaman, ogr_say, bas, bit)
+    if dl_id is not None:
+        return [dl_id]
+    bos = [(dl_id, kap) for dl_id, kap in derslik_bilgi if derslik_zaman.musait_mi(dl_id, bas, bit)]
+    return _derslik_paketle(bos, ogr_say)
+
+
+# ------------------------------
+# Ana planlayıcı
+# ------------------------------
+
+def planla(kisitlar: Union[PlanKisit, Dict[str, Any]],
+           dersler: List[Dict[str, Any]],
+           derslikler: List[Any],
+           musaitlik: str = "bitset",
+           motor: str = "acgozlu",
+           sabit: Optional[List[Dict[str, Any]]] = None,
+           iyilestirme_sn: float = 0.0,
+           tohum: int = 0,
+           sure_siniri_sn: Optional[float] = None,
+           son_zaman: Optional[float] = None,
+           iptal: Any = None,
+           ilerleme: Optional[Callable[[PlanIlerleme], Any]] = None) -> Tuple[List[Dict[str, Any]], List[str], bool]:
+    """
+    Kurallı yerleştirici:
+      - Aynı öğrencinin aynı anda iki sınavı olmaz; iki sınavı arasında en az
+        'bekleme_dk' dakika boşluk kalır.
+      - 'gunluk_azami_sinav' verilirse hiçbir öğrencinin bir günde bundan fazla sınavı olmaz.
+      - Aynı derslik aynı saat aralığında ikinci kez kullanılmaz; derslik satırlarının
+        "dolu" aralıkları (başka bölümlerin sınavları) da kullanılmaz.
+      - Derslik kapasitesi yetmiyorsa uygun başka derslik aranır; tek derslik yetmiyorsa
+        sınav boş dersliklerin en az sayıda/en sıkı birleşimine bölünür; bulunamazsa uyarı üretir.
+      - 'tek_seans=True' ise aynı anda yalnızca 1 ders (paralel yasak).
+      - 'dahil_ders_ids' verilirse sadece bu ID’lerdeki dersler planlanır.
+      - 'gun_disi' verilirse bu günlerde slot denenmez.
+      - 'ders_istisna_sure' verilirse ders bazlı süre uygulanır.
+    musaitlik: öğrenci müsaitlik indeksi ('bitset' | 'aralik'), bkz. planlayici.musaitlik
+    motor:
+      - 'acgozlu': slot slot ilerleyen, öğrenci sayısına göre sıralı açgözlü yerleştirici
+      - 'graf':    ders çakışma grafı + DSatur sıralaması (bkz. planlayici.graf_motoru)
+      - 'kesin':   OR-Tools CP-SAT modeli, açgözlü çözümle ısıtılır; ortools yoksa
+                   açgözlü sonuç uyarıyla döner (bkz. planlayici.kesin_cozucu)
+      - 'portfoy': farklı sıralama/tohumlu motor varyantları süreç havuzunda çalışır,
+                   puanı en iyi olan döner (bkz. planlayici.portfoy)
+    sure_siniri_sn: 'kesin' motorunun çözücü süre sınırı (verilmezse kesin_cozucu.VARSAYILAN_SURE_SN)
+    sabit: mevcut program verilirse artımlı onarım yapılır (motor kullanılmaz): geçerli
+      sınavlar yerinde kalır, yalnızca yeni/süresi değişmiş/geçersizleşmiş dersler
+      yerleştirilir (bkz. planlayici.artimli)
+    iyilestirme_sn: > 0 ise motorun çıktısı bu kadar saniye yerel aramayla iyileştirilir:
+      yerleşemeyen ders, aynı güne ve art arda düşen sınav sayısı azaltılır
+      (bkz. planlayici.yerel_arama; tohum aramanın rastgele tohumudur). sabit ile kullanılmaz.
+    Her an durdurma (bkz. planlayici.denetim):
+      son_zaman: time.monotonic() cinsinden bitiş anı; iptal: is_set() metodu olan belirteç
+      (ör. threading.Event); ilerleme: PlanIlerleme(asama, yerlesen, kalan) alan geri çağrı,
+      kısmi program için ilerleme.yerlestirmeler(); True dönerse planlama durur.
+      Durunca o ana kadarki (geçerli, kısmi) program döner; uyarıların ilki durma nedenidir.
+      İyileştirme süresi ve kesin çözücü süre sınırı son_zaman'a göre kısaltılır.
+    Dönenler:
+      - yerlestirmeler: [{ders_id, baslangic, bitis, derslik_ids}]
+      - uyarilar: [str, ...]
+      - fatal: bool
+    """
+    k = _kisitlari_coz(kisitlar)
 
     # Sadece seçili dersler istenmişse filtrele
-    if dahil_ders_ids:
-        izinli = {int(i) for i in dahil_ders_ids}
+    if k["dahil_ders_ids"]:
+        izinli = {int(i) for i in k["dahil_ders_ids"]}
         dersler = [d for d in dersler if int(d.get("id")) in izinli]
 
-    # Zaman çizelgeleri
-    derslik_zaman: Dict[int, List[Tuple[datetime, datetime]]] = {}
-    ogr_zaman: Dict[int, List[Tuple[datetime, datetime]]] = {}
+    denetim = None
+    if son_zaman is not None or iptal is not None or ilerleme is not None:
+        denetim = PlanDenetimi(son_zaman, iptal, ilerleme)
+
+    if sabit is not None:
+        from planlayici.artimli import artimli_planla
+        return _durma_uyarisi(artimli_planla(k, dersler, derslikler, sabit, musaitlik, denetim=denetim),
+                              dersler, denetim)
+    if motor == "graf":
+        from planlayici.graf_motoru import graf_ile_planla
+        sonuc = graf_ile_planla(k, dersler, derslikler, denetim=denetim)
+    elif motor == "kesin":
+        from planlayici.kesin_cozucu import VARSAYILAN_SURE_SN, kesin_planla
+        sonuc = kesin_planla(k, dersler, derslikler, musaitlik,
+                             sure_sn=VARSAYILAN_SURE_SN if sure_siniri_sn is None else sure_siniri_sn,
+                             tohum=tohum, denetim=denetim)
+    elif motor == "portfoy":
+        from planlayici.portfoy import portfoy_planla
+        sonuc = portfoy_planla(k, dersler, derslikler, musaitlik=musaitlik, tohum=tohum, denetim=denetim)[:3]
+    elif motor == "acgozlu":
+        sonuc = _acgozlu_planla(k, dersler, derslikler, musaitlik, denetim=denetim)
+    else:
+        raise ValueError(f"Bilinmeyen planlama motoru: {motor!r} (geçerli: acgozlu, graf, kesin, portfoy)")
+
+    if iyilestirme_sn > 0 and not sonuc[2] and not (denetim is not None and denetim.durdu):
+        from planlayici.yerel_arama import yerel_arama
+        kalan_sn = denetim.kalan_sn() if denetim is not None else None
+        yerlestirmeler, uyarilar, _ = yerel_arama(k, dersler, derslikler, sonuc[0],
+                                                  sure_sn=iyilestirme_sn if kalan_sn is None else min(iyilestirme_sn, kalan_sn),
+                                                  tohum=tohum, denetim=denetim)
+        sonuc = (yerlestirmeler, uyarilar, False)
+        if denetim is not None:
+            denetim.dur_mu()  # iyileştirme son_zaman yüzünden kısaldıysa nedeni kaydedilir
+    return _durma_uyarisi(sonuc, dersler, denetim)
+
+
+def _durma_uyarisi(sonuc: Tuple[List[Dict[str, Any]], List[str], bool],
+                   dersler: List[Dict[str, Any]],
+                   denetim: Optional[PlanDenetimi]) -> Tuple[List[Dict[str, Any]], List[str], bool]:
+    """Planlama erken durduysa nedenini uyarıların başına ekler."""
+    if denetim is None or not denetim.durdu:
+        return sonuc
+    yerlestirmeler, uyarilar, fatal = sonuc
+    yerlesen = sum(1 for y in yerlestirmeler if y.get("baslangic") is not None)
+    return yerlestirmeler, [denetim.uyari(len(dersler) - yerlesen)] + uyarilar, fatal
+
+
+def _acgozlu_planla(k: Dict[str, Any],
+                    dersler: List[Dict[str, Any]],
+                    derslikler: List[Any],
+                    musaitlik: str,
+                    sirali: bool = False,
+                    denetim: Optional[PlanDenetimi] = None) -> Tuple[List[Dict[str, Any]], List[str], bool]:
+    """
+    sirali=True ise dersler verilen sırayla denenir (bkz. planlayici.portfoy).
+    denetim: her slot başında bildirilir; durursa o ana kadarki yerleştirmeler döner.
+    """
+    uyarilar: List[str] = []
+    yerlesen: List[Tuple[int, int, int, List[int]]] = []  # (ders_id, bas_dk, sure_dk, derslik_ids)
+
+    tek_seans: bool = k["tek_seans"]
 
-    def derslik_musait(derslik_id: int, bas: datetime, bit: datetime) -> bool:
-        for (b0, b1) in derslik_zaman.get(derslik_id, []):
-            if _overlaps(bas, bit, b0, b1):
-                return False
-        return True
+    # Ufuk tamsayı dakikalara bir kez çevrilir (gun_disi günleri zaten yok)
+    zc = ZamanCizelgesi(k)
 
-    def ogrenciler_musait(ogr_ids: Iterable[int], bas: datetime, bit: datetime) -> bool:
-        for oid in ogr_ids:
-            for (b0, b1) in ogr_zaman.get(int(oid), []):
-                if _overlaps(bas, bit, b0, b1):
-                    return False
-        return True
+    # Zaman çizelgeleri (müsaitlik indeksleri; anahtarlar dakika)
+    derslik_zaman = _derslik_zamani(zc, derslikler)
+    genel_zaman = AralikIndeksi()  # tek_seans için: anahtar 0 = tüm sınavlar (uzun sınav sonraki slota taşabilir)
+    ogr_zaman = ogrenci_indeksi_olustur(musaitlik)
+    bekleme: int = k["bekleme_dk"]
+    takvim = ogrenci_takvimi_olustur(k, dersler)
 
     # Büyükten küçüğe sırala (öğrenci sayısı fazla olan dersler önce yer bulsun)
-    dersler_sirali = sorted(dersler, key=lambda d: int(d.get("ogr_say", 0)), reverse=True)
-    # Derslikleri kapasiteye göre sırala
-    derslikler_sirali = sorted(derslikler, key=lambda dl: int(_getv(dl, "kapasite", 0)), reverse=True)
+    if sirali:
+        dersler_sirali = list(dersler)
+    else:
+        dersler_sirali = sorted(dersler, key=lambda d: int(d.get("ogr_say", 0)), reverse=True)
+
+    # Ders başına sabitler bir kez: (ders, id, süre dk, öğrenci sayısı, öğrenci maskesi, günlük sayaç kohortu)
+    bekleyen = [
+        (d, int(d["id"]), zc.sure(int(d["id"])), int(d.get("ogr_say") or 0), ogr_zaman.maske(d.get("ogr_ids") or []),
+         takvim.kohort(d.get("ogr_ids") or ()) if takvim is not None else None)
+        for d in dersler_sirali
+    ]
+
+    derslik_bilgi = _derslik_bilgisi(derslikler)
 
     # --- EKLEME: derslik kullanım sayaçları (dengeli dağıtım için) ---
-    kullanim_say: Dict[int, int] = {int(_getv(dl, "id")): 0 for dl in derslikler_sirali}
+    kullanim_say: Dict[int, int] = {dl_id: 0 for dl_id, _ in derslik_bilgi}
     # ---------------------------------------------------------------
 
-    gun = tarih_bas
-    while gun <= tarih_bit:
-        # Hariç gün mü?
-        if gun.weekday() in gun_disi:
-            gun += timedelta(days=1)
-            continue
+    for si, bas in enumerate(zc.baslar):
+        if not bekleyen:
+            break
+        if denetim is not None and denetim.bildir(
+                "acgozlu", len(yerlesen), len(bekleyen), lambda: [zc.yerlestirme(*y) for y in yerlesen]):
+            break
+
+        # paralel yasak ise, o slotta tek ders planlayacağız
+        max_ders_sayisi = 1 if tek_seans else len(bekleyen)
 
-        for slot in slot_saatleri:
-            if not dersler_sirali:
+        # bu slottaki adaylar
+        eklendi_bu_slot = 0
+        for aday in list(bekleyen):
+            if eklendi_bu_slot >= max_ders_sayisi:
                 break
+            d, ders_id, sure_dk, ogr_say, maske, kohort = aday
+            bit = bas + sure_dk
+            if tek_seans and not genel_zaman.musait_mi(0, bas, bit):
+                continue
 
-            # paralel yasak ise, o slotta tek ders planlayacağız
-            max_ders_sayisi = 1 if tek_seans else len(dersler_sirali)
+            # öğrenciler uygun mu? (öncesinde/sonrasında bekleme süresi kadar da boş olmalılar)
+            if not ogr_zaman.musait_mi(maske, bas - bekleme, bit + bekleme):
+                continue
+            if takvim is not None and not takvim.uygun_mu(kohort, bas // 1440):
+                continue
 
-            # bu slottaki adaylar
-            eklendi_bu_slot = 0
-            for d in list(dersler_sirali):
-                if eklendi_bu_slot >= max_ders_sayisi:
-                    break
+            # Derslik seçimi (dengeli & küçük kapasite öncelikli; gerekirse birden çok derslik)
+            secilen_derslikler = _derslik_sec_coklu(derslik_bilgi, kullanim_say, derslik_zaman, ogr_say, bas, bit)
 
-                # ders bazlı süre
-                ders_id = int(d["id"])
-                sure_dk = int(ders_sure_map.get(ders_id, default_sure_dk))
-
-                bas = datetime.combine(gun, slot)
-                bit = bas + timedelta(minutes=sure_dk)
-
-                # öğrenciler uygun mu?
-                if not ogrenciler_musait(d.get("ogr_ids") or [], bas, bit):
-                    continue
-
-                # --- GÜNCEL: Derslik seçimi (dengeli & küçük kapasite öncelikli) ---
-                ogr_say = int(d.get("ogr_say") or 0)
-                secilen_derslik_id = None
-
-                uygunlar: List[Any] = []
-                for dl in derslikler_sirali:
-                    dl_id = int(_getv(dl, "id"))
-                    kap = int(_getv(dl, "kapasite", 0))
-                    if kap >= ogr_say and derslik_musait(dl_id, bas, bit):
-                        uygunlar.append(dl)
-
-                if uygunlar:
-                    uygunlar.sort(
-                        key=lambda _dl: (
-                            kullanim_say[int(_getv(_dl, "id"))],                 # daha az kullanılan önce
-                            int(_getv(_dl, "kapasite", 10**9))                   # eşitse kapasitesi küçük olan önce
-                        )
-                    )
-                    secilen = uygunlar[0]
-                    secilen_derslik_id = int(_getv(secilen, "id"))
-                # -------------------------------------------------------------------
-
-                if secilen_derslik_id is None:
-                    uyarilar.append(
-                        f"Ders {d.get('kod','?')} için {gun} {slot.strftime('%H:%M')} saatinde uygun/kapasiteli derslik bulunamadı."
-                    )
-                    continue
-
-                # Yerleştir
-                yerlestirmeler.append({
-                    "ders_id": ders_id,
-                    "baslangic": bas,
-                    "bitis": bit,
-                    "derslik_ids": [secilen_derslik_id],
-                })
-
-                # Çizelgeleri güncelle
-                derslik_zaman.setdefault(secilen_derslik_id, []).append((bas, bit))
-                for oid in (d.get("ogr_ids") or []):
-                    ogr_zaman.setdefault(int(oid), []).append((bas, bit))
-
-                # --- EKLEME: kullanım sayısını artır ---
-                kullanim_say[secilen_derslik_id] = kullanim_say.get(secilen_derslik_id, 0) + 1
-                # --------------------------------------
-
-                # listeden çıkar
-                dersler_sirali.remove(d)
-                eklendi_bu_slot += 1
-
-                if tek_seans:
-                    break  # bu slot dolu
+            if secilen_derslikler is None:
+                uyarilar.append(
+                    f"Ders {d.get('kod','?')} için {zc.gunler[si]} {zc.saatler[si].strftime('%H:%M')} saatinde uygun/kapasiteli derslik bulunamadı."
+                )
+                continue
 
-        gun += timedelta(days=1)
+            # Yerleştir
+            yerlesen.append((ders_id, bas, sure_dk, secilen_derslikler))
+
+            # Çizelgeleri güncelle
+            for dl_id in secilen_derslikler:
+                derslik_zaman.ekle(dl_id, bas, bit)
+            ogr_zaman.ekle(maske, bas, bit)
+            if takvim is not None:
+                takvim.ekle(kohort, bas // 1440)
+            if tek_seans:
+                genel_zaman.ekle(0, bas, bit)
+
+            # --- EKLEME: kullanım sayısını artır ---
+            for dl_id in secilen_derslikler:
+                kullanim_say[dl_id] = kullanim_say.get(dl_id, 0) + 1
+            # --------------------------------------
+
+            # listeden çıkar
+            bekleyen.remove(aday)
+            eklendi_bu_slot += 1
+
+            if tek_seans:
+                break  # bu slot dolu
+
+    # datetime yalnızca sonuç üretilirken kurulur
+    yerlestirmeler = [zc.yerlestirme(*y) for y in yerlesen]
 
     fatal = False
     return yerlestirmeler, uyarilar, fatal
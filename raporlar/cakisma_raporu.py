@@ -0,0 +1,64 @@
+# raporlar/cakisma_raporu.py
+from __future__ import annotations
+from typing import List, Dict, Any
+from pathlib import Path
+
+import openpyxl
+from openpyxl.utils import get_column_letter
+from openpyxl.styles import Alignment, Font, Border, Side, PatternFill
+
+def cakisma_raporu_xlsx_yaz(dosya_yolu: str, ciftler: List[Dict[str, Any]], baslik: str = ""):
+    """
+    ciftler örnek eleman (ortak öğrenci sayısına göre azalan sırada beklenir):
+      {
+        "kod_a": "CSE101", "ad_a": "Programlama",
+        "kod_b": "MAT101", "ad_b": "Analiz",
+        "ortak": 42,
+        "programda_cakisiyor": True | False | None   # None: iki dersten biri programda yok
+      }
+    """
+    p = Path(dosya_yolu)
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Ders Çakışmaları"
+
+    ws.merge_cells("A1:F1")
+    ws["A1"] = f"DERS ÇAKIŞMA RAPORU {baslik}".strip()
+    ws["A1"].font = Font(bold=True, size=14)
+    ws["A1"].alignment = Alignment(horizontal="center")
+
+    headers = ["Ders Kodu", "Ders Adı", "Ders Kodu", "Ders Adı", "Ortak Öğrenci", "Programda Çakışma"]
+    ws.append(headers)
+    for col in range(1, len(headers) + 1):
+        c = ws.cell(row=2, column=col)
+        c.font = Font(bold=True)
+        c.alignment = Alignment(horizontal="center")
+
+    kirmizi = PatternFill("solid", fgColor="F4CCCC")
+    for r in ciftler:
+        durum = r.get("programda_cakisiyor")
+        ws.append([
+            r.get("kod_a", ""),
+            r.get("ad_a", ""),
+            r.get("kod_b", ""),
+            r.get("ad_b", ""),
+            r.get("ortak", 0),
+            "" if durum is None else ("EVET" if durum else "hayır"),
+        ])
+        if durum:
+            for cell in ws[ws.max_row]:
+                cell.fill = kirmizi
+
+    widths = [12, 34, 12, 34, 14, 18]
+    for idx, w in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(idx)].width = w
+
+    thin = Side(style="thin")
+    for r in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=1, max_col=6):
+        for cell in r:
+            cell.border = Border(top=thin, bottom=thin, left=thin, right=thin)
+            if cell.column in (5, 6):
+                cell.alignment = Alignment(horizontal="center", vertical="center")
+
+    p.parent.mkdir(parents=True, exist_ok=True)
+    wb.save(p.as_posix())
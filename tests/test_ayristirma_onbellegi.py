@@ -0,0 +1,55 @@
+# tests/test_ayristirma_onbellegi.py
+# -*- coding: utf-8 -*-
+"""Excel ayrıştırma önbelleği: sayfa özetleri ve bozuk kayıtlar."""
+import openpyxl
+import pytest
+
+import excel_parser
+from utils.ayristirma_onbellegi import AyristirmaOnbellegi, sayfa_ozetleri
+
+
+def _ogrenci_kitabi(yol, bicim=None, tarih_1904=False):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Ogrenciler"
+    ws.append(["Öğrenci No", "Ad Soyad", "Sınıf", "Ders"])
+    for i in range(1, 41):
+        ws.append([220000 + i, f"Öğrenci {i}", 1 + i % 4, f"BLM{100 + i % 7}"])
+    if bicim is not None:
+        for (hucre,) in ws.iter_rows(min_row=2, max_col=1):
+            hucre.number_format = bicim
+    wb.epoch = openpyxl.utils.datetime.CALENDAR_MAC_1904 if tarih_1904 else openpyxl.utils.datetime.CALENDAR_WINDOWS_1900
+    wb.save(yol)
+    return yol
+
+
+def test_yalnizca_bicim_degisince_sayfa_ozeti_degisir(tmp_path):
+    duz = sayfa_ozetleri(_ogrenci_kitabi(tmp_path / "a.xlsx"))
+    ayni = sayfa_ozetleri(_ogrenci_kitabi(tmp_path / "b.xlsx"))
+    metin = sayfa_ozetleri(_ogrenci_kitabi(tmp_path / "c.xlsx", bicim="@"))
+    tarih = sayfa_ozetleri(_ogrenci_kitabi(tmp_path / "d.xlsx", bicim="yyyy-mm-dd"))
+    mac = sayfa_ozetleri(_ogrenci_kitabi(tmp_path / "e.xlsx", tarih_1904=True))
+    assert duz == ayni
+    assert len({duz["Ogrenciler"], metin["Ogrenciler"], tarih["Ogrenciler"], mac["Ogrenciler"]}) == 4
+
+
+@pytest.mark.parametrize("boz", ["kes", "cop"])
+def test_bozuk_onbellek_kaydi_yeniden_ayristirilir(tmp_path, monkeypatch, boz):
+    monkeypatch.setattr(excel_parser, "ONBELLEK", AyristirmaOnbellegi(tmp_path / "onbellek"))
+    yol = str(_ogrenci_kitabi(tmp_path / "a.xlsx"))
+
+    def aktar():
+        hatalar = []
+        parcalar = list(excel_parser.ogrenci_excel_akis(yol, parca_boyutu=10, hatalar=hatalar))
+        return parcalar, hatalar
+
+    ilk = aktar()
+    assert len(ilk[0]) > 1
+    (kayit,) = (tmp_path / "onbellek").rglob("*.bin")
+    veri = kayit.read_bytes()
+    # kes: akış son parçalarda kesik, ilk parçalar verildikten sonra EOFError;
+    # cop: gzip başlığı geçerli, gövde bozuk
+    kayit.write_bytes(veri[:-40] if boz == "kes" else veri[:10] + b"\x00" * (len(veri) - 10))
+
+    assert aktar() == ilk  # eksik ya da yinelenen parça yok
+    assert aktar() == ilk  # kayıt yeniden yazıldı ve okunabiliyor
@@ -0,0 +1,76 @@
+# tests/test_fakulte_yeniden_planlama.py
+# -*- coding: utf-8 -*-
+"""Fakülte geneli plandan sonra tek bölümün yeniden planlanması (ortak derslikler)."""
+import pytest
+
+import veri_deposu
+import veritabani
+from benchmark.olcum import _kisit
+from benchmark.sentetik import universite_uret, veritabanina_yaz
+from planner import planla
+
+YONETICI = {"rol": "admin", "bolum_id": None}
+
+
+@pytest.fixture
+def fakulte_programi(tmp_path, monkeypatch):
+    monkeypatch.setattr(veritabani, "VERITABANI_YOLU", tmp_path / "sinav.db")
+    veritabani.veritabani_baslat()
+    uni = universite_uret("M", 7)
+    veritabanina_yaz(uni)
+    kisit = _kisit(uni.gun_sayisi)
+    dersler, derslikler = veri_deposu.fakulte_plan_kaynagini_hazirla()
+    y, _, _ = planla(kisit, dersler, derslikler)
+    veri_deposu.fakulte_programini_kaydet(YONETICI, "vize", y, 15)
+    yield kisit, sorted({d["bolum_id"] for d in dersler})
+    veritabani.baglantilari_kapat()
+
+
+def _derslik_cakismasi_var_mi() -> bool:
+    with veritabani.baglanti() as vt:
+        return vt.execute("""
+            SELECT 1
+            FROM sinav_programi a
+            JOIN sinav_programi_derslik da ON da.sinav_id = a.id
+            JOIN sinav_programi_derslik db ON db.derslik_id = da.derslik_id AND db.sinav_id > a.id
+            JOIN sinav_programi b ON b.id = db.sinav_id AND b.sinav_turu = a.sinav_turu
+            WHERE a.bitis > b.baslangic AND b.bitis > a.baslangic
+            LIMIT 1
+        """).fetchone() is not None
+
+
+def _ortak_derslik_kullanimi_var_mi() -> bool:
+    with veritabani.baglanti() as vt:
+        return vt.execute("""
+            SELECT 1
+            FROM sinav_programi sp
+            JOIN sinav_programi_derslik spd ON spd.sinav_id = sp.id
+            JOIN derslikler d ON d.id = spd.derslik_id
+            WHERE d.bolum_id <> sp.bolum_id
+            LIMIT 1
+        """).fetchone() is not None
+
+
+@pytest.mark.parametrize("motor", ["acgozlu", "graf", "kesin", "portfoy"])
+def test_fakulte_planindan_sonra_bolum_yeniden_planlanir(fakulte_programi, motor):
+    kisit, bolumler = fakulte_programi
+    assert _ortak_derslik_kullanimi_var_mi()  # senaryo anlamlı: bölümler derslik paylaşıyor
+
+    for bolum_id in bolumler:
+        dersler, derslikler = veri_deposu.plan_kaynagini_hazirla(bolum_id, "vize")
+        y, _, fatal = planla(kisit, dersler, derslikler, motor=motor, sure_siniri_sn=5)
+        assert not fatal
+        with veritabani.islem():
+            veri_deposu.sinav_programini_temizle(bolum_id, "vize")
+            veri_deposu.sinav_programi_kaydet(bolum_id, "vize", y, 15)
+
+    assert not _derslik_cakismasi_var_mi()
+
+
+def test_koordinator_fakulte_programini_yazamaz(fakulte_programi):
+    _, bolumler = fakulte_programi
+    koordinator = {"rol": "koordinator", "bolum_id": bolumler[0]}
+    with pytest.raises(PermissionError):
+        veri_deposu.fakulte_programini_kaydet(koordinator, "vize", [], 15)
+    with pytest.raises(PermissionError):
+        veri_deposu.fakulte_programini_kaydet(koordinator, "vize", [], 15, bolum_ids=bolumler)
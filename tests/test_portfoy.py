@@ -0,0 +1,47 @@
+# tests/test_portfoy.py
+# -*- coding: utf-8 -*-
+"""Portföy planlama: erken durma varyant sırasına bağlıdır, bitiş sırasına değil."""
+import pytest
+
+import veri_deposu
+import veritabani
+from benchmark.olcum import _kisit
+from benchmark.sentetik import universite_uret, veritabanina_yaz
+from planner import _kisitlari_coz
+from planlayici import portfoy
+
+
+@pytest.fixture
+def plan_girdisi(tmp_path, monkeypatch):
+    monkeypatch.setattr(veritabani, "VERITABANI_YOLU", tmp_path / "sinav.db")
+    veritabani.veritabani_baslat()
+    uni = universite_uret("S", 7)
+    veritabanina_yaz(uni)
+    dersler, derslikler = veri_deposu.fakulte_plan_kaynagini_hazirla()
+    yield _kisitlari_coz(_kisit(uni.gun_sayisi)), dersler, derslikler
+    veritabani.baglantilari_kapat()
+
+
+def _ters_sirada_calistir(girdi, varyantlar, isci_sayisi, topla, dur=None):
+    """Havuz yerine: varyantlar sondan başa biter (en kötü bitiş sırası)."""
+    portfoy._isci_baslat(*girdi)
+    try:
+        for i in reversed(range(len(varyantlar))):
+            if topla(i, portfoy._varyant_calistir(varyantlar[i])):
+                break
+    finally:
+        portfoy._ORTAK.clear()
+    return True
+
+
+def test_erken_durma_bitis_sirasindan_bagimsiz(plan_girdisi, monkeypatch):
+    k, dersler, derslikler = plan_girdisi
+    hedef = (len(dersler), 10 ** 9)  # her varyant hedefe ulaşır
+    sirali = portfoy.portfoy_planla(k, dersler, derslikler, tohum=3, isci_sayisi=1, hedef=hedef)
+
+    monkeypatch.setattr(portfoy, "_paralel_calistir", _ters_sirada_calistir)
+    ters = portfoy.portfoy_planla(k, dersler, derslikler, tohum=3, isci_sayisi=4, hedef=hedef)
+
+    assert sirali[3]["secilen"] == ters[3]["secilen"] == portfoy.varsayilan_varyantlar(tohum=3)[0].ad
+    assert sirali[:3] == ters[:3]
+    assert ters[3]["iptal"] == 0  # önceki varyantlar bitmeden durulmadı
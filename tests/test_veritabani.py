@@ -0,0 +1,40 @@
+# tests/test_veritabani.py
+# -*- coding: utf-8 -*-
+"""İç içe baglanti() kapsamları: içteki değişiklikler dıştakinin işlemine katılır."""
+import pytest
+
+import veritabani
+
+
+@pytest.fixture
+def vt_yolu(tmp_path, monkeypatch):
+    monkeypatch.setattr(veritabani, "VERITABANI_YOLU", tmp_path / "sinav.db")
+    veritabani.veritabani_baslat()
+    yield
+    veritabani.baglantilari_kapat()
+
+
+def _bolum_var_mi(ad: str) -> bool:
+    with veritabani.baglanti() as vt:
+        return vt.execute("SELECT 1 FROM bolumler WHERE ad=?", (ad,)).fetchone() is not None
+
+
+@pytest.mark.parametrize("dis", [veritabani.baglanti, veritabani.islem])
+def test_dis_kapsam_yazmadan_hata_verirse_ic_kapsam_geri_alinir(vt_yolu, dis):
+    with pytest.raises(RuntimeError):
+        with dis():
+            with veritabani.baglanti() as vt:
+                vt.execute("INSERT INTO bolumler(ad) VALUES ('İç')")
+            raise RuntimeError("dış kapsamda hata")
+    assert not _bolum_var_mi("İç")
+
+
+def test_ic_kapsam_hatasi_yalnizca_kendini_geri_alir(vt_yolu):
+    with veritabani.baglanti() as vt:
+        vt.execute("INSERT INTO bolumler(ad) VALUES ('Dış')")
+        with pytest.raises(RuntimeError):
+            with veritabani.baglanti() as ic:
+                ic.execute("INSERT INTO bolumler(ad) VALUES ('İç')")
+                raise RuntimeError("iç kapsamda hata")
+    assert _bolum_var_mi("Dış")
+    assert not _bolum_var_mi("İç")
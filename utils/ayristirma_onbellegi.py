@@ -0,0 +1,222 @@
+# utils/ayristirma_onbellegi.py
+# -*- coding: utf-8 -*-
+"""
+Excel ayrıştırma sonuçları için disk önbelleği.
+
+Anahtarlar dosya içeriğinin (ya da .xlsx içindeki tek bir sayfanın) SHA-256
+özeti ile ayrıştırıcı sürümünden üretilir; dosya adı/konumu önemsizdir. Her
+kayıt, ardışık pickle nesnelerinden oluşan gzip sıkıştırılmış bir dosyadır;
+böylece tek bir sonuç da, parça parça üretilen bir akış da aynı biçimde
+saklanır ve akış, bellekte toplanmadan geri okunabilir.
+
+Toplam boyut `azami_bayt`ı aşınca en uzun süredir kullanılmayan kayıtlar
+(dosya mtime'ı) silinir; her okuma mtime'ı günceller (LRU).
+
+Önbellek hiçbir zaman içe aktarmayı bozmamalıdır: okuma/yazma hataları
+"önbellekte yok" sayılır.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import pickle
+import posixpath
+import re
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from xml.etree import ElementTree
+
+ONBELLEK_DIZINI = Path(__file__).resolve().parents[1] / "data" / "onbellek"
+AZAMI_BAYT = 64 * 1024 * 1024
+_UZANTI = ".bin"
+
+
+def dosya_ozeti(yol) -> str:
+    """Dosya içeriğinin SHA-256 özeti (hex)."""
+    h = hashlib.sha256()
+    with open(yol, "rb") as f:
+        for blok in iter(lambda: f.read(1 << 20), b""):
+            h.update(blok)
+    return h.hexdigest()
+
+
+_NS_ANA = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PAKET = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+# Paylaşılan dizgi tablosuna başvuran hücre: <c ... t="s" ...><v>N</v>
+_RE_PAYLASILAN = re.compile(rb'(<c\b[^>]*\bt="s"[^>]*>\s*<v>)(\d+)(</v>)')
+
+
+def _paylasilan_dizgiler(z: zipfile.ZipFile) -> List[bytes]:
+    try:
+        kok = ElementTree.fromstring(z.read("xl/sharedStrings.xml"))
+    except KeyError:
+        return []
+    return ["".join(t.text or "" for t in si.iter(f"{_NS_ANA}t")).encode("utf-8")
+            for si in kok.iter(f"{_NS_ANA}si")]
+
+
+def _bicim_ozeti(z: zipfile.ZipFile, kitap: ElementTree.Element) -> bytes:
+    """
+    Hücre değerlerinin yorumunu etkileyen, sayfa dışındaki parçalar: sayı/tarih
+    biçimleri (xl/styles.xml) ve tarih sistemi (workbook.xml'deki date1904).
+    """
+    h = hashlib.sha256()
+    try:
+        h.update(z.read("xl/styles.xml"))
+    except KeyError:
+        pass
+    pr = kitap.find(f"{_NS_ANA}workbookPr")
+    h.update(b"\0date1904=" + (pr.get("date1904", "") if pr is not None else "").encode("ascii"))
+    return h.digest()
+
+
+def _sayfa_ozeti(ad: str, xml: bytes, dizgiler: List[bytes], bicim: bytes = b"") -> str:
+    """Sayfa XML'inin özeti; dizgi tablosu indeksleri yerine dizgilerin kendisi kullanılır."""
+    h = hashlib.sha256(ad.encode("utf-8") + b"\0" + bicim)
+    son = 0
+    for m in _RE_PAYLASILAN.finditer(xml):
+        h.update(xml[son:m.end(1)])
+        n = int(m.group(2))
+        h.update(dizgiler[n] if n < len(dizgiler) else m.group(2))
+        son = m.start(3)
+    h.update(xml[son:])
+    return h.hexdigest()
+
+
+def sayfa_ozetleri(yol) -> Optional[Dict[str, str]]:
+    """
+    .xlsx için {sayfa_adi: özet}. Özet sayfanın kendi XML'inden, yalnızca
+    başvurduğu paylaşılan dizgilerden ve biçim bilgisinden (styles.xml, 1904
+    tarih sistemi; bkz. _bicim_ozeti) üretilir; başka bir sayfada yapılan
+    değişiklik (dizgi tablosu yeniden numaralansa bile) bu sayfayı geçersiz
+    kılmaz, yalnızca hücre biçimlerini değiştirmek ise kılar. .xlsx değilse
+    ya da okunamazsa None.
+    """
+    try:
+        with zipfile.ZipFile(yol) as z:
+            dizgiler = _paylasilan_dizgiler(z)
+
+            hedefler = {}
+            for r in ElementTree.fromstring(z.read("xl/_rels/workbook.xml.rels")).iter(f"{_NS_PAKET}Relationship"):
+                hedef = r.get("Target", "")
+                hedef = hedef.lstrip("/") if hedef.startswith("/") else posixpath.normpath(posixpath.join("xl", hedef))
+                hedefler[r.get("Id")] = hedef
+
+            kitap = ElementTree.fromstring(z.read("xl/workbook.xml"))
+            bicim = _bicim_ozeti(z, kitap)
+            ozetler: Dict[str, str] = {}
+            for s in kitap.iter(f"{_NS_ANA}sheet"):
+                ad = s.get("name")
+                ozetler[ad] = _sayfa_ozeti(ad, z.read(hedefler[s.get(f"{_NS_REL}id")]), dizgiler, bicim)
+            return ozetler
+    except Exception:
+        return None
+
+
+class AyristirmaOnbellegi:
+    """Anahtar → gzip'li pickle akışı; boyut sınırlı LRU."""
+
+    def __init__(self, dizin=ONBELLEK_DIZINI, azami_bayt: int = AZAMI_BAYT):
+        self.dizin = Path(dizin)
+        self.azami_bayt = azami_bayt
+
+    def _yol(self, anahtar: str) -> Path:
+        return self.dizin / (anahtar + _UZANTI)
+
+    # ---------------- okuma ----------------
+    def akis_getir(self, anahtar: str) -> Optional[Iterator[Any]]:
+        """
+        Kayıtlı nesneleri sırayla üreten yineleyici; kayıt yoksa None. Kayıt
+        yarım ya da bozuksa yineleme sırasında hata fırlatır (EOFError,
+        gzip.BadGzipFile, zlib.error, pickle.UnpicklingError...); kayıt sessizce
+        kısalmaz. Çağıran kaydı silip yeniden üretmelidir.
+        """
+        yol = self._yol(anahtar)
+        try:
+            os.utime(yol)
+        except OSError:
+            return None
+        return self._oku(yol)
+
+    @staticmethod
+    def _oku(yol: Path) -> Iterator[Any]:
+        with gzip.open(yol, "rb") as f:
+            # temiz son: peek boş döner; yarım akışta peek/load EOFError fırlatır
+            while f.peek(1):
+                yield pickle.load(f)
+
+    def getir(self, anahtar: str) -> Optional[Any]:
+        """Tek nesnelik kaydı döndürür; yoksa ya da bozuksa None."""
+        akis = self.akis_getir(anahtar)
+        if akis is None:
+            return None
+        try:
+            return next(akis, None)
+        except Exception:
+            self.sil(anahtar)
+            return None
+
+    # ---------------- yazma ----------------
+    @contextmanager
+    def akis_yaz(self, anahtar: str):
+        """
+        `with onbellek.akis_yaz(k) as yaz: yaz(nesne) ...` — blok hatasız
+        biterse kayıt atomik olarak yerine konur, aksi halde atılır.
+        """
+        yol = self._yol(anahtar)
+        gecici = yol.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.dizin.mkdir(parents=True, exist_ok=True)
+            f = gzip.open(gecici, "wb", compresslevel=3)
+        except OSError:
+            yield lambda nesne: None
+            return
+        try:
+            with f:
+                yield lambda nesne: pickle.dump(nesne, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(gecici, yol)
+        except BaseException:
+            try:
+                gecici.unlink()
+            except OSError:
+                pass
+            raise
+        self._tahliye()
+
+    def koy(self, anahtar: str, deger: Any) -> None:
+        try:
+            with self.akis_yaz(anahtar) as yaz:
+                yaz(deger)
+        except Exception:
+            pass
+
+    def sil(self, anahtar: str) -> None:
+        try:
+            self._yol(anahtar).unlink()
+        except OSError:
+            pass
+
+    def _tahliye(self) -> None:
+        """Toplam boyut sınırı aşılıyorsa en eski erişilen kayıtları siler."""
+        try:
+            kayitlar = []
+            for p in self.dizin.glob("*" + _UZANTI):
+                st = p.stat()
+                kayitlar.append((st.st_mtime, st.st_size, p))
+        except OSError:
+            return
+        toplam = sum(k[1] for k in kayitlar)
+        for _, boyut, p in sorted(kayitlar, key=lambda k: k[0]):
+            if toplam <= self.azami_bayt:
+                break
+            try:
+                p.unlink()
+                toplam -= boyut
+            except OSError:
+                pass
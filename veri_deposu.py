@@ -2,11 +2,16 @@
 from __future__ import annotations
 
 from datetime import datetime, date, time, timedelta
-from typing import List, Dict, Tuple, Set, Optional
+from itertools import islice
+from time import perf_counter
+from typing import List, Dict, Tuple, Set, Optional, Iterable, Iterator
 import re
+import sqlite3
 
 from veritabani import baglanti
 from raporlar.sinav_programi_excel import programi_xlsx_yaz
+from raporlar.cakisma_raporu import cakisma_raporu_xlsx_yaz
+from planlayici.kayit_matrisi import KayitMatrisi
 
 # -------- doğrulamalar / yardımcılar --------
 RE_DERSKODU = re.compile(r"^[A-Za-z]{1,6}[-/]?\d{1,4}[A-Za-z0-9\-]*$")
@@ -102,17 +107,19 @@ def bolum_getir(bolum_id: int):
 def _zaman_cakisiyor_mu(bas1: datetime, bit1: datetime, bas2: datetime, bit2: datetime) -> bool:
     return not (bit1 <= bas2 or bit2 <= bas1)
 
-def _derslikte_cakisiyor_mu(vt, bolum_id: int, sinav_turu: str,
+def _derslikte_cakisiyor_mu(vt, sinav_turu: str,
                             derslik_id: int, bas_dt: datetime, bit_dt: datetime) -> bool:
+    # Derslik fiziksel bir yerdir: fakülte geneli planlamada başka bölümün
+    # sınavı da aynı derslikte olabilir, bu yüzden bölüm süzülmez.
     q = vt.execute(
         """
         SELECT sp.baslangic, sp.bitis
         FROM sinav_programi sp
         JOIN sinav_programi_derslik spd ON spd.sinav_id = sp.id
-        WHERE sp.bolum_id=? AND sp.sinav_turu=? AND spd.derslik_id=?
+        WHERE sp.sinav_turu=? AND spd.derslik_id=?
           AND NOT (sp.bitis <= ? OR sp.baslangic >= ?)
         """,
-        (bolum_id, sinav_turu, derslik_id,
+        (sinav_turu, derslik_id,
          bas_dt.isoformat(timespec="minutes"),
          bit_dt.isoformat(timespec="minutes"))
     ).fetchone()
@@ -164,8 +171,11 @@ def derslik_guncelle(koordinator, derslik_id, derslik_kodu, derslik_adi, kapasit
 def derslik_sil(koordinator, derslik_id):
     if koordinator["rol"] != "koordinator":
         raise PermissionError("Silme yetkisi yalnızca bölüm koordinatöründedir.")
-    with baglanti() as vt:
-        vt.execute("DELETE FROM derslikler WHERE id=? AND bolum_id=?", (derslik_id, koordinator["bolum_id"]))
+    try:
+        with baglanti() as vt:
+            vt.execute("DELETE FROM derslikler WHERE id=? AND bolum_id=?", (derslik_id, koordinator["bolum_id"]))
+    except sqlite3.IntegrityError:
+        raise ValueError("Bu derslik sınav programında veya oturma planında kullanılıyor; önce ilgili programı temizleyin.")
 
 def derslik_ara_id(koordinator, sinif_id):
     if koordinator["rol"] != "koordinator":
@@ -180,58 +190,191 @@ def derslik_ara_id(koordinator, sinif_id):
 # =========================================================
 # 🔹 Ders & Öğrenci (Excel ile toplu)
 # =========================================================
-def dersleri_toplu_yaz(bolum_id: int, ders_listesi: list[dict]):
-    with baglanti() as vt:
-        for d in ders_listesi:
-            kod = (d.get('kod') or "").strip()
-            ad  = (d.get('ad')  or "").strip()
-            hoca = (d.get('hoca') or None)
-            sinif = d.get('sinif'); tur = d.get('tur')
+AKTARIM_PARCA = 5000  # staging tablosuna tek executemany ile giden satır sayısı
+
+_AKTARIM_TABLOLARI = (
+    "CREATE TEMP TABLE IF NOT EXISTS _aktarim_ders("
+    "kod TEXT PRIMARY KEY, ad TEXT NOT NULL, hoca TEXT, sinif INTEGER, tur TEXT)",
+    "CREATE TEMP TABLE IF NOT EXISTS _aktarim_ogrenci("
+    "ogr_no TEXT PRIMARY KEY, adsoyad TEXT, sinif INTEGER)",
+)
+
+def _parcalar(satirlar: Iterable, boyut: int = AKTARIM_PARCA) -> Iterator[list]:
+    """Herhangi bir yinelenebiliri en fazla `boyut` elemanlı listelere böler."""
+    it = iter(satirlar)
+    while True:
+        parca = list(islice(it, boyut))
+        if not parca:
+            return
+        yield parca
+
+def _aktarim_ozeti(satir: int, atlanan: int, bas: float, **ek) -> dict:
+    sure = max(perf_counter() - bas, 1e-9)
+    return {"satir": satir, "atlanan": atlanan, "sure_sn": round(sure, 3),
+            "satir_sn": int(satir / sure), **ek}
+
+def _ders_satiri(d: dict) -> Optional[tuple]:
+    """Ders satırını doğrular/düzeltir → (kod, ad, hoca, sinif, tur) ya da None (atla)."""
+    kod = (d.get('kod') or "").strip()
+    ad  = (d.get('ad')  or "").strip()
+    hoca = (d.get('hoca') or None)
+    sinif = d.get('sinif'); tur = d.get('tur')
+
+    if not kod or not ad:
+        return None
+    if _is_heading_like(kod) or _is_heading_like(ad) or (hoca and _is_heading_like(hoca)):
+        return None
+    if not RE_DERSKODU.match(kod):
+        return None
 
-            if not kod or not ad:
-                continue
-            if _is_heading_like(kod) or _is_heading_like(ad) or (hoca and _is_heading_like(hoca)):
-                continue
-            if not RE_DERSKODU.match(kod):
-                continue
+    # güçlü swap
+    if _looks_like_person(ad) or (not _looks_like_course(ad) and _looks_like_course(hoca)):
+        ad, hoca = (hoca, ad) if (hoca or ad) else (ad, hoca)
+    if not ad:
+        return None
+    return (kod, ad, hoca, sinif, tur)
+
+def _tekille(satirlar: Iterable[tuple], ezilen: int) -> list[tuple]:
+    """
+    Aynı anahtarlı (ilk alan) satırları sırayla birleştirir: ilk `ezilen` alan
+    son değeri alır, kalanlar yalnızca yeni değer None değilse güncellenir;
+    satır satır upsert ile aynı sonucu verir.
+    """
+    birlesik: dict = {}
+    for s in satirlar:
+        eski = birlesik.get(s[0])
+        if eski is not None:
+            s = s[:ezilen] + tuple(y if y is not None else e for y, e in zip(s[ezilen:], eski[ezilen:]))
+        birlesik[s[0]] = s
+    return list(birlesik.values())
+
+def _aktarim_tablolari(vt) -> None:
+    for sql in _AKTARIM_TABLOLARI:
+        vt.execute(sql)
+
+def _dersleri_parca_yaz(vt, bolum_id: int, satirlar: list[tuple]) -> None:
+    vt.execute("DELETE FROM _aktarim_ders")
+    vt.executemany("INSERT INTO _aktarim_ders(kod,ad,hoca,sinif,tur) VALUES(?,?,?,?,?)", satirlar)
+    # "WHERE true": SELECT'li upsert'te ON CONFLICT'in JOIN koşulu sanılmaması için
+    vt.execute("""
+        INSERT INTO dersler(bolum_id,kod,ad,hoca,sinif,tur)
+        SELECT ?, kod, ad, hoca, sinif, tur FROM _aktarim_ders WHERE true
+        ON CONFLICT(bolum_id,kod) DO UPDATE SET
+          ad=excluded.ad,
+          hoca=COALESCE(excluded.hoca, dersler.hoca),
+          sinif=COALESCE(excluded.sinif, dersler.sinif),
+          tur=COALESCE(excluded.tur, dersler.tur)
+    """, (bolum_id,))
+    vt.execute("DELETE FROM _aktarim_ders")
+
+def _ogrencileri_parca_yaz(vt, bolum_id: int, satirlar: list[tuple]) -> dict:
+    """Parçayı upsert eder; dönüş: bu parçadaki öğrencilerin {ogr_no: id} eşlemesi."""
+    vt.execute("DELETE FROM _aktarim_ogrenci")
+    vt.executemany("INSERT INTO _aktarim_ogrenci(ogr_no,adsoyad,sinif) VALUES(?,?,?)", satirlar)
+    vt.execute("""
+        INSERT INTO ogrenciler(bolum_id,ogr_no,adsoyad,sinif)
+        SELECT ?, ogr_no, COALESCE(adsoyad, ''), sinif FROM _aktarim_ogrenci WHERE true
+        ON CONFLICT(bolum_id,ogr_no) DO UPDATE SET
+          adsoyad=COALESCE(NULLIF(excluded.adsoyad, ''), ogrenciler.adsoyad),
+          sinif=COALESCE(excluded.sinif, ogrenciler.sinif)
+    """, (bolum_id,))
+    ids = dict(vt.execute("""
+        SELECT o.ogr_no, o.id FROM _aktarim_ogrenci t
+        JOIN ogrenciler o ON o.bolum_id=? AND o.ogr_no=t.ogr_no
+    """, (bolum_id,)).fetchall())
+    vt.execute("DELETE FROM _aktarim_ogrenci")
+    return ids
+
+def _kayitlari_parca_yaz(vt, ogr_map: dict, ders_map: dict, satirlar: list[tuple]) -> int:
+    # Birincil anahtar sırasıyla eklemek B-ağacına sıralı yazım sağlar
+    ciftler = sorted({(ogr_map[o], ders_map[k]) for o, k in satirlar if o in ogr_map and k in ders_map})
+    vt.executemany("INSERT OR IGNORE INTO ogrenci_ders(ogrenci_id, ders_id) VALUES(?,?)", ciftler)
+    return len(ciftler)
+
+def dersleri_toplu_yaz(bolum_id: int, ders_listesi: Iterable[dict]) -> dict:
+    """
+    Dersleri doğrulayıp tek geçişte normalize eder, parça parça staging
+    tablosuna executemany ile yazar ve küme tabanlı tek upsert ile aktarır.
+    Dönüş: {satir, atlanan, sure_sn, satir_sn}
+    """
+    bas = perf_counter()
+    satir = 0
+    hazir: list[tuple] = []
+    for d in ders_listesi:
+        satir += 1
+        s = _ders_satiri(d)
+        if s is not None:
+            hazir.append(s)
+    hazir = _tekille(hazir, ezilen=2)
 
-            # güçlü swap
-            if _looks_like_person(ad) or (not _looks_like_course(ad) and _looks_like_course(hoca)):
-                ad, hoca = (hoca, ad) if (hoca or ad) else (ad, hoca)
+    with baglanti() as vt:
+        _aktarim_tablolari(vt)
+        for parca in _parcalar(hazir):
+            _dersleri_parca_yaz(vt, bolum_id, parca)
+    return _aktarim_ozeti(satir, satir - len(hazir), bas, ders=len(hazir))
+
+def _ogrenci_satirlari(ogrenciler: Iterable[dict]) -> list[tuple]:
+    # Aynı öğrenci birden çok kez gelirse boş olmayan son ad/sınıf geçerlidir
+    return _tekille(((o.get('ogr_no'), o.get('adsoyad'), o.get('sinif'))
+                     for o in ogrenciler if o.get('ogr_no')), ezilen=1)
+
+def ogrencileri_toplu_yaz_ve_kayitla(bolum_id: int, ogrenciler: Iterable[dict],
+                                     kayitlar: Iterable[tuple[str, str]]) -> dict:
+    """
+    Öğrencileri staging tablosu ve küme tabanlı upsert ile, ardından
+    (ogr_no, ders_kod) kayıtlarını toplu yazar. Kayıtların id'leri tek seferde
+    okunan ogr_no/kod eşlemeleriyle çözülür; geçersiz ders kodlu ya da
+    eşleşmeyen kayıtlar atlanır.
+    Dönüş: {satir, atlanan, sure_sn, satir_sn, ogrenci, kayit}
+    """
+    bas = perf_counter()
+    ogr_satir = _ogrenci_satirlari(ogrenciler)
+    kayit_satir = 0
+    kayit_say = 0
 
-            vt.execute("""
-                INSERT INTO dersler(bolum_id,kod,ad,hoca,sinif,tur)
-                VALUES(?,?,?,?,?,?)
-                ON CONFLICT(bolum_id,kod) DO UPDATE SET
-                  ad=excluded.ad,
-                  hoca=COALESCE(excluded.hoca, dersler.hoca),
-                  sinif=COALESCE(excluded.sinif, dersler.sinif),
-                  tur=COALESCE(excluded.tur, dersler.tur)
-            """, (bolum_id, kod, ad, hoca, sinif, tur))
-
-def ogrencileri_toplu_yaz_ve_kayitla(bolum_id: int, ogrenciler: list[dict], kayitlar: list[tuple[str, str]]):
-    with baglanti() as vt:
-        for o in ogrenciler:
-            vt.execute("""
-                INSERT INTO ogrenciler(bolum_id,ogr_no,adsoyad,sinif)
-                VALUES(?,?,?,?)
-                ON CONFLICT(bolum_id,ogr_no) DO UPDATE SET
-                  adsoyad=excluded.adsoyad,
-                  sinif=COALESCE(excluded.sinif, ogrenciler.sinif)
-            """, (bolum_id, o.get('ogr_no'), o.get('adsoyad'), o.get('sinif')))
-
-        ogr_map = {row["ogr_no"]: row["id"]
-                   for row in vt.execute("SELECT id, ogr_no FROM ogrenciler WHERE bolum_id=?", (bolum_id,))}
-        ders_map = {row["kod"]: row["id"]
-                    for row in vt.execute("SELECT id, kod FROM dersler WHERE bolum_id=?", (bolum_id,))}
-
-        for ogr_no, ders_kod in kayitlar:
-            if not RE_DERSKODU.match(ders_kod or ""):
-                continue
-            ogr_id = ogr_map.get(ogr_no)
-            ders_id = ders_map.get(ders_kod)
-            if ogr_id and ders_id:
-                vt.execute("INSERT OR IGNORE INTO ogrenci_ders(ogrenci_id, ders_id) VALUES(?,?)", (ogr_id, ders_id))
+    with baglanti() as vt:
+        _aktarim_tablolari(vt)
+        for parca in _parcalar(ogr_satir):
+            _ogrencileri_parca_yaz(vt, bolum_id, parca)
+        ogr_map = dict(vt.execute("SELECT ogr_no, id FROM ogrenciler WHERE bolum_id=?", (bolum_id,)).fetchall())
+        ders_map = dict(vt.execute("SELECT kod, id FROM dersler WHERE bolum_id=?", (bolum_id,)).fetchall())
+        for parca in _parcalar(kayitlar):
+            kayit_satir += len(parca)
+            gecerli = [(ogr_no, kod) for ogr_no, kod in parca if RE_DERSKODU.match(kod or "")]
+            if gecerli:
+                kayit_say += _kayitlari_parca_yaz(vt, ogr_map, ders_map, gecerli)
+
+    satir = len(ogr_satir) + kayit_satir
+    return _aktarim_ozeti(satir, kayit_satir - kayit_say, bas,
+                          ogrenci=len(ogr_satir), kayit=kayit_say)
+
+def ogrenci_akisini_yaz(bolum_id: int,
+                       akis: Iterable[tuple[list[dict], list[tuple[str, str]]]]) -> dict:
+    """
+    excel_parser.ogrenci_excel_akis gibi (ogrenciler, kayitlar) parçaları üreten
+    bir akışı, parçalar geldikçe tek işlem içinde yazar. Kayıtların öğrencileri
+    aynı parçada bulunmalıdır; bellekte yalnızca bir parça ve ders eşlemesi tutulur.
+    Dönüş: ogrencileri_toplu_yaz_ve_kayitla ile aynı.
+    """
+    bas = perf_counter()
+    ogr_say = kayit_satir = kayit_say = 0
+
+    with baglanti() as vt:
+        _aktarim_tablolari(vt)
+        ders_map = dict(vt.execute("SELECT kod, id FROM dersler WHERE bolum_id=?", (bolum_id,)).fetchall())
+        for ogrenciler, kayitlar in akis:
+            ogr_map: dict = {}
+            ogr_satir = _ogrenci_satirlari(ogrenciler)
+            ogr_say += len(ogr_satir)
+            for parca in _parcalar(ogr_satir):
+                ogr_map.update(_ogrencileri_parca_yaz(vt, bolum_id, parca))
+            kayit_satir += len(kayitlar)
+            gecerli = [(ogr_no, kod) for ogr_no, kod in kayitlar if RE_DERSKODU.match(kod or "")]
+            if gecerli:
+                kayit_say += _kayitlari_parca_yaz(vt, ogr_map, ders_map, gecerli)
+
+    return _aktarim_ozeti(ogr_say + kayit_satir, kayit_satir - kayit_say, bas,
+                          ogrenci=ogr_say, kayit=kayit_say)
 
 def ogrenci_ara_ve_dersleri_getir(bolum_id: int, ogr_no: str):
     with baglanti() as vt:
@@ -257,7 +400,7 @@ def _program_satiri_yaz(vt, bolum_id: int, ders_id: int, sinav_turu: str,
                         bas_dt: datetime, bit_dt: datetime, bekleme_dk: int,
                         derslik_ids: list[int]) -> int:
     for dl in _ensure_iterable(derslik_ids):
-        if _derslikte_cakisiyor_mu(vt, bolum_id, sinav_turu, int(dl), bas_dt, bit_dt):
+        if _derslikte_cakisiyor_mu(vt, sinav_turu, int(dl), bas_dt, bit_dt):
             raise ValueError(
                 f"Derslik çakışması: derslik_id={dl} {bas_dt:%Y-%m-%d %H:%M}–{bit_dt:%H:%M} saatinde başka bir sınavla çakışıyor."
             )
@@ -276,7 +419,178 @@ def _program_satiri_yaz(vt, bolum_id: int, ders_id: int, sinav_turu: str,
         vt.execute("INSERT INTO sinav_programi_derslik(sinav_id, derslik_id) VALUES(?,?)", (sp_id, int(dl)))
     return sp_id
 
-def plan_kaynagini_hazirla(bolum_id: int) -> tuple[list[dict], list[dict]]:
+def _derslik_cakismalarini_denetle(vt, sinav_turu: str,
+                                   satirlar: list[tuple[int, int, str, str, int, list[int]]]) -> None:
+    """
+    Toplu kaydın derslik çakışma kontrolü, sınav başına sorgu olmadan:
+    partinin kullandığı dersliklerde zaman penceresine düşen kayıtlı sınavlar
+    tek sorguyla okunur, her derslik için aralıklar başlangıca göre sıralanıp
+    taranır. Yalnızca partideki bir sınavı içeren çakışmalar hatadır
+    (veritabanında zaten var olan çakışmalar _derslikte_cakisiyor_mu'daki gibi
+    yok sayılır). ISO metinleri (YYYY-MM-DDTHH:MM) sözlük sırasıyla karşılaştırılır.
+    """
+    aralik: dict[int, list[tuple[str, str, bool]]] = {}
+    for _, _, bas, bit, _, dl_ids in satirlar:
+        for dl in dl_ids:
+            aralik.setdefault(dl, []).append((bas, bit, True))
+    if not aralik:
+        return
+    dl_ids = sorted(aralik)
+    q = ",".join("?" * len(dl_ids))
+    for r in vt.execute(f"""
+        SELECT spd.derslik_id, sp.baslangic, sp.bitis
+        FROM sinav_programi sp
+        JOIN sinav_programi_derslik spd ON spd.sinav_id = sp.id
+        WHERE sp.sinav_turu=? AND spd.derslik_id IN ({q})
+          AND sp.bitis > ? AND sp.baslangic < ?
+    """, [sinav_turu, *dl_ids,
+          min(a[0] for l in aralik.values() for a in l),
+          max(a[1] for l in aralik.values() for a in l)]):
+        aralik[r["derslik_id"]].append((r["baslangic"], r["bitis"], False))
+
+    for dl, liste in aralik.items():
+        liste.sort()
+        son_bit = son_yeni_bit = ""  # tüm aralıkların / partideki aralıkların en geç bitişi
+        for bas, bit, yeni in liste:
+            if (son_bit > bas) if yeni else (son_yeni_bit > bas):
+                raise ValueError(
+                    f"Derslik çakışması: derslik_id={dl} {bas.replace('T', ' ')}–{bit[11:]} saatinde başka bir sınavla çakışıyor."
+                )
+            son_bit = max(son_bit, bit)
+            if yeni:
+                son_yeni_bit = max(son_yeni_bit, bit)
+
+def _programi_toplu_yaz(vt, sinav_turu: str, yerlestirmeler: Iterable[tuple[int, dict]], bekleme_dk: int) -> int:
+    """
+    (bolum_id, yerleştirme) çiftlerini kümesel olarak yazar: derslik
+    çakışmaları bellekte denetlenir, sinav_programi ve sinav_programi_derslik
+    executemany ile eklenir. Yeni sınav id'leri (bolum_id, ders_id, sinav_turu)
+    tekil indeksinden tek sorguyla geri okunur. Çağıranın işlemi içinde
+    çalışır; herhangi bir hata tüm partiyi geri aldırır. Yazılan sınav sayısı döner.
+    """
+    satirlar = []
+    for bolum_id, y in yerlestirmeler:
+        bas_dt, bit_dt = y["baslangic"], y["bitis"]
+        satirlar.append((int(bolum_id), int(y["ders_id"]),
+                         bas_dt.isoformat(timespec="minutes"), bit_dt.isoformat(timespec="minutes"),
+                         max(1, int(round((bit_dt - bas_dt).total_seconds() / 60.0))),
+                         [int(x) for x in _ensure_iterable(y.get("derslik_ids"))]))
+    if not satirlar:
+        return 0
+    _derslik_cakismalarini_denetle(vt, sinav_turu, satirlar)
+
+    vt.executemany("""
+        INSERT INTO sinav_programi(bolum_id, ders_id, sinav_turu, baslangic, bitis, sure_dk, bekleme_dk)
+        VALUES(?,?,?,?,?,?,?)
+    """, [(b, d, sinav_turu, bas, bit, sure, int(bekleme_dk)) for b, d, bas, bit, sure, _ in satirlar])
+
+    bolum_ids = sorted({b for b, *_ in satirlar})
+    q = ",".join("?" * len(bolum_ids))
+    sinav_id = {(r["bolum_id"], r["ders_id"]): r["id"] for r in vt.execute(
+        f"SELECT id, bolum_id, ders_id FROM sinav_programi WHERE sinav_turu=? AND bolum_id IN ({q})",
+        [sinav_turu, *bolum_ids]
+    )}
+    vt.executemany("INSERT INTO sinav_programi_derslik(sinav_id, derslik_id) VALUES(?,?)",
+                   [(sinav_id[(b, d)], dl) for b, d, _, _, _, dl_ids in satirlar for dl in dl_ids])
+    return len(satirlar)
+
+def _ders_kaynaklari(vt, bolum_id: int) -> list[dict]:
+    """
+    Bölümün dersleri + her dersin öğrenci id kümesi ve öğrenci sayısı.
+    Sabit sayıda sorgu: dersler ve tüm kayıtlar (öğrenci sınıfıyla birlikte) tek seferde okunur.
+    Ders sinif bilgisi yoksa öğrencilerinin en sık görülen sınıfı kullanılır (eşitlikte küçük olan).
+    """
+    return _ders_kaynaklari_coklu(vt, [bolum_id])
+
+def _ders_kaynaklari_coklu(vt, bolum_ids: list[int], fakulte: bool = False) -> list[dict]:
+    """
+    _ders_kaynaklari'nın birden çok bölüm için olanı. fakulte=True ise:
+      - her ders "bolum_id" alanını da taşır
+      - öğrenciler ogr_no ile birleştirilir: servis dersi alan öğrenci her
+        bölümde ayrı satırdır, ogr_ids'de hepsi aynı (en küçük) id ile görünür
+    """
+    q = ",".join("?" * len(bolum_ids))
+    dersler = vt.execute(f"""
+        SELECT d.id, d.bolum_id, d.kod, d.ad, d.hoca, d.sinif
+        FROM dersler d
+        WHERE d.bolum_id IN ({q})
+        ORDER BY d.kod, d.bolum_id
+    """, bolum_ids).fetchall()
+
+    ortak_id: Dict[int, int] = {}
+    if fakulte:
+        ilk: Dict[str, int] = {}
+        for r in vt.execute(f"SELECT id, ogr_no FROM ogrenciler WHERE bolum_id IN ({q}) ORDER BY id", bolum_ids):
+            ortak_id[r["id"]] = ilk.setdefault(r["ogr_no"], r["id"])
+
+    ogr_ids: Dict[int, Set[int]] = {d["id"]: set() for d in dersler}
+    sinif_frek: Dict[int, Dict[int, int]] = {d["id"]: {} for d in dersler if d["sinif"] is None}
+    for r in vt.execute(f"""
+        SELECT od.ders_id, od.ogrenci_id, o.sinif
+        FROM ogrenci_ders od
+        JOIN dersler d ON d.id = od.ders_id
+        LEFT JOIN ogrenciler o ON o.id = od.ogrenci_id
+        WHERE d.bolum_id IN ({q})
+    """, bolum_ids):
+        oid = r["ogrenci_id"]
+        ogr_ids[r["ders_id"]].add(ortak_id.get(oid, oid))
+        frek = sinif_frek.get(r["ders_id"])
+        if frek is None or r["sinif"] is None:
+            continue
+        try:
+            s = int(r["sinif"])
+        except Exception:
+            continue
+        frek[s] = frek.get(s, 0) + 1
+
+    out = []
+    for d in dersler:
+        ders_sinif = d["sinif"]
+        frek = sinif_frek.get(d["id"])
+        if ders_sinif is None and frek:
+            # en sık görülen sınıfı ata
+            ders_sinif = sorted(frek.items(), key=lambda x: (-x[1], x[0]))[0][0]
+        ids = ogr_ids[d["id"]]
+        satir = {
+            "id": d["id"], "kod": d["kod"], "ad": d["ad"],
+            "hoca": d["hoca"], "sinif": ders_sinif,
+            "ogr_say": len(ids), "ogr_ids": ids
+        }
+        if fakulte:
+            satir["bolum_id"] = d["bolum_id"]
+        out.append(satir)
+    return out
+
+def _derslik_dolulugu(vt, derslikler, bolum_id: int, sinav_turu: str) -> list[dict]:
+    """
+    Derslik satırları sözlük olarak, her birinde "dolu": başka bölümlerin bu
+    türdeki o derslikte kayıtlı sınavları [(baslangic, bitis)]. Fakülte geneli
+    bir plandan sonra bölüm tek başına yeniden planlanırken planlayıcı bu
+    aralıkları sabit sayar (bkz. planner._derslik_zamani); böylece kayıtta
+    derslik çakışmasıyla geri alınacak bir program üretilmez.
+    """
+    out = [dict(dl, dolu=[]) for dl in derslikler]
+    if not out:
+        return out
+    by_id = {dl["id"]: dl for dl in out}
+    q = ",".join("?" * len(by_id))
+    for r in vt.execute(f"""
+        SELECT spd.derslik_id, sp.baslangic, sp.bitis
+        FROM sinav_programi sp
+        JOIN sinav_programi_derslik spd ON spd.sinav_id = sp.id
+        WHERE sp.sinav_turu=? AND sp.bolum_id<>? AND spd.derslik_id IN ({q})
+        ORDER BY spd.derslik_id, sp.baslangic
+    """, [sinav_turu, bolum_id, *by_id]):
+        by_id[r["derslik_id"]]["dolu"].append(
+            (datetime.fromisoformat(r["baslangic"]), datetime.fromisoformat(r["bitis"])))
+    return out
+
+def plan_kaynagini_hazirla(bolum_id: int, sinav_turu: Optional[str] = None) -> tuple[list[dict], list[dict]]:
+    """
+    Bölümün planlama kaynağı (dersler, derslikler). sinav_turu verilirse
+    derslikler başka bölümlerin o türdeki sınavlarıyla dolu aralıklarını da
+    taşır (bkz. _derslik_dolulugu).
+    """
     with baglanti() as vt:
         derslikler = vt.execute("""
             SELECT id, derslik_kodu, kapasite, enine, boyuna
@@ -284,53 +598,102 @@ def plan_kaynagini_hazirla(bolum_id: int) -> tuple[list[dict], list[dict]]:
             WHERE bolum_id=?
             ORDER BY kapasite DESC
         """, (bolum_id,)).fetchall()
-        dersler = vt.execute("""
-            SELECT d.id, d.kod, d.ad, d.hoca, d.sinif
-            FROM dersler d WHERE d.bolum_id=? ORDER BY d.kod
-        """, (bolum_id,)).fetchall()
-
-        out = []
-        for d in dersler:
-            ogr_ids_rows = vt.execute(
-                "SELECT ogrenci_id FROM ogrenci_ders WHERE ders_id=?", (d["id"],)
-            ).fetchall()
-            ogr_ids = {r["ogrenci_id"] for r in ogr_ids_rows}
-
-            # --- YENİ: ders sinif bilgisi yoksa öğrencilerin sinif modunu kullan ---
-            ders_sinif = d["sinif"]
-            if ders_sinif is None and ogr_ids:
-                # öğrencilerin sinif değerlerini topla
-                sinif_rows = vt.execute(
-                    f"SELECT sinif FROM ogrenciler WHERE id IN ({','.join(['?']*len(ogr_ids))})",
-                    tuple(ogr_ids)
-                ).fetchall()
-                frek: Dict[int, int] = {}
-                for r in sinif_rows:
-                    try:
-                        if r["sinif"] is None:
-                            continue
-                        s = int(r["sinif"])
-                        frek[s] = frek.get(s, 0) + 1
-                    except Exception:
-                        continue
-                if frek:
-                    # en sık görülen sınıfı ata
-                    ders_sinif = sorted(frek.items(), key=lambda x: (-x[1], x[0]))[0][0]
-
-            out.append({
-                "id": d["id"], "kod": d["kod"], "ad": d["ad"],
-                "hoca": d["hoca"], "sinif": ders_sinif,
-                "ogr_say": len(ogr_ids), "ogr_ids": ogr_ids
-            })
-        return out, list(derslikler)
-
-def sinav_programi_kaydet(bolum_id: int, sinav_turu: str, yerlestirmeler: list[dict], bekleme_dk: int = 0):
+        if sinav_turu is not None:
+            derslikler = _derslik_dolulugu(vt, derslikler, bolum_id, sinav_turu)
+        return _ders_kaynaklari(vt, bolum_id), list(derslikler)
+
+def _bolum_idleri(vt, bolum_ids: Optional[Iterable[int]]) -> list[int]:
+    if bolum_ids is None:
+        # dersi ya da dersliği olan bölümler
+        return [r["bolum_id"] for r in vt.execute(
+            "SELECT bolum_id FROM dersler UNION SELECT bolum_id FROM derslikler ORDER BY bolum_id"
+        )]
+    return sorted({int(b) for b in bolum_ids})
+
+def fakulte_plan_kaynagini_hazirla(bolum_ids: Optional[Iterable[int]] = None) -> tuple[list[dict], list[dict]]:
+    """
+    Fakülte geneli planlama kaynağı (bolum_ids None ise tüm bölümler):
+    tüm bölümlerin dersleri tek listede, öğrenciler ogr_no ile birleşik
+    (bkz. _ders_kaynaklari_coklu) ve tüm bölümlerin derslikleri ortak havuz
+    olarak. Ders ve derslik id'leri zaten tekildir; sonuç doğrudan
+    planla(...)'ya verilir, yerleştirmeler fakulte_programini_kaydet ile yazılır.
+    """
     with baglanti() as vt:
+        ids = _bolum_idleri(vt, bolum_ids)
+        if not ids:
+            return [], []
+        q = ",".join("?" * len(ids))
+        derslikler = vt.execute(f"""
+            SELECT id, bolum_id, derslik_kodu, kapasite, enine, boyuna
+            FROM derslikler
+            WHERE bolum_id IN ({q})
+            ORDER BY kapasite DESC, id
+        """, ids).fetchall()
+        return _ders_kaynaklari_coklu(vt, ids, fakulte=True), list(derslikler)
+
+def _fakulte_yetkisi(kullanici, bolum_ids: Optional[Iterable[int]], ids: list[int]) -> None:
+    """Admin her bölümün, koordinatör yalnızca kendi bölümünün (açıkça verilmiş) programını yazabilir."""
+    if kullanici["rol"] == "admin":
+        return
+    if kullanici["rol"] != "koordinator":
+        raise PermissionError("Program kaydetme yetkisi yalnızca admin ve bölüm koordinatöründedir.")
+    if bolum_ids is None or any(b != kullanici["bolum_id"] for b in ids):
+        raise PermissionError("Fakülte geneli program kaydı yalnızca admin yetkisindedir; "
+                              "koordinatör yalnızca kendi bölümünün programını yazabilir.")
+
+def fakulte_programini_kaydet(kullanici, sinav_turu: str, yerlestirmeler: list[dict], bekleme_dk: int = 0,
+                              bolum_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Fakülte geneli planın kaydı, tek işlemde: seçili bölümlerin bu türdeki
+    programı silinir, her sınav kendi dersinin bölümüne yazılır. Yazılan
+    sınav sayısını döndürür; hata olursa eski programlar korunur.
+    kullanici: kaydı yapan (admin: tüm bölümler; koordinatör: yalnızca kendi
+    bölümü, bolum_ids ile). Yetkisiz bölüm varsa PermissionError.
+    """
+    with baglanti(yazma=True) as vt:
+        ids = _bolum_idleri(vt, bolum_ids)
+        _fakulte_yetkisi(kullanici, bolum_ids, ids)
+        if not ids:
+            return 0
+        q = ",".join("?" * len(ids))
+        ders_bolum = dict(vt.execute(f"SELECT id, bolum_id FROM dersler WHERE bolum_id IN ({q})", ids).fetchall())
+        _sinavlari_sil(vt, [r["id"] for r in vt.execute(
+            f"SELECT id FROM sinav_programi WHERE sinav_turu=? AND bolum_id IN ({q})", [sinav_turu] + ids
+        )])
+        parti = []
         for y in yerlestirmeler:
             if y.get("baslangic") is None:
                 continue
-            _program_satiri_yaz(vt, bolum_id, int(y["ders_id"]), sinav_turu,
-                                y["baslangic"], y["bitis"], int(bekleme_dk), [int(x) for x in (y["derslik_ids"] or [])])
+            bolum_id = ders_bolum.get(int(y["ders_id"]))
+            if bolum_id is None:
+                raise ValueError(f"Ders (id={y['ders_id']}) seçili bölümlerin hiçbirine ait değil.")
+            parti.append((bolum_id, y))
+        return _programi_toplu_yaz(vt, sinav_turu, parti, bekleme_dk)
+
+def kayit_matrisi_getir(bolum_id: int) -> KayitMatrisi:
+    """Bölümün öğrenci × ders kayıt matrisi; tüm kayıtlar tek sorguyla okunur."""
+    with baglanti() as vt:
+        ders_ids = [r["id"] for r in vt.execute("SELECT id FROM dersler WHERE bolum_id=?", (bolum_id,))]
+        rows = vt.execute("""
+            SELECT od.ogrenci_id, od.ders_id
+            FROM ogrenci_ders od
+            JOIN dersler d ON d.id = od.ders_id
+            WHERE d.bolum_id=?
+        """, (bolum_id,)).fetchall()
+    return KayitMatrisi.ciftlerden([r["ogrenci_id"] for r in rows], [r["ders_id"] for r in rows],
+                                   tum_ders_ids=ders_ids)
+
+def sinav_programi_kaydet(bolum_id: int, sinav_turu: str, yerlestirmeler: list[dict], bekleme_dk: int = 0) -> int:
+    """
+    planla çıktısının toplu kaydı: tek bağlantı, tek işlem, hepsi ya da hiçbiri
+    (bkz. _programi_toplu_yaz). Yerleşemeyen (baslangic=None) satırlar atlanır;
+    yazılan sınav sayısını döndürür. Temizleme ile birlikte kullanım için
+    veritabani.islem() kapsamına alınabilir.
+    """
+    with baglanti(yazma=True) as vt:  # denetim ve yazma aynı yazma kilidi altında
+        return _programi_toplu_yaz(vt, sinav_turu,
+                                   [(bolum_id, y) for y in yerlestirmeler if y.get("baslangic") is not None],
+                                   bekleme_dk)
 
 def sinav_programi_detay(bolum_id: int, sinav_turu: str):
     stur = (sinav_turu or "vize").strip().lower()
@@ -363,6 +726,35 @@ def derse_kayitli_ogrenciler(ders_id: int):
             ORDER BY o.ogr_no
         """, (ders_id,)).fetchall()
 
+def derse_kayitli_ogrenci_sayisi(ders_id: int) -> int:
+    with baglanti() as vt:
+        return vt.execute("SELECT COUNT(*) FROM ogrenci_ders WHERE ders_id=?", (ders_id,)).fetchone()[0]
+
+def derse_kayitli_ogrenciler_sayfasi(ders_id: int, sonrasi: Optional[tuple] = None, limit: int = 200):
+    """
+    derse_kayitli_ogrenciler'in sayfalı (keyset) sürümü: (ogr_no, id) sırasıyla
+    `sonrasi` anahtarından sonraki en çok `limit` satır. Sonraki sayfa için
+    son satırın (ogr_no, id) değeri verilir (bkz. arayuz.sanal_liste).
+    """
+    with baglanti() as vt:
+        if sonrasi is None:
+            return vt.execute("""
+                SELECT o.id, o.ogr_no, o.adsoyad
+                FROM ogrenci_ders od
+                JOIN ogrenciler o ON o.id=od.ogrenci_id
+                WHERE od.ders_id=?
+                ORDER BY o.ogr_no, o.id
+                LIMIT ?
+            """, (ders_id, limit)).fetchall()
+        return vt.execute("""
+            SELECT o.id, o.ogr_no, o.adsoyad
+            FROM ogrenci_ders od
+            JOIN ogrenciler o ON o.id=od.ogrenci_id
+            WHERE od.ders_id=? AND (o.ogr_no, o.id) > (?, ?)
+            ORDER BY o.ogr_no, o.id
+            LIMIT ?
+        """, (ders_id, *sonrasi, limit)).fetchall()
+
 # =========================================================
 # 🔹 Oturma Planı
 # =========================================================
@@ -417,53 +809,27 @@ def ornek_sinav_programi_olustur(bolum_id: int, sinav_turu: str):
 # =========================================================
 def dersler_ogrsay_ve_alanlar_detayli(bolum_id: int) -> list[dict]:
     with baglanti() as vt:
-        dersler = vt.execute("""
-            SELECT d.id, d.kod, d.ad, d.hoca, d.sinif
-            FROM dersler d
-            WHERE d.bolum_id=?
-            ORDER BY d.kod
-        """, (bolum_id,)).fetchall()
+        return _ders_kaynaklari(vt, bolum_id)
 
-        out = []
-        for d in dersler:
-            ogr_ids = {r["ogrenci_id"] for r in vt.execute(
-                "SELECT ogrenci_id FROM ogrenci_ders WHERE ders_id=?", (d["id"],)
-            ).fetchall()}
-
-            # --- YENİ: sinif boşsa öğrencilerden mod ---
-            ders_sinif = d["sinif"]
-            if ders_sinif is None and ogr_ids:
-                sinif_rows = vt.execute(
-                    f"SELECT sinif FROM ogrenciler WHERE id IN ({','.join(['?']*len(ogr_ids))})",
-                    tuple(ogr_ids)
-                ).fetchall()
-                frek: Dict[int, int] = {}
-                for r in sinif_rows:
-                    try:
-                        if r["sinif"] is None:
-                            continue
-                        s = int(r["sinif"])
-                        frek[s] = frek.get(s, 0) + 1
-                    except Exception:
-                        continue
-                if frek:
-                    ders_sinif = sorted(frek.items(), key=lambda x: (-x[1], x[0]))[0][0]
-
-            out.append({
-                "id": d["id"], "kod": d["kod"], "ad": d["ad"],
-                "hoca": d["hoca"], "sinif": ders_sinif,
-                "ogr_say": len(ogr_ids), "ogr_ids": ogr_ids
-            })
-        return out
-
-def derslikler_kapasite_listesi(bolum_id: int) -> list[dict]:
+def derslikler_kapasite_listesi(bolum_id: int, sinav_turu: Optional[str] = None) -> list[dict]:
+    """sinav_turu verilirse plan_kaynagini_hazirla'daki gibi "dolu" aralıklarıyla."""
     with baglanti() as vt:
-        return vt.execute("""
+        derslikler = vt.execute("""
             SELECT id, derslik_kodu, kapasite, enine, boyuna
             FROM derslikler
             WHERE bolum_id=?
             ORDER BY kapasite DESC
         """, (bolum_id,)).fetchall()
+        if sinav_turu is not None:
+            return _derslik_dolulugu(vt, derslikler, bolum_id, sinav_turu)
+        return derslikler
+
+def _sinavlari_sil(vt, ids: list[int]) -> None:
+    if ids:
+        q = ",".join("?" * len(ids))
+        vt.execute(f"DELETE FROM oturma_plani WHERE sinav_id IN ({q})", ids)
+        vt.execute(f"DELETE FROM sinav_programi_derslik WHERE sinav_id IN ({q})", ids)
+        vt.execute(f"DELETE FROM sinav_programi WHERE id IN ({q})", ids)
 
 def sinav_programini_temizle(bolum_id: int, sinav_turu: str):
     with baglanti() as vt:
@@ -471,11 +837,40 @@ def sinav_programini_temizle(bolum_id: int, sinav_turu: str):
             "SELECT id FROM sinav_programi WHERE bolum_id=? AND sinav_turu=?",
             (bolum_id, sinav_turu)
         ).fetchall()]
-        if ids:
-            q = ",".join("?" * len(ids))
-            vt.execute(f"DELETE FROM oturma_plani WHERE sinav_id IN ({q})", ids)
-            vt.execute(f"DELETE FROM sinav_programi_derslik WHERE sinav_id IN ({q})", ids)
-            vt.execute("DELETE FROM sinav_programi WHERE bolum_id=? AND sinav_turu=?", (bolum_id, sinav_turu))
+        _sinavlari_sil(vt, ids)
+
+def sinavlari_sil(sinav_ids: list[int]):
+    """Verilen sınavları oturma planı ve derslik bağlarıyla birlikte siler."""
+    with baglanti() as vt:
+        _sinavlari_sil(vt, [int(i) for i in sinav_ids])
+
+def mevcut_yerlestirmeler(bolum_id: int, sinav_turu: str) -> list[dict]:
+    """
+    Kayıtlı programı planla(..., sabit=...) biçiminde döndürür:
+    [{sinav_id, ders_id, baslangic, bitis, derslik_ids}] (datetime alanlarla).
+    """
+    with baglanti() as vt:
+        rows = vt.execute("""
+            SELECT sp.id, sp.ders_id, sp.baslangic, sp.bitis, spd.derslik_id
+            FROM sinav_programi sp
+            LEFT JOIN sinav_programi_derslik spd ON spd.sinav_id = sp.id
+            WHERE sp.bolum_id=? AND sp.sinav_turu=?
+            ORDER BY sp.id, spd.derslik_id
+        """, (bolum_id, sinav_turu)).fetchall()
+    out: dict[int, dict] = {}
+    for r in rows:
+        y = out.get(r["id"])
+        if y is None:
+            y = out[r["id"]] = {
+                "sinav_id": r["id"],
+                "ders_id": r["ders_id"],
+                "baslangic": datetime.fromisoformat(r["baslangic"]),
+                "bitis": datetime.fromisoformat(r["bitis"]),
+                "derslik_ids": [],
+            }
+        if r["derslik_id"] is not None:
+            y["derslik_ids"].append(r["derslik_id"])
+    return list(out.values())
 
 def sinav_kaydet(bolum_id: int, ders_id: int, sinav_turu: str,
                  baslangic_txt: str, bitis_txt: str, sure_dk: int, bekleme_dk: int,
@@ -495,6 +890,38 @@ def sinav_programi_listele(bolum_id: int, sinav_turu: str):
             ORDER BY sp.baslangic, d.kod
         """, (bolum_id, sinav_turu)).fetchall()
 
+def sinav_programi_sayisi(bolum_id: int, sinav_turu: str) -> int:
+    with baglanti() as vt:
+        return vt.execute("SELECT COUNT(*) FROM sinav_programi WHERE bolum_id=? AND sinav_turu=?",
+                          (bolum_id, sinav_turu)).fetchone()[0]
+
+def sinav_programi_sayfasi(bolum_id: int, sinav_turu: str, sonrasi: Optional[tuple] = None, limit: int = 200):
+    """
+    sinav_programi_listele'nin sayfalı (keyset) sürümü: (baslangic, kod, id)
+    sırasıyla `sonrasi` anahtarından sonraki en çok `limit` satır. Başlangıç
+    koşulu ix_sp_bolum_tur_bas aralık taramasıyla karşılanır; sayfa maliyeti
+    programın boyutundan bağımsızdır.
+    """
+    with baglanti() as vt:
+        if sonrasi is None:
+            return vt.execute("""
+                SELECT sp.id, d.kod, d.ad, sp.baslangic, sp.bitis
+                FROM sinav_programi sp
+                JOIN dersler d ON d.id=sp.ders_id
+                WHERE sp.bolum_id=? AND sp.sinav_turu=?
+                ORDER BY sp.baslangic, d.kod, sp.id
+                LIMIT ?
+            """, (bolum_id, sinav_turu, limit)).fetchall()
+        return vt.execute("""
+            SELECT sp.id, d.kod, d.ad, sp.baslangic, sp.bitis
+            FROM sinav_programi sp
+            JOIN dersler d ON d.id=sp.ders_id
+            WHERE sp.bolum_id=? AND sp.sinav_turu=? AND sp.baslangic >= ?
+              AND (sp.baslangic, d.kod, sp.id) > (?, ?, ?)
+            ORDER BY sp.baslangic, d.kod, sp.id
+            LIMIT ?
+        """, (bolum_id, sinav_turu, sonrasi[0], *sonrasi, limit)).fetchall()
+
 def export_sinav_programi_to_excel(bolum_id: int, sinav_turu: str, dosya_yolu: str):
     with baglanti() as vt:
         rows = vt.execute("""
@@ -543,3 +970,34 @@ def export_sinav_programi_to_excel(bolum_id: int, sinav_turu: str, dosya_yolu: s
             })
 
     programi_xlsx_yaz(dosya_yolu, payload, sinav_turu=sinav_turu)
+
+def export_cakisma_raporu_to_excel(bolum_id: int, sinav_turu: str, dosya_yolu: str,
+                                   matris: Optional[KayitMatrisi] = None):
+    """Ortak öğrencisi olan ders çiftlerini ve programda aynı anda olup olmadıklarını Excel'e yazar."""
+    if matris is None:
+        matris = kayit_matrisi_getir(bolum_id)
+    with baglanti() as vt:
+        dersler = {r["id"]: r for r in vt.execute(
+            "SELECT id, kod, ad FROM dersler WHERE bolum_id=?", (bolum_id,)
+        ).fetchall()}
+        zaman = {r["ders_id"]: (datetime.fromisoformat(r["baslangic"]), datetime.fromisoformat(r["bitis"]))
+                 for r in vt.execute(
+                     "SELECT ders_id, baslangic, bitis FROM sinav_programi WHERE bolum_id=? AND sinav_turu=?",
+                     (bolum_id, sinav_turu)
+                 ).fetchall()}
+
+    payload = []
+    for a, b, ortak in matris.cakisma_ciftleri():
+        da, db = dersler.get(a), dersler.get(b)
+        if not da or not db:
+            continue
+        durum = None
+        if a in zaman and b in zaman:
+            durum = _zaman_cakisiyor_mu(*zaman[a], *zaman[b])
+        payload.append({
+            "kod_a": da["kod"], "ad_a": da["ad"],
+            "kod_b": db["kod"], "ad_b": db["ad"],
+            "ortak": ortak, "programda_cakisiyor": durum,
+        })
+
+    cakisma_raporu_xlsx_yaz(dosya_yolu, payload, baslik=f"({sinav_turu.upper()})")
@@ -1,9 +1,22 @@
 # veritabani.py
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 VERITABANI_YOLU = Path(__file__).parent / "sinav_sistemi.db"
 
+# Her yeni bağlantıda bir kez çalışır
+BAGLANTI_PRAGMALARI = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA cache_size=-20000",       # ~20 MB sayfa önbelleği
+    "PRAGMA mmap_size=268435456",     # 256 MB
+)
+# sqlite3'ün bağlantı başına hazır ifade (prepared statement) önbelleği
+HAZIR_IFADE_ONBELLEGI = 256
+
 TABLO_YAPISI = """
 PRAGMA foreign_keys=ON;
 
@@ -103,11 +116,108 @@ CREATE TABLE IF NOT EXISTS oturma_plani(
 );
 """
 
-def baglanti():
-    vt = sqlite3.connect(VERITABANI_YOLU)
+# ---------------------------------------------------------
+# Bağlantı yöneticisi
+# ---------------------------------------------------------
+# Her iş parçacığı, veritabanı dosyası başına tek bir bağlantı kullanır (havuz).
+# `with baglanti() as vt:` kapsamları iç içe geçebilir: en dıştaki kapsam işlemi
+# açar ve commit/rollback yapar, içteki kapsamlar SAVEPOINT ile dıştakinin işlemine katılır.
+_yerel = threading.local()
+
+
+def _yeni_baglanti(yol: str) -> sqlite3.Connection:
+    vt = sqlite3.connect(yol, cached_statements=HAZIR_IFADE_ONBELLEGI)
     vt.row_factory = sqlite3.Row
+    for pragma in BAGLANTI_PRAGMALARI:
+        vt.execute(pragma)
     return vt
 
+
+def _havuz() -> dict:
+    havuz = getattr(_yerel, "havuz", None)
+    if havuz is None:
+        havuz = _yerel.havuz = {}
+    return havuz
+
+
+@contextmanager
+def baglanti(yazma: bool = False):
+    """
+    İş parçacığına özel paylaşılan bağlantıyı verir.
+      - en dış kapsam: işlemi kendisi açar (BEGIN; yazma=True ise BEGIN IMMEDIATE,
+                       yazma kilidi baştan alınır); hata yoksa commit, hata varsa rollback
+      - iç kapsam:     SAVEPOINT ile dıştakinin işlemine katılır; hata varsa yalnızca
+                       kendi değişikliklerini geri alır (yazma yok sayılır)
+    İç kapsamın değişiklikleri, dış kapsam henüz yazmamış olsa da dıştakiyle
+    birlikte commit/rollback edilir.
+    """
+    yol = str(VERITABANI_YOLU)
+    havuz = _havuz()
+    kayit = havuz.get(yol)
+    if kayit is None:
+        kayit = havuz[yol] = [_yeni_baglanti(yol), 0]  # [bağlantı, derinlik]
+    vt, derinlik = kayit
+    sp = f"kapsam_{derinlik}"
+    vt.execute(f"SAVEPOINT {sp}" if derinlik else "BEGIN IMMEDIATE" if yazma else "BEGIN")
+    kayit[1] = derinlik + 1
+    try:
+        yield vt
+    except BaseException:
+        if derinlik:
+            vt.execute(f"ROLLBACK TO {sp}")
+            vt.execute(f"RELEASE {sp}")
+        else:
+            vt.rollback()
+        raise
+    else:
+        if derinlik:
+            vt.execute(f"RELEASE {sp}")
+        else:
+            vt.commit()
+    finally:
+        kayit[1] = derinlik
+
+
+@contextmanager
+def islem():
+    """
+    Birden çok veri_deposu çağrısını tek işlemde toplar (hepsi ya da hiçbiri):
+
+        with islem():
+            sinav_programini_temizle(...)
+            sinav_programi_kaydet(...)
+
+    En dış kapsamsa yazma kilidi baştan alınır (BEGIN IMMEDIATE).
+    """
+    with baglanti(yazma=True) as vt:
+        yield vt
+
+
+def baglantilari_kapat():
+    """Bu iş parçacığının havuzdaki bağlantılarını kapatır (çıkışta / test veritabanı değişince)."""
+    havuz = _havuz()
+    for vt, _ in havuz.values():
+        vt.close()
+    havuz.clear()
+
+# Sürümlü göçler: PRAGMA user_version uygulanmış son göçün numarasını tutar.
+# Yeni göç eklerken listenin sonuna bir sonraki numarayla ekleyin; eskileri değiştirmeyin.
+GOCLER = [
+    (1, [
+        # derse_kayitli_ogrenciler / plan kaynağı: ders → öğrenciler (kapsayan)
+        "CREATE INDEX IF NOT EXISTS ix_od_ders ON ogrenci_ders(ders_id, ogrenci_id)",
+        # _derslikte_cakisiyor_mu: derslik → sınavlar (kapsayan)
+        "CREATE INDEX IF NOT EXISTS ix_spd_derslik ON sinav_programi_derslik(derslik_id, sinav_id)",
+        "CREATE INDEX IF NOT EXISTS ix_op_derslik ON oturma_plani(derslik_id)",
+        # _bolumde_koordinator_var_mi
+        "CREATE INDEX IF NOT EXISTS ix_kul_bolum_rol ON kullanicilar(bolum_id, rol)",
+        # sinav_programi_listele / detay: bölüm + tür, başlangıca göre sıralı
+        "CREATE INDEX IF NOT EXISTS ix_sp_bolum_tur_bas "
+        "ON sinav_programi(bolum_id, sinav_turu, baslangic, bitis, ders_id)",
+        "ANALYZE",
+    ]),
+]
+
 def _migrate(vt: sqlite3.Connection):
     # Güvenli göç: eksik sütunları ekle
     cur = vt.execute("PRAGMA table_info(sinav_programi)")
@@ -122,6 +232,15 @@ def _migrate(vt: sqlite3.Connection):
         ON sinav_programi(bolum_id, ders_id, sinav_turu)
     """)
 
+    # Sürümlü göçler
+    surum = vt.execute("PRAGMA user_version").fetchone()[0]
+    for no, komutlar in GOCLER:
+        if no <= surum:
+            continue
+        for komut in komutlar:
+            vt.execute(komut)
+        vt.execute(f"PRAGMA user_version={int(no)}")
+
 def veritabani_baslat():
     with baglanti() as vt:
         vt.executescript(TABLO_YAPISI)